@@ -1 +1,7 @@
-from .pipeline import PlannerPipeline
+def __getattr__(name):
+    # Imported on first use so that importing a backend submodule does not
+    # load the Google Maps and HF clients
+    if name == "PlannerPipeline":
+        from .pipeline import PlannerPipeline
+        return PlannerPipeline
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
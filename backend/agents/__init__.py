@@ -1,2 +1,3 @@
 from .serializer import SerializerAgent
 from .bigagent import BigAgent
+from .fastpath import RuleBasedSerializer
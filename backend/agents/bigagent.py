@@ -1,7 +1,15 @@
-from huggingface_hub import InferenceClient
-from backend.config import get_hf_key
+from huggingface_hub import InferenceClient, AsyncInferenceClient
+from backend.metrics import span
+from backend.config import get_hf_key, get_bigagent_token_budget, get_hedge_model, get_hedge_window
+from backend.cache import SingleFlight, completion_key
+from backend.agents.jsonstream import consume, aconsume, estimate_tokens
+from backend.ratelimit import get_limiter
+from backend.scraper.place import Place, encode_places
+from backend.deadline import DeadlineExceeded
+from backend import deadline
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import asyncio
 import json
-import re
 
 class BigAgent:
     """
@@ -13,69 +21,455 @@ class BigAgent:
     
     Attributes:
         client (InferenceClient): HuggingFace inference client
+        async_client (AsyncInferenceClient): HuggingFace client for the async path
+        completion_cache (CompletionCache): Shared cache of parsed completions, or None
+        flight (SingleFlight): Coalesces concurrent identical completion requests
+        limiter (RateLimiter): Process-wide HF Inference rate limiter
         model (str): Name of the LLM model used for analysis
+        token_budget (int): Estimated input tokens allowed in one ranking request
+        max_parallel_chunks (int): Maximum chunk rankings run at once
+        hedge_model (str): Smaller model raced against model when a deadline is near
+        hedge_window (float): Remaining budget in seconds below which calls are hedged
     """
+
+    max_parallel_chunks = 4
     
-    def __init__(self):
+    def __init__(self, completion_cache=None):
         """
         Initialize the BigAgent with HuggingFace client and model.
+
+        Args:
+            completion_cache (CompletionCache, optional): Cache shared with the
+                                                          other agents. Defaults to None.
         """
         self.client = InferenceClient(
             api_key=get_hf_key()
         )
+        self.async_client = AsyncInferenceClient(
+            api_key=get_hf_key()
+        )
+        self.completion_cache = completion_cache
+        self.flight = SingleFlight("bigagent")
+        self.limiter = get_limiter("hf")
 
         self.model = "Qwen/Qwen3-Next-80B-A3B-Instruct"
+        self.token_budget = get_bigagent_token_budget()
+        self.hedge_model = get_hedge_model()
+        self.hedge_window = get_hedge_window()
 
-    def _parse_response(self, response) -> dict:
+    def _tag(self, result: dict, path: str, model: str) -> dict:
         """
-        Parse JSON from LLM response, handling various formats.
-        
-        Attempts to extract JSON from markdown code blocks or raw text,
-        while removing thinking tags and other noise from the response.
-        
+        Record which execution path produced a ranking.
+
         Args:
-            response (str): Raw response text from the LLM
-        
+            result (dict): Parsed JSON data
+            path (str): "primary" or "hedge"
+            model (str): Model that produced the result
+
+        Returns:
+            dict: Copy of result with a "ranked_by" field
+        """
+        return {**result, "ranked_by": {"path": path, "model": model}}
+
+    def _complete(self, messages: list) -> dict:
+        """
+        Run a chat completion and parse its JSON, using the completion cache.
+
+        Concurrent identical requests share one completion. Under a request
+        deadline, the call is hedged: once less than hedge_window seconds
+        remain, the same request is also sent to hedge_model and the first
+        successful answer wins.
+
+        Args:
+            messages (list): Chat messages for the completion request
+
+        Returns:
+            dict: Parsed JSON data, tagged with the path that produced it
+
+        Raises:
+            DeadlineExceeded: If neither model answers before the deadline
+        """
+        if self.completion_cache is not None:
+            cached = self.completion_cache.get("bigagent", self.model, messages)
+            if cached is not None:
+                return self._tag(cached, "primary", self.model)
+
+        request_deadline = deadline.current()
+        if request_deadline is None:
+            return self._tag(self._call(self.model, messages), "primary", self.model)
+
+        executor = ThreadPoolExecutor(max_workers=2)
+        call = deadline.propagate(self._call)
+        pending = {executor.submit(call, self.model, messages): ("primary", self.model)}
+        hedged = not self.hedge_model or self.hedge_model == self.model
+
+        try:
+            while True:
+                budget = request_deadline.remaining() - (0 if hedged else self.hedge_window)
+                done, _ = wait(pending, timeout=max(0.0, budget), return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    path, model = pending.pop(future)
+                    if future.exception() is None:
+                        return self._tag(future.result(), path, model)
+                    error = future.exception()
+
+                if not done:
+                    if hedged:
+                        raise DeadlineExceeded("BigAgent did not answer before the deadline")
+                    pending[executor.submit(call, self.hedge_model, messages)] = ("hedge", self.hedge_model)
+                    hedged = True
+                elif not pending:
+                    raise error
+        finally:
+            # Abandoned calls finish in the background and still fill the cache
+            executor.shutdown(wait=False)
+
+    def _call(self, model: str, messages: list) -> dict:
+        """
+        Request a completion, sharing it with concurrent identical requests.
+
+        Args:
+            model (str): Model to call
+            messages (list): Chat messages for the completion request
+
         Returns:
             dict: Parsed JSON data
-        
+        """
+        return self.flight.do(completion_key(model, messages), lambda: self._request(model, messages))
+
+    def _request(self, model: str, messages: list) -> dict:
+        """
+        Stream a model reply until its JSON object closes and store the result in the completion cache.
+
+        Args:
+            model (str): Model to call
+            messages (list): Chat messages for the completion request
+
+        Returns:
+            dict: Parsed JSON data
+        """
+        with span("bigagent"):
+            stream = self.limiter.call(lambda: self.client.chat.completions.create(
+                model=model,
+                temperature=0.0,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True}
+            ))
+            result = consume("bigagent", stream, messages)
+
+        if self.completion_cache is not None:
+            self.completion_cache.set(model, messages, result)
+
+        return result
+
+    async def _acomplete(self, messages: list) -> dict:
+        """
+        Async variant of _complete.
+
+        Args:
+            messages (list): Chat messages for the completion request
+
+        Returns:
+            dict: Parsed JSON data, tagged with the path that produced it
+
         Raises:
-            ValueError: If JSON cannot be found or parsed
+            DeadlineExceeded: If neither model answers before the deadline
         """
+        if self.completion_cache is not None:
+            cached = await self.completion_cache.aget("bigagent", self.model, messages)
+            if cached is not None:
+                return self._tag(cached, "primary", self.model)
+
+        request_deadline = deadline.current()
+        if request_deadline is None:
+            return self._tag(await self._acall(self.model, messages), "primary", self.model)
+
+        pending = {asyncio.ensure_future(self._acall(self.model, messages)): ("primary", self.model)}
+        hedged = not self.hedge_model or self.hedge_model == self.model
+
         try:
-            if response is None:
-                raise ValueError("No response from LLM")
-
-            # Remove thinking tags
-            cleaned = re.sub(r"<think>.*?</think>", "", response, flags=re.DOTALL)
-            
-            # Try to find JSON in markdown code blocks first
-            match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", cleaned, re.DOTALL)
-            
-            if match:
-                json_str = match.group(1)
-            else:
-                # Try to find raw JSON object
-                match = re.search(r"(\{.*\})", cleaned, re.DOTALL)
-                if match:
-                    json_str = match.group(1)
-                else:
-                    # Print response for debugging
-                    print(f"\n=== LLM Response (first 500 chars) ===")
-                    print(response[:500])
-                    print(f"\n=== End Response ===")
-                    raise ValueError("No JSON found in LLM response")
-
-            return json.loads(json_str)
-
-        except json.JSONDecodeError as e:
-            print(f"\n=== JSON Parse Error ===")
-            print(f"Error: {e}")
-            print(f"Attempted to parse: {json_str[:200] if 'json_str' in locals() else 'N/A'}") # type: ignore
-            print(f"=== End Error ===")
-            raise ValueError(f"Failed to parse JSON: {e}")
-        except Exception as e:
-            raise ValueError(f"Failed to parse LLM response: {e}")
+            while True:
+                budget = request_deadline.remaining() - (0 if hedged else self.hedge_window)
+                done, _ = await asyncio.wait(pending, timeout=max(0.0, budget), return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    path, model = pending.pop(task)
+                    if task.exception() is None:
+                        return self._tag(task.result(), path, model)
+                    error = task.exception()
+
+                if not done:
+                    if hedged:
+                        raise DeadlineExceeded("BigAgent did not answer before the deadline")
+                    pending[asyncio.ensure_future(self._acall(self.hedge_model, messages))] = ("hedge", self.hedge_model)
+                    hedged = True
+                elif not pending:
+                    raise error
+        finally:
+            for task in pending:
+                task.cancel()
+
+    async def _acall(self, model: str, messages: list) -> dict:
+        """
+        Async variant of _call.
+        """
+        return await self.flight.ado(completion_key(model, messages), lambda: self._arequest(model, messages))
+
+    async def _arequest(self, model: str, messages: list) -> dict:
+        """
+        Async variant of _request.
+
+        Args:
+            model (str): Model to call
+            messages (list): Chat messages for the completion request
+
+        Returns:
+            dict: Parsed JSON data
+        """
+        with span("bigagent"):
+            stream = await self.limiter.acall(lambda: self.async_client.chat.completions.create(
+                model=model,
+                temperature=0.0,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True}
+            ))
+            result = await aconsume("bigagent", stream, messages)
+
+        if self.completion_cache is not None:
+            await self.completion_cache.aset(model, messages, result)
+
+        return result
+
+    def _estimate_tokens(self, messages: list) -> int:
+        """
+        Roughly estimate the input tokens of a chat request (see estimate_tokens).
+
+        Args:
+            messages (list): Chat messages
+
+        Returns:
+            int: Estimated token count
+        """
+        return estimate_tokens(messages)
+
+    def _chunks(self, data: dict, field: str, build_messages) -> list:
+        """
+        Split the candidate list of a request into chunks that fit the token budget.
+
+        Args:
+            data (dict): Decoded request data
+            field (str): Key holding the candidate list
+            build_messages (callable): Builds chat messages from a JSON prompt
+
+        Returns:
+            list: Candidate lists, each fitting the budget alongside the prompt
+        """
+        available = self.token_budget - self._estimate_tokens(build_messages(json.dumps({**data, field: []})))
+        rows = encode_places([Place.from_dict(candidate) for candidate in data[field]]).splitlines()[2:]
+
+        chunks = [[]]
+        used = 0
+        for candidate, row in zip(data[field], rows):
+            cost = len(row) // 4 + 1
+
+            if chunks[-1] and used + cost > available:
+                chunks.append([])
+                used = 0
+
+            chunks[-1].append(candidate)
+            used += cost
+
+        return chunks
+
+    def _winners(self, responses: list, candidates: list) -> list:
+        """
+        Map the recommendations of chunk rankings back to their input candidates.
+
+        Args:
+            responses (list): Parsed chunk ranking responses
+            candidates (list): All candidates of the request
+
+        Returns:
+            list: Recommended candidates, without duplicates, in input order
+        """
+        recommended = set()
+        for response in responses:
+            groups = response.get("catering_by_cuisine", [response])
+            for group in groups:
+                for entry in group.get("recommended_venues", []) + group.get("recommended_catering", []):
+                    recommended.add((entry.get("name"), entry.get("address")))
+                    recommended.add((entry.get("name"), None))
+
+        return [
+            candidate for candidate in candidates
+            if (candidate.get("name"), candidate.get("address")) in recommended
+            or (candidate.get("name"), None) in recommended
+        ]
+
+    def _rank(self, prompt: str, field: str, build_messages) -> dict:
+        """
+        Rank candidates, splitting oversized requests into a map-reduce tournament.
+
+        Requests under the token budget are sent as-is. Larger ones are split
+        into chunks that are ranked in parallel; the candidates recommended
+        by any chunk then go through a final ranking (recursively, if they
+        still exceed the budget).
+
+        Args:
+            prompt (str): JSON request with the candidate list under field
+            field (str): Key holding the candidate list ("venues" or "catering")
+            build_messages (callable): Builds chat messages from a JSON prompt
+
+        Returns:
+            dict: Parsed response of the final ranking
+        """
+        messages = build_messages(prompt)
+        data = json.loads(prompt)
+
+        if self._estimate_tokens(messages) <= self.token_budget or len(data.get(field, [])) <= 1:
+            return self._complete(messages)
+
+        chunks = self._chunks(data, field, build_messages)
+        if len(chunks) >= len(data[field]):
+            # Every candidate alone fills the budget; chunking cannot shrink the request
+            return self._complete(messages)
+
+        with ThreadPoolExecutor(max_workers=min(len(chunks), self.max_parallel_chunks)) as executor:
+            responses = list(executor.map(
+                deadline.propagate(lambda chunk: self._complete(build_messages(json.dumps({**data, field: chunk})))),
+                chunks
+            ))
+
+        winners = self._winners(responses, data[field]) or [chunk[0] for chunk in chunks]
+        if len(winners) >= len(data[field]):
+            winners = [chunk[0] for chunk in chunks]
+
+        return self._rank(json.dumps({**data, field: winners}), field, build_messages)
+
+    async def _arank(self, prompt: str, field: str, build_messages) -> dict:
+        """
+        Async variant of _rank.
+
+        Args:
+            prompt (str): JSON request with the candidate list under field
+            field (str): Key holding the candidate list ("venues" or "catering")
+            build_messages (callable): Builds chat messages from a JSON prompt
+
+        Returns:
+            dict: Parsed response of the final ranking
+        """
+        messages = build_messages(prompt)
+        data = json.loads(prompt)
+
+        if self._estimate_tokens(messages) <= self.token_budget or len(data.get(field, [])) <= 1:
+            return await self._acomplete(messages)
+
+        chunks = self._chunks(data, field, build_messages)
+        if len(chunks) >= len(data[field]):
+            # Every candidate alone fills the budget; chunking cannot shrink the request
+            return await self._acomplete(messages)
+
+        semaphore = asyncio.Semaphore(self.max_parallel_chunks)
+
+        async def rank_chunk(chunk):
+            async with semaphore:
+                return await self._acomplete(build_messages(json.dumps({**data, field: chunk})))
+
+        responses = await asyncio.gather(*[rank_chunk(chunk) for chunk in chunks])
+
+        winners = self._winners(responses, data[field]) or [chunk[0] for chunk in chunks]
+        if len(winners) >= len(data[field]):
+            winners = [chunk[0] for chunk in chunks]
+
+        return await self._arank(json.dumps({**data, field: winners}), field, build_messages)
+
+    def _payload(self, prompt: str, field: str) -> str:
+        """
+        Render a JSON ranking request as the data section of a prompt.
+
+        Candidates are written as a compact table (see encode_places) and
+        the remaining request fields as JSON.
+
+        Args:
+            prompt (str): JSON request with the candidate list under field
+            field (str): Key holding the candidate list ("venues" or "catering")
+
+        Returns:
+            str: Data section of the prompt
+        """
+        data = json.loads(prompt)
+        candidates = data.pop(field, [])
+        return f"{json.dumps(data)}\n\n{field.capitalize()}, one per row:\n{encode_places([Place.from_dict(candidate) for candidate in candidates])}"
+
+    def _venue_messages(self, prompt: str) -> list:
+        """
+        Build the chat messages for ranking venues.
+
+        Args:
+            prompt (str): JSON string with the event requirements and candidates
+
+        Returns:
+            list: Chat messages for the completion request
+        """
+        return [
+            {
+                "role": "system",
+                "content": """
+                    You are an AI event planning assistant for a local mosque or community center.
+
+                    Your task is to evaluate and rank possible EVENT VENUES based on the event requirements and the venue data provided.
+
+                    You will be given:
+                    1. Event requirements (location, event type, headcount, budget, dietary preferences, other requirements)
+                    2. A table of venue candidates sourced from Google Maps, one per row, with the field codes explained in its "Fields" line
+
+                    Your responsibilities:
+                    - Compare venues against each other
+                    - Rank the venues from most suitable to least suitable
+                    - Select the TOP 3–5 venues only
+                    - Do NOT invent facts that are not present in the input
+                    - If information is missing or unclear, explicitly note that it needs confirmation
+
+                    Evaluation criteria (use all that apply):
+                    - Suitability for the event type
+                    - Likely capacity based on venue type and context
+                    - Rating and number of reviews
+                    - Location relevance
+                    - Price level if available
+                    - Explicitly mentioned user requirements only
+
+                    Important rules:
+                    - Do NOT assume availability of AV equipment, stage, or accessibility unless stated
+                    - If a venue is a community hall, mosque hall, or conference center, you may say "likely suitable" but must add a confirmation note
+                    - Do NOT infer dietary details for venues unless explicitly mentioned
+                    - If headcount suitability is unclear, flag it
+
+                    Return ONLY valid JSON in the following format, with no additional text:
+
+                    {
+                      "recommended_venues": [
+                        {
+                          "name": "string",
+                          "address": "string",
+                          "rating": number | null,
+                          "price_level": number | null,
+                          "why_recommended": "string",
+                          "notes": ["string"]
+                        }
+                      ],
+                      "general_notes": ["string"]
+                    }
+
+                    Be concise, realistic, and conservative in your recommendations.
+
+                    Data:
+
+                    """ + self._payload(prompt, "venues")
+            }
+        ]
 
     def process_venue(self, prompt: str) -> dict:
         """
@@ -109,72 +503,106 @@ class BigAgent:
             ValueError: If LLM request fails or response cannot be parsed
         """
         try :
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                temperature=0.0,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """
-                            You are an AI event planning assistant for a local mosque or community center.
-
-                            Your task is to evaluate and rank possible EVENT VENUES based on the event requirements and the venue data provided.
-
-                            You will be given:
-                            1. Event requirements (location, event type, headcount, budget, dietary preferences, other requirements)
-                            2. A list of venue candidates sourced from Google Maps, each with structured fields
-
-                            Your responsibilities:
-                            - Compare venues against each other
-                            - Rank the venues from most suitable to least suitable
-                            - Select the TOP 3–5 venues only
-                            - Do NOT invent facts that are not present in the input
-                            - If information is missing or unclear, explicitly note that it needs confirmation
-
-                            Evaluation criteria (use all that apply):
-                            - Suitability for the event type
-                            - Likely capacity based on venue type and context
-                            - Rating and number of reviews
-                            - Location relevance
-                            - Price level if available
-                            - Explicitly mentioned user requirements only
-
-                            Important rules:
-                            - Do NOT assume availability of AV equipment, stage, or accessibility unless stated
-                            - If a venue is a community hall, mosque hall, or conference center, you may say "likely suitable" but must add a confirmation note
-                            - Do NOT infer dietary details for venues unless explicitly mentioned
-                            - If headcount suitability is unclear, flag it
-
-                            Return ONLY valid JSON in the following format, with no additional text:
+            return self._rank(prompt, "venues", self._venue_messages)
 
-                            {
-                              "recommended_venues": [
-                                {
-                                  "name": "string",
-                                  "address": "string",
-                                  "rating": number | null,
-                                  "price_level": number | null,
-                                  "why_recommended": "string",
-                                  "notes": ["string"]
-                                }
-                              ],
-                              "general_notes": ["string"]
-                            }
+        except Exception as e:
+            raise ValueError(f"Failed to process prompt: {e}")
 
-                            Be concise, realistic, and conservative in your recommendations.
+    async def aprocess_venue(self, prompt: str) -> dict:
+        """
+        Async variant of process_venue.
 
-                            Data:
+        Args:
+            prompt (str): JSON string containing event requirements and venue data
 
-                            """ + prompt
-                    }
-                ]
-            )
+        Returns:
+            dict: Structured venue recommendations (see process_venue)
 
-            return self._parse_response(completion.choices[0].message.content)
+        Raises:
+            ValueError: If LLM request fails or response cannot be parsed
+        """
+        try:
+            return await self._arank(prompt, "venues", self._venue_messages)
 
         except Exception as e:
             raise ValueError(f"Failed to process prompt: {e}")
 
+    def _catering_messages(self, prompt: str) -> list:
+        """
+        Build the chat messages for ranking catering options.
+
+        Args:
+            prompt (str): JSON string with the event requirements and candidates
+
+        Returns:
+            list: Chat messages for the completion request
+        """
+        return [
+            {
+                "role": "system",
+                "content": """
+                    You are an AI event planning assistant for a local mosque or community center.
+
+                    Your task is to evaluate and rank possible CATERING OPTIONS based on the event requirements and the catering data provided.
+
+                    You will be given:
+
+                    1. Event requirements (location, event type, headcount, budget, dietary preferences, other requirements)
+                    2. A table of catering candidates sourced from Google Maps, one per row, with the field codes explained in its "Fields" line
+
+                    Your responsibilities:
+
+                    * Compare catering options against each other
+                    * Rank the catering options from most suitable to least suitable
+                    * Select the TOP 3–5 catering options only
+                    * Do NOT invent menu items or services
+                    * Treat dietary preferences as STRICT requirements
+
+                    Dietary rules:
+
+                    * If "halal" is listed, the caterer must explicitly appear halal-friendly or be flagged for confirmation
+                    * If multiple dietary preferences exist (e.g., halal + dairy-free), always note that confirmation is required
+                    * Never assume allergy handling or cross-contamination safety
+
+                    Evaluation criteria:
+
+                    * Alignment with dietary preferences
+                    * Rating and number of reviews
+                    * Catering-specific keywords or context
+                    * Location relevance
+                    * Price level if available
+
+                    Important rules:
+
+                    * Do NOT claim a caterer supports a dietary restriction unless explicitly stated or strongly implied by name/category
+                    * Always include a confirmation note for dietary restrictions
+                    * If headcount suitability or pricing is unclear, note it
+
+                    Return ONLY valid JSON in the following format, with no additional text:
+
+                    {
+                        "recommended_catering": [
+                            {
+                            "name": "string",
+                            "address": "string",
+                            "rating": number | null,
+                            "price_level": number | null,
+                            "why_recommended": "string",
+                            "dietary_support": ["string"],
+                            "notes": ["string"]
+                            }
+                        ],
+                        "general_notes": ["string"]
+                    }
+
+                    Be cautious, transparent, and realistic.
+
+                    Data:
+
+                    """ + self._payload(prompt, "catering")
+            }
+        ]
+
     def process_catering(self, prompt: str) -> dict:
         """
         Analyze and rank catering options for an event.
@@ -209,53 +637,89 @@ class BigAgent:
             ValueError: If LLM request fails or response cannot be parsed
         """
         try :
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                temperature=0.0,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": """
-                            You are an AI event planning assistant for a local mosque or community center.
+            return self._rank(prompt, "catering", self._catering_messages)
+
+        except Exception as e:
+            raise ValueError(f"Failed to process prompt: {e}")
+
+    async def aprocess_catering(self, prompt: str) -> dict:
+        """
+        Async variant of process_catering.
+
+        Args:
+            prompt (str): JSON string containing event requirements and catering data
+
+        Returns:
+            dict: Structured catering recommendations (see process_catering)
+
+        Raises:
+            ValueError: If LLM request fails or response cannot be parsed
+        """
+        try:
+            return await self._arank(prompt, "catering", self._catering_messages)
+
+        except Exception as e:
+            raise ValueError(f"Failed to process prompt: {e}")
 
-                            Your task is to evaluate and rank possible CATERING OPTIONS based on the event requirements and the catering data provided.
+    def _catering_batch_messages(self, prompt: str) -> list:
+        """
+        Build the chat messages for ranking merged catering options for every cuisine at once.
 
-                            You will be given:
+        Args:
+            prompt (str): JSON string with the event requirements, cuisines and merged candidates
 
-                            1. Event requirements (location, event type, headcount, budget, dietary preferences, other requirements)
-                            2. A list of catering candidates sourced from Google Maps, each with structured fields
+        Returns:
+            list: Chat messages for the completion request
+        """
+        return [
+            {
+                "role": "system",
+                "content": """
+                    You are an AI event planning assistant for a local mosque or community center.
 
-                            Your responsibilities:
+                    Your task is to evaluate and rank possible CATERING OPTIONS for EACH requested cuisine based on the event requirements and the catering data provided.
 
-                            * Compare catering options against each other
-                            * Rank the catering options from most suitable to least suitable
-                            * Select the TOP 3–5 catering options only
-                            * Do NOT invent menu items or services
-                            * Treat dietary preferences as STRICT requirements
+                    You will be given:
 
-                            Dietary rules:
+                    1. Event requirements (location, event type, headcount, budget, dietary preferences, other requirements)
+                    2. The list of requested cuisines
+                    3. One merged table of catering candidates sourced from Google Maps, one per row, with the field codes explained in its "Fields" line. The c (cuisines) column lists the requested cuisines whose search returned each candidate
 
-                            * If "halal" is listed, the caterer must explicitly appear halal-friendly or be flagged for confirmation
-                            * If multiple dietary preferences exist (e.g., halal + dairy-free), always note that confirmation is required
-                            * Never assume allergy handling or cross-contamination safety
+                    Your responsibilities:
 
-                            Evaluation criteria:
+                    * For EACH requested cuisine, compare the candidates tagged with that cuisine against each other
+                    * Rank them from most suitable to least suitable
+                    * Select the TOP 3–5 catering options per cuisine only
+                    * A candidate tagged with several cuisines may be recommended under each of them
+                    * Do NOT invent menu items or services
+                    * Treat dietary preferences as STRICT requirements
 
-                            * Alignment with dietary preferences
-                            * Rating and number of reviews
-                            * Catering-specific keywords or context
-                            * Location relevance
-                            * Price level if available
+                    Dietary rules:
 
-                            Important rules:
+                    * If "halal" is listed, the caterer must explicitly appear halal-friendly or be flagged for confirmation
+                    * If multiple dietary preferences exist (e.g., halal + dairy-free), always note that confirmation is required
+                    * Never assume allergy handling or cross-contamination safety
 
-                            * Do NOT claim a caterer supports a dietary restriction unless explicitly stated or strongly implied by name/category
-                            * Always include a confirmation note for dietary restrictions
-                            * If headcount suitability or pricing is unclear, note it
+                    Evaluation criteria:
 
-                            Return ONLY valid JSON in the following format, with no additional text:
+                    * Alignment with dietary preferences
+                    * Rating and number of reviews
+                    * Catering-specific keywords or context
+                    * Location relevance
+                    * Price level if available
 
+                    Important rules:
+
+                    * Do NOT claim a caterer supports a dietary restriction unless explicitly stated or strongly implied by name/category
+                    * Always include a confirmation note for dietary restrictions
+                    * If headcount suitability or pricing is unclear, note it
+
+                    Return ONLY valid JSON in the following format, with one entry per requested cuisine and no additional text:
+
+                    {
+                        "catering_by_cuisine": [
                             {
+                                "cuisine": "string",
                                 "recommended_catering": [
                                     {
                                     "name": "string",
@@ -269,17 +733,82 @@ class BigAgent:
                                 ],
                                 "general_notes": ["string"]
                             }
+                        ]
+                    }
 
-                            Be cautious, transparent, and realistic.
+                    Be cautious, transparent, and realistic.
 
-                            Data:
+                    Data:
 
-                            """ + prompt
-                    }
-                ]
-            )
+                    """ + self._payload(prompt, "catering")
+            }
+        ]
 
-            return self._parse_response(completion.choices[0].message.content)
+    def _split_catering_batch(self, response: dict, cuisines: list) -> list:
+        """
+        Split a batched catering response into one entry per cuisine.
+
+        Args:
+            response (dict): Parsed batched response
+            cuisines (list): Requested cuisines, in output order
+
+        Returns:
+            list: One {"recommended_catering", "general_notes"} dict per cuisine
+        """
+        groups = {
+            str(group.get("cuisine", "")).lower(): group
+            for group in response.get("catering_by_cuisine", [])
+        }
+
+        split = []
+        for cuisine in cuisines:
+            group = groups.get(cuisine.lower(), {})
+            split.append({
+                "recommended_catering": group.get("recommended_catering", []),
+                "general_notes": group.get("general_notes", []),
+                "ranked_by": response.get("ranked_by")
+            })
+
+        return split
+
+    def process_catering_batch(self, prompt: str, cuisines: list) -> list:
+        """
+        Analyze and rank catering options for every cuisine in one LLM call.
+
+        Args:
+            prompt (str): JSON string containing event requirements, cuisines and merged
+                          catering data. Expected format:
+                          {"data": {...}, "cuisines": [...], "catering": [...]}
+            cuisines (list): Requested cuisines, in output order
+
+        Returns:
+            list: One process_catering-style dict per cuisine, in the order of cuisines
+
+        Raises:
+            ValueError: If LLM request fails or response cannot be parsed
+        """
+        try:
+            return self._split_catering_batch(self._rank(prompt, "catering", self._catering_batch_messages), cuisines)
+
+        except Exception as e:
+            raise ValueError(f"Failed to process prompt: {e}")
+
+    async def aprocess_catering_batch(self, prompt: str, cuisines: list) -> list:
+        """
+        Async variant of process_catering_batch.
+
+        Args:
+            prompt (str): JSON string containing event requirements, cuisines and merged catering data
+            cuisines (list): Requested cuisines, in output order
+
+        Returns:
+            list: One process_catering-style dict per cuisine, in the order of cuisines
+
+        Raises:
+            ValueError: If LLM request fails or response cannot be parsed
+        """
+        try:
+            return self._split_catering_batch(await self._arank(prompt, "catering", self._catering_batch_messages), cuisines)
 
         except Exception as e:
             raise ValueError(f"Failed to process prompt: {e}")
@@ -0,0 +1,307 @@
+import re
+
+# Event types from the SerializerAgent prompt, with the keywords that select
+# them. Order matters: the first matching entry wins, mirroring the prompt's
+# rule that any mention of iftar or ramadan is classified as Iftar.
+EVENT_TYPES = [
+    ("Iftar", ["iftar", "ramadan"]),
+    ("Eid Gathering", ["eid"]),
+    ("Wedding", ["wedding", "nikah", "walima", "walimah"]),
+    ("Engagement", ["engagement"]),
+    ("Fundraiser", ["fundraiser", "fundraising", "gala"]),
+    ("Charity", ["charity"]),
+    ("Conference", ["conference", "convention"]),
+    ("Seminar", ["seminar"]),
+    ("Workshop", ["workshop"]),
+    ("Lecture", ["lecture"]),
+    ("Guest Speaker", ["guest speaker", "keynote"]),
+    ("Talk", ["talk"]),
+    ("Town Hall", ["town hall"]),
+    ("Community Meeting", ["community meeting", "meeting"]),
+    ("Religious Ceremony", ["religious ceremony", "ceremony", "aqiqah"]),
+    ("Prayer Event", ["prayer", "jummah", "taraweeh"]),
+    ("Festival", ["festival", "bazaar"]),
+    ("Party", ["party"]),
+    ("Celebration", ["celebration", "celebrate", "gathering"]),
+]
+
+CUISINES = {
+    "indian": "Indian",
+    "pakistani": "Pakistani",
+    "bangladeshi": "Bangladeshi",
+    "afghan": "Afghan",
+    "arab": "Arab",
+    "arabic": "Arab",
+    "middle eastern": "Middle Eastern",
+    "lebanese": "Lebanese",
+    "syrian": "Syrian",
+    "palestinian": "Palestinian",
+    "yemeni": "Yemeni",
+    "egyptian": "Egyptian",
+    "moroccan": "Moroccan",
+    "turkish": "Turkish",
+    "persian": "Persian",
+    "mediterranean": "Mediterranean",
+    "greek": "Greek",
+    "somali": "Somali",
+    "ethiopian": "Ethiopian",
+    "malaysian": "Malaysian",
+    "indonesian": "Indonesian",
+    "uzbek": "Uzbek",
+    "chinese": "Chinese",
+    "thai": "Thai",
+    "italian": "Italian",
+    "mexican": "Mexican",
+    "american": "American",
+}
+
+DIETARY_PREFERENCES = {
+    "halal": "halal",
+    "vegetarian": "vegetarian",
+    "vegan": "vegan",
+    "gluten-free": "gluten-free",
+    "gluten free": "gluten-free",
+    "dairy-free": "dairy-free",
+    "dairy free": "dairy-free",
+    "nut-free": "nut-free",
+    "nut free": "nut-free",
+}
+
+# Allowed other_requirements, keyed by the phrases that count as an explicit
+# mention. The SerializerAgent prompt lists the same keys, in this order.
+OTHER_REQUIREMENTS = {
+    "AV equipment": ["av equipment", "a/v", "audio visual", "audio-visual"],
+    "projector": ["projector"],
+    "microphone": ["microphone", "mic"],
+    "sound system": ["sound system", "speakers", "pa system"],
+    "accessible facilities": ["accessible facilities", "accessible"],
+    "wheelchair access": ["wheelchair"],
+    "indoor": ["indoor"],
+    "outdoor": ["outdoor"],
+    "stage": ["stage"],
+    "podium": ["podium"],
+    "performance area": ["performance area"],
+    "food": ["food"],
+    "catering": ["catering", "catered", "caterer"],
+    "dietary restrictions": ["dietary restrictions", "dietary restriction", "dietary needs", "allergies", "allergy"],
+    "parking": ["parking"],
+    "transport accessibility": ["public transport", "transit", "subway"],
+    "decorations": ["decorations", "decor"],
+    "setup requirements": ["setup", "set up", "set-up"],
+}
+
+LOCATION_ABBREVIATIONS = {
+    "nyc": "New York City",
+    "ny": "New York",
+    "la": "Los Angeles",
+    "sf": "San Francisco",
+    "dc": "Washington DC",
+    "philly": "Philadelphia",
+    "chi": "Chicago",
+    "atl": "Atlanta",
+    "nola": "New Orleans",
+    "vegas": "Las Vegas",
+}
+
+# Capitalized words that follow "in"/"at" without being places.
+NON_LOCATIONS = {
+    "ramadan", "eid", "january", "february", "march", "april", "may", "june",
+    "july", "august", "september", "october", "november", "december",
+    "spring", "summer", "fall", "autumn", "winter", "the",
+}
+
+LOCATION_RE = re.compile(
+    r"\b(?:in|at|near|around)\s+"
+    r"((?:[A-Z][\w.'-]*)(?:\s+(?:[A-Z][\w.'-]*|of|de|del|la|el))*)"
+)
+
+HEADCOUNT_RANGE_RE = re.compile(
+    r"(\d[\d,]*)\s*(?:-|–|to)\s*(\d[\d,]*)\s*(?:people|persons|guests|attendees|participants|ppl)\b",
+    re.IGNORECASE
+)
+HEADCOUNT_RE = re.compile(
+    r"(\d[\d,]*)\s*(?:people|persons|guests|attendees|participants|ppl)\b",
+    re.IGNORECASE
+)
+
+NUMBER = r"(\d[\d,]*(?:\.\d+)?)\s*(k|thousand|m|million)?"
+BUDGET_RES = [
+    re.compile(r"\$\s*" + NUMBER + r"\b", re.IGNORECASE),
+    re.compile(NUMBER + r"\s*(?:dollars|usd|bucks)\b", re.IGNORECASE),
+    re.compile(r"budget\s*(?:of|is|:|around|about|under|up to)?\s*\$?\s*" + NUMBER + r"\b", re.IGNORECASE),
+    re.compile(NUMBER + r"\s*budget\b", re.IGNORECASE),
+]
+MULTIPLIERS = {"k": 1000, "thousand": 1000, "m": 1000000, "million": 1000000}
+
+class RuleBasedSerializer:
+    """
+    Deterministic extractor for well-formed event prompts.
+
+    Recognizes the fields SerializerAgent asks the LLM for using the same
+    vocabularies as its prompt (event types, allowed other_requirements)
+    and returns data in the same shape, along with a confidence score
+    reflecting how many core fields were found. A prompt naming more than
+    one candidate location gets zero confidence, so the LLM resolves it.
+
+    Attributes:
+        weights (dict): Confidence contributed by each core field
+    """
+
+    weights = {
+        "location": 0.4,
+        "event_type": 0.2,
+        "head_count": 0.2,
+        "budget": 0.2,
+    }
+
+    def _location(self, prompt):
+        """
+        Find the event location, expanding known abbreviations.
+
+        Returns:
+            tuple: (location or None, number of distinct candidates found)
+        """
+        candidates = []
+
+        for match in LOCATION_RE.finditer(prompt):
+            words = match.group(1).split()
+
+            while words and words[0].lower().strip(".") in NON_LOCATIONS:
+                words = words[1:]
+
+            if not words:
+                continue
+
+            location = " ".join(words).rstrip(".")
+            location = LOCATION_ABBREVIATIONS.get(location.lower().replace(".", ""), location)
+
+            if location not in candidates:
+                candidates.append(location)
+
+        if not candidates:
+            for abbreviation, location in LOCATION_ABBREVIATIONS.items():
+                if re.search(rf"\b(?:in|at|near|around)\s+{abbreviation}\b", prompt, re.IGNORECASE):
+                    candidates.append(location)
+                    break
+
+        return (candidates[0] if candidates else None), len(candidates)
+
+    def _event_type(self, lowered):
+        """
+        Match the first event type whose keywords appear in the prompt.
+
+        Returns:
+            str: Event type, or None if no keyword matched
+        """
+        for event_type, keywords in EVENT_TYPES:
+            if any(re.search(rf"\b{re.escape(keyword)}\b", lowered) for keyword in keywords):
+                return event_type
+
+        return None
+
+    def _head_count(self, prompt):
+        """
+        Extract the attendee range.
+
+        Returns:
+            tuple: (min, max) as strings, or None if not found
+        """
+        match = HEADCOUNT_RANGE_RE.search(prompt)
+        if match:
+            low, high = sorted(int(group.replace(",", "")) for group in match.groups())
+            return str(low), str(high)
+
+        match = HEADCOUNT_RE.search(prompt)
+        if match:
+            count = match.group(1).replace(",", "")
+            return count, count
+
+        return None
+
+    def _budget(self, prompt):
+        """
+        Extract the budget as a plain number string.
+
+        Returns:
+            str: Budget without symbols or commas, or None if not found
+        """
+        for pattern in BUDGET_RES:
+            match = pattern.search(prompt)
+            if match:
+                amount = float(match.group(1).replace(",", ""))
+                amount *= MULTIPLIERS.get((match.group(2) or "").lower(), 1)
+                return str(int(amount)) if amount == int(amount) else str(amount)
+
+        return None
+
+    def _matches(self, lowered, vocabulary):
+        """
+        Return canonical values whose phrases appear in the prompt, in prompt order.
+        """
+        found = []
+
+        for phrase, value in vocabulary:
+            match = re.search(rf"(?<![\w-]){re.escape(phrase)}(?![\w-])", lowered)
+            if match:
+                found.append((match.start(), value))
+
+        ordered = []
+        for _, value in sorted(found):
+            if value not in ordered:
+                ordered.append(value)
+
+        return ordered
+
+    def extract(self, prompt: str):
+        """
+        Extract structured event data from a prompt.
+
+        Args:
+            prompt (str): Natural language description of the event
+
+        Returns:
+            tuple: (data, confidence) where data has the same fields as
+                   SerializerAgent.serialize_prompt and confidence is
+                   between 0.0 and 1.0 (0.0 when the location is ambiguous)
+        """
+        lowered = prompt.lower()
+        confidence = 0.0
+
+        location, location_candidates = self._location(prompt)
+        if location:
+            confidence += self.weights["location"]
+
+        event_type = self._event_type(lowered)
+        if event_type:
+            confidence += self.weights["event_type"]
+
+        head_count = self._head_count(prompt)
+        if head_count:
+            confidence += self.weights["head_count"]
+
+        budget = self._budget(prompt)
+        if budget:
+            confidence += self.weights["budget"]
+
+        cuisines = self._matches(lowered, CUISINES.items())
+        dietary_preferences = self._matches(lowered, DIETARY_PREFERENCES.items())
+        other_requirements = self._matches(
+            lowered,
+            [(phrase, requirement) for requirement, phrases in OTHER_REQUIREMENTS.items() for phrase in phrases]
+        )
+
+        data = {
+            "location": location or "unknown",
+            "event_type": event_type or "unknown",
+            "budget": budget or "unknown",
+            "min_head_count": head_count[0] if head_count else "unknown",
+            "max_head_count": head_count[1] if head_count else "unknown",
+            "cuisines": cuisines or ["American"],
+            "dietary_preferences": dietary_preferences,
+            "other_requirements": other_requirements,
+        }
+
+        if location_candidates > 1:
+            return data, 0.0
+
+        return data, round(confidence, 2)
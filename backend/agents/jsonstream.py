@@ -0,0 +1,271 @@
+from backend.metrics import record_usage, llm_first_item
+from types import SimpleNamespace
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+THINK_OPEN = "<think>"
+THINK_CLOSE = "</think>"
+
+class StreamingJSONParser:
+    """
+    Incremental parser for the JSON object in an LLM reply.
+
+    Text is fed in chunks as the model streams it. <think> blocks,
+    markdown fences and prose before the object are dropped as they
+    arrive; the object itself is tracked character by character so that
+    the parser reports done as soon as the top-level object closes, and
+    the caller can stop reading. Only the complete object is decoded.
+
+    Attributes:
+        done (bool): Whether the top-level object is complete
+        chunks (int): Number of chunks fed
+        first_item_at (float): time.monotonic() when the first object inside a
+                               top-level array (one recommendation) closed, or None
+    """
+
+    def __init__(self):
+        """
+        Initialize a parser waiting for the start of the object.
+        """
+        self.done = False
+        self.chunks = 0
+        self.first_item_at = None
+        self._preamble = ""
+        self._text = ""
+        self._stack = []
+        self._in_string = False
+        self._escape = False
+
+    def _skip_preamble(self, text) -> str:
+        """
+        Consume text before the object starts.
+
+        Args:
+            text (str): Newly received text
+
+        Returns:
+            str: Text from the opening brace onwards, or "" if it has not arrived
+        """
+        buffer = self._preamble + text
+
+        while True:
+            brace = buffer.find("{")
+            think = buffer.find(THINK_OPEN)
+
+            if think != -1 and (brace == -1 or think < brace):
+                end = buffer.find(THINK_CLOSE, think)
+                if end == -1:
+                    self._preamble = buffer[think:]
+                    return ""
+                buffer = buffer[end + len(THINK_CLOSE):]
+                continue
+
+            if brace != -1:
+                self._preamble = ""
+                return buffer[brace:]
+
+            # Keep a tail that may be the start of a split <think> tag
+            self._preamble = buffer[-(len(THINK_OPEN) - 1):]
+            return ""
+
+    def feed(self, text):
+        """
+        Consume a chunk of the reply.
+
+        Args:
+            text (str): Next piece of the reply (may be empty or None)
+        """
+        self.chunks += 1
+        if self.done or not text:
+            return
+
+        if not self._stack and not self._text:
+            text = self._skip_preamble(text)
+            if not text:
+                return
+
+        for index, char in enumerate(text):
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif char == "\\":
+                    self._escape = True
+                elif char == '"':
+                    self._in_string = False
+                continue
+
+            if char == '"':
+                self._in_string = True
+            elif char in "{[":
+                self._stack.append(char)
+            elif char in "}]":
+                if not self._stack:
+                    continue
+                self._stack.pop()
+
+                if char == "}" and self._stack == ["{", "["] and self.first_item_at is None:
+                    self.first_item_at = time.monotonic()
+                elif not self._stack:
+                    self._text += text[:index + 1]
+                    self.done = True
+                    break
+        else:
+            self._text += text
+
+    def result(self) -> dict:
+        """
+        Decode the complete object.
+
+        Returns:
+            dict: Parsed JSON data
+
+        Raises:
+            ValueError: If no complete JSON object was received or it cannot be parsed
+        """
+        if not self._text:
+            raise ValueError("No JSON found in LLM response")
+        if not self.done:
+            raise ValueError("LLM response ended before the JSON object was complete")
+
+        try:
+            return json.loads(self._text)
+        except json.JSONDecodeError as e:
+            logger.debug(f"Unparseable LLM JSON (first 200 chars): {self._text[:200]}")
+            raise ValueError(f"Failed to parse JSON: {e}")
+
+def parse_response(response) -> dict:
+    """
+    Parse the JSON object in a complete LLM reply.
+
+    Args:
+        response (str): Raw response text from the LLM
+
+    Returns:
+        dict: Parsed JSON data
+
+    Raises:
+        ValueError: If JSON cannot be found or parsed
+    """
+    if response is None:
+        raise ValueError("No response from LLM")
+
+    parser = StreamingJSONParser()
+    parser.feed(response)
+    return parser.result()
+
+def _delta(chunk):
+    """
+    Text carried by a streamed completion chunk, and its usage if reported.
+    """
+    choices = getattr(chunk, "choices", None) or []
+    text = getattr(getattr(choices[0], "delta", None), "content", None) if choices else None
+    return text, getattr(chunk, "usage", None)
+
+def estimate_tokens(messages) -> int:
+    """
+    Roughly estimate the input tokens of a chat request (about 4 characters per token).
+
+    Args:
+        messages (list): Chat messages
+
+    Returns:
+        int: Estimated token count
+    """
+    return sum(len(message["content"]) for message in messages) // 4 + 1
+
+def _record(agent, parser, started, usage, messages):
+    """
+    Record token usage and time to the first item of a consumed stream.
+
+    The usage chunk comes after the last token, so streams cut short at
+    the end of the object rarely see it. Their input tokens are then
+    estimated from the messages and their output tokens counted as the
+    chunks read, and both are recorded as estimates.
+    """
+    if usage is not None:
+        record_usage(agent, SimpleNamespace(usage=usage))
+    else:
+        estimate = SimpleNamespace(prompt_tokens=estimate_tokens(messages or []), completion_tokens=parser.chunks)
+        record_usage(agent, SimpleNamespace(usage=estimate), estimated=True)
+
+    if parser.first_item_at is not None:
+        llm_first_item.observe(parser.first_item_at - started, agent=agent)
+
+def consume(agent, stream, messages=None) -> dict:
+    """
+    Read a streamed chat completion until its JSON object is complete.
+
+    The stream is closed as soon as the object closes, so trailing tokens
+    are not downloaded. The time until the first recommendation closes is
+    recorded as a metric.
+
+    Args:
+        agent (str): Agent name, for metrics
+        stream (iterable): Chat completion stream chunks
+        messages (list, optional): Chat messages of the request, to estimate
+                                   input tokens when no usage is reported
+
+    Returns:
+        dict: Parsed JSON data
+
+    Raises:
+        ValueError: If JSON cannot be found or parsed
+    """
+    parser = StreamingJSONParser()
+    started = time.monotonic()
+    usage = None
+
+    try:
+        for chunk in stream:
+            text, chunk_usage = _delta(chunk)
+            usage = chunk_usage or usage
+
+            parser.feed(text)
+            if parser.done:
+                break
+    finally:
+        close = getattr(stream, "close", None)
+        if close is not None:
+            close()
+
+    _record(agent, parser, started, usage, messages)
+    return parser.result()
+
+async def aconsume(agent, stream, messages=None) -> dict:
+    """
+    Async variant of consume.
+
+    Args:
+        agent (str): Agent name, for metrics
+        stream (async iterable): Chat completion stream chunks
+        messages (list, optional): Chat messages of the request, to estimate
+                                   input tokens when no usage is reported
+
+    Returns:
+        dict: Parsed JSON data
+
+    Raises:
+        ValueError: If JSON cannot be found or parsed
+    """
+    parser = StreamingJSONParser()
+    started = time.monotonic()
+    usage = None
+
+    try:
+        async for chunk in stream:
+            text, chunk_usage = _delta(chunk)
+            usage = chunk_usage or usage
+
+            parser.feed(text)
+            if parser.done:
+                break
+    finally:
+        close = getattr(stream, "aclose", None)
+        if close is not None:
+            await close()
+
+    _record(agent, parser, started, usage, messages)
+    return parser.result()
@@ -1,7 +1,14 @@
-from huggingface_hub import InferenceClient
-from backend.config import get_hf_key
-import json
-import re
+from huggingface_hub import InferenceClient, AsyncInferenceClient
+from backend.metrics import span, fast_path
+from backend.config import get_hf_key, get_fast_path_threshold
+from backend.cache import SingleFlight, completion_key
+from backend.agents.jsonstream import consume, aconsume
+from backend.ratelimit import get_limiter
+from backend.agents.fastpath import RuleBasedSerializer, OTHER_REQUIREMENTS
+from backend.deadline import DeadlineExceeded
+from backend import deadline
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+import asyncio
 
 class SerializerAgent:
     """
@@ -13,73 +20,230 @@ class SerializerAgent:
     
     Attributes:
         client (InferenceClient): HuggingFace inference client
+        async_client (AsyncInferenceClient): HuggingFace client for the async path
+        completion_cache (CompletionCache): Shared cache of parsed completions, or None
+        flight (SingleFlight): Coalesces concurrent identical completion requests
+        limiter (RateLimiter): Process-wide HF Inference rate limiter
         model (str): Name of the LLM model used for serialization
+        fast_path (RuleBasedSerializer): Deterministic extractor tried before the LLM
+        fast_path_threshold (float): Minimum fast path confidence to skip the LLM
     """
     
-    def __init__(self):
+    def __init__(self, completion_cache=None):
         """
         Initialize the SerializerAgent with HuggingFace client and model.
+
+        Args:
+            completion_cache (CompletionCache, optional): Cache shared with the
+                                                          other agents. Defaults to None.
         """
         self.client = InferenceClient(
             api_key=get_hf_key()
         )
+        self.async_client = AsyncInferenceClient(
+            api_key=get_hf_key()
+        )
+        self.completion_cache = completion_cache
+        self.flight = SingleFlight("serializer")
+        self.limiter = get_limiter("hf")
 
         self.model = "HuggingFaceTB/SmolLM3-3B"
+        self.fast_path = RuleBasedSerializer()
+        self.fast_path_threshold = get_fast_path_threshold()
 
-    def _parse_response(self, response) -> dict:
+    def _fast_path(self, prompt: str):
         """
-        Parse JSON from LLM response, handling various formats.
-        
-        Attempts to extract JSON from markdown code blocks or raw text,
-        while removing thinking tags and other noise from the response.
-        
+        Try the deterministic extractor before calling the LLM.
+
         Args:
-            response (str): Raw response text from the LLM
-        
+            prompt (str): Natural language description of the event
+
+        Returns:
+            dict: Extracted data if the extractor is confident enough, else None
+        """
+        data, confidence = self.fast_path.extract(prompt)
+        accepted = confidence >= self.fast_path_threshold
+        fast_path.inc(outcome="hit" if accepted else "miss")
+        return data if accepted else None
+
+    def _complete(self, messages: list) -> dict:
+        """
+        Run a chat completion and parse its JSON, using the completion cache.
+
+        Concurrent identical requests share one completion. Under a request
+        deadline, the call is abandoned when the deadline passes.
+
+        Args:
+            messages (list): Chat messages for the completion request
+
         Returns:
             dict: Parsed JSON data
-        
+
         Raises:
-            ValueError: If JSON cannot be found or parsed
+            DeadlineExceeded: If the model does not answer before the deadline
         """
+        if self.completion_cache is not None:
+            cached = self.completion_cache.get("serializer", self.model, messages)
+            if cached is not None:
+                return cached
+
+        request_deadline = deadline.current()
+        if request_deadline is None:
+            return self._call(messages)
+
+        executor = ThreadPoolExecutor(max_workers=1)
         try:
-            if response is None:
-                raise ValueError("No response from LLM")
-
-            # Remove thinking tags
-            cleaned = re.sub(r"<think>.*?</think>", "", response, flags=re.DOTALL)
-            
-            # Try to find JSON in markdown code blocks first
-            match = re.search(r"```(?:json)?\s*(\{.*?\})\s*```", cleaned, re.DOTALL)
-            
-            if match:
-                json_str = match.group(1)
-            else:
-                # Try to find raw JSON object
-                match = re.search(r"(\{.*\})", cleaned, re.DOTALL)
-                if match:
-                    json_str = match.group(1)
-                else:
-                    # Print response for debugging
-                    print(f"\n=== LLM Response (first 500 chars) ===")
-                    print(response[:500])
-                    print(f"\n=== End Response ===")
-                    raise ValueError("No JSON found in LLM response")
-
-            return json.loads(json_str)
-
-        except json.JSONDecodeError as e:
-            print(f"\n=== JSON Parse Error ===")
-            print(f"Error: {e}")
-            print(f"Attempted to parse: {json_str[:200] if 'json_str' in locals() else 'N/A'}") #type: ignore
-            print(f"=== End Error ===")
-            raise ValueError(f"Failed to parse JSON: {e}")
-        except Exception as e:
-            raise ValueError(f"Failed to parse LLM response: {e}")
+            return executor.submit(deadline.propagate(self._call), messages).result(timeout=request_deadline.remaining())
+        except FutureTimeoutError:
+            raise DeadlineExceeded("Serializer did not answer before the deadline")
+        finally:
+            # An abandoned call finishes in the background and still fills the cache
+            executor.shutdown(wait=False)
+
+    def _call(self, messages: list) -> dict:
+        """
+        Request a completion, sharing it with concurrent identical requests.
+        """
+        return self.flight.do(completion_key(self.model, messages), lambda: self._request(messages))
+
+    def _request(self, messages: list) -> dict:
+        """
+        Stream the reply until its JSON object closes and store the result in the completion cache.
+
+        Args:
+            messages (list): Chat messages for the completion request
+
+        Returns:
+            dict: Parsed JSON data
+        """
+        with span("serializer"):
+            stream = self.limiter.call(lambda: self.client.chat.completions.create(
+                model=self.model,
+                temperature=0.0,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True}
+            ))
+            result = consume("serializer", stream, messages)
+
+        if self.completion_cache is not None:
+            self.completion_cache.set(self.model, messages, result)
+
+        return result
+
+    async def _acomplete(self, messages: list) -> dict:
+        """
+        Async variant of _complete.
+
+        Args:
+            messages (list): Chat messages for the completion request
+
+        Returns:
+            dict: Parsed JSON data
+
+        Raises:
+            DeadlineExceeded: If the model does not answer before the deadline
+        """
+        if self.completion_cache is not None:
+            cached = await self.completion_cache.aget("serializer", self.model, messages)
+            if cached is not None:
+                return cached
+
+        try:
+            return await asyncio.wait_for(
+                self.flight.ado(completion_key(self.model, messages), lambda: self._arequest(messages)),
+                deadline.timeout()
+            )
+        except asyncio.TimeoutError:
+            raise DeadlineExceeded("Serializer did not answer before the deadline")
+
+    async def _arequest(self, messages: list) -> dict:
+        """
+        Async variant of _request.
+
+        Args:
+            messages (list): Chat messages for the completion request
+
+        Returns:
+            dict: Parsed JSON data
+        """
+        with span("serializer"):
+            stream = await self.limiter.acall(lambda: self.async_client.chat.completions.create(
+                model=self.model,
+                temperature=0.0,
+                messages=messages,
+                stream=True,
+                stream_options={"include_usage": True}
+            ))
+            result = await aconsume("serializer", stream, messages)
+
+        if self.completion_cache is not None:
+            await self.completion_cache.aset(self.model, messages, result)
+
+        return result
+
+    def _messages(self, prompt: str) -> list:
+        """
+        Build the chat messages for serializing a prompt.
+
+        Args:
+            prompt (str): Natural language description of the event
+
+        Returns:
+            list: Chat messages for the completion request
+        """
+        return [
+            {
+                "role": "system",
+                "content": f"""
+                    Serialize this prompt into JSON. Extract the following fields:
+                    - location (string)
+                    - event_type (string)
+                    - budget (string)
+                    - min_head_count (string)
+                    - max_head_count (string)
+                    - cuisines (array of strings)
+                    - dietary_preferences (array of strings)
+                    - other_requirements (array of strings)
+
+                    Instructions for location:
+                    - don't use abbreviations (e.g., 'NYC' instead of 'New York City')
+
+                    Instructions for budget:
+                    - just put the number, no commas or other symbols
+
+                    Instructions for cuisines:
+                    - only include cuisines that are explicitly mentioned in the prompt, if none is mentioned, default to "American"
+
+                    Instructions for head_count:
+                    - If the text mentions 'X attendees' or 'around X people', use X for both min_head_count and max_head_count.
+                    - If the text mentions a single number of attendees, use that number for both min_head_count and max_head_count.
+                    - If a range is given (e.g., 100-150 attendees), use the lower number as min_head_count and the higher as max_head_count.
+
+                    Instructions for event_type:
+                    - Choose the event type from the following list only:
+                      Conference, Seminar, Workshop, Lecture, Talk, Guest Speaker, Community Meeting, Town Hall, Celebration, Festival, Party, Wedding, Engagement, Religious Ceremony, Prayer Event, Iftar, Eid Gathering, Charity, Fundraiser
+                    - Use context clues to infer the event type if it's not explicitly mentioned.
+                    - If words like iftar or ramadan are mentioned, classify as Iftar.
+
+                    Instructions for other_requirements:
+                    - Only include items in other_requirements if the user explicitly mentions them.
+                    - Allowed requirements are: {', '.join(OTHER_REQUIREMENTS)}
+                    - Do not infer anything from the prompt text; only include explicitly mentioned requirements
+
+                    If information is missing, set the field to 'unknown'.
+
+                    User text:
+                    {prompt}"""
+            }
+        ]
 
     def serialize_prompt(self, prompt: str) -> dict:
         """
         Convert natural language event description to structured JSON.
+
+        Well-formed prompts are handled by the rule-based fast path; the
+        LLM is only called when the fast path is not confident.
         
         Extracts key information from a natural language prompt including:
         - location: Event location (city/venue)
@@ -108,58 +272,35 @@ class SerializerAgent:
             >>> print(data['location'])
             'San Francisco'
         """
+        data = self._fast_path(prompt)
+        if data is not None:
+            return data
+
         try:
-            completion = self.client.chat.completions.create(
-                model=self.model,
-                temperature=0.0,
-                messages=[
-                    {
-                        "role": "system",
-                        "content": f"""
-                            Serialize this prompt into JSON. Extract the following fields:
-                            - location (string)
-                            - event_type (string)
-                            - budget (string)
-                            - min_head_count (string)
-                            - max_head_count (string)
-                            - cuisines (array of strings)
-                            - dietary_preferences (array of strings)
-                            - other_requirements (array of strings)
-
-                            Instructions for location:
-                            - don't use abbreviations (e.g., 'NYC' instead of 'New York City')
-
-                            Instructions for budget:
-                            - just put the number, no commas or other symbols
-
-                            Instructions for cuisines:
-                            - only include cuisines that are explicitly mentioned in the prompt, if none is mentioned, default to "American"
-
-                            Instructions for head_count:
-                            - If the text mentions 'X attendees' or 'around X people', use X for both min_head_count and max_head_count.
-                            - If the text mentions a single number of attendees, use that number for both min_head_count and max_head_count.
-                            - If a range is given (e.g., 100-150 attendees), use the lower number as min_head_count and the higher as max_head_count.
-
-                            Instructions for event_type:
-                            - Choose the event type from the following list only:
-                              Conference, Seminar, Workshop, Lecture, Talk, Guest Speaker, Community Meeting, Town Hall, Celebration, Festival, Party, Wedding, Engagement, Religious Ceremony, Prayer Event, Iftar, Eid Gathering, Charity, Fundraiser
-                            - Use context clues to infer the event type if it's not explicitly mentioned.
-                            - If words like iftar or ramadan are mentioned, classify as Iftar.
-
-                            Instructions for other_requirements:
-                            - Only include items in other_requirements if the user explicitly mentions them.
-                            - Allowed requirements are: AV equipment, projector, microphone, sound system, accessible facilities, wheelchair access, indoor, outdoor, stage, podium, performance area, food, catering, dietary restrictions, parking, transport accessibility, decorations, setup requirements
-                            - Do not infer anything from the prompt text; only include explicitly mentioned requirements
-
-                            If information is missing, set the field to 'unknown'.
-
-                            User text:
-                            {prompt}"""
-                    }
-                ],
-            )
+            return self._complete(self._messages(prompt))
+
+        except Exception as e:
+            raise ValueError(f"Failed to serialize prompt: {e}")
 
-            return self._parse_response(completion.choices[0].message.content)
+    async def aserialize_prompt(self, prompt: str) -> dict:
+        """
+        Async variant of serialize_prompt.
+
+        Args:
+            prompt (str): Natural language description of the event
+
+        Returns:
+            dict: Structured event data with all extracted fields
+
+        Raises:
+            ValueError: If LLM request fails or response cannot be parsed
+        """
+        data = self._fast_path(prompt)
+        if data is not None:
+            return data
+
+        try:
+            return await self._acomplete(self._messages(prompt))
 
         except Exception as e:
             raise ValueError(f"Failed to serialize prompt: {e}")
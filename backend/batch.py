@@ -0,0 +1,254 @@
+from dotenv import load_dotenv
+from backend.config import get_batch_workers, get_log_level
+from backend.cache import normalize_key
+from backend.pipeline import PlannerPipeline
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor, FIRST_COMPLETED, wait
+import argparse
+import json
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+_pipeline = None
+
+def _init_process():
+    """
+    Build the pipeline of a worker process.
+    """
+    global _pipeline
+    _pipeline = PlannerPipeline()
+
+def _plan_in_process(prompt, result_count, radius, deadline):
+    """
+    Run one plan on the worker process's pipeline.
+    """
+    return _pipeline.plan(prompt, result_count, radius, deadline) # type: ignore
+
+def read_requests(path):
+    """
+    Stream plan requests from a JSONL file.
+
+    Each line is an object with "prompt" and optional "id", "result_count",
+    "radius" and "deadline". Lines without an id are identified by their
+    line number. Blank lines are skipped.
+
+    Args:
+        path (str): Input file
+
+    Yields:
+        dict: {"id", "prompt", "result_count", "radius", "deadline"}
+
+    Raises:
+        ValueError: If a line is not a JSON object with a prompt
+    """
+    with open(path) as f:
+        for number, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+
+            try:
+                data = json.loads(line)
+                prompt = data["prompt"]
+            except (json.JSONDecodeError, KeyError, TypeError) as e:
+                raise ValueError(f"{path}:{number}: expected a JSON object with a prompt ({e})")
+
+            yield {
+                "id": str(data.get("id", number)),
+                "prompt": prompt,
+                "result_count": data.get("result_count") or 15,
+                "radius": data.get("radius") or 20000,
+                "deadline": data.get("deadline")
+            }
+
+def load_checkpoint(path) -> set:
+    """
+    Collect the IDs already planned successfully in an output file.
+
+    A line cut short by a crash is dropped from the file so appended
+    results start on a fresh line. Failed requests are not checkpointed
+    and run again on resume.
+
+    Args:
+        path (str): Output file
+
+    Returns:
+        set: IDs with a successful result
+    """
+    if not os.path.exists(path):
+        return set()
+
+    completed = set()
+    valid = 0
+
+    with open(path, "rb") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                break
+
+            if not line.endswith(b"\n"):
+                break
+
+            valid += len(line)
+            if record.get("status") == "success":
+                completed.add(record["id"])
+
+    if valid < os.path.getsize(path):
+        with open(path, "rb+") as f:
+            f.truncate(valid)
+
+    return completed
+
+class BatchPlanner:
+    """
+    Runs a batch of plan requests with shared upstream work.
+
+    Requests are planned in parallel on one PlannerPipeline per process, so
+    the geocode, place index, place details and completion caches and the
+    in-flight coalescing are shared across the whole batch; requests whose
+    normalized prompt, result_count and radius match are planned once.
+    Results are appended to the output as they finish, and the output
+    doubles as the checkpoint: rerunning the same batch skips requests that
+    already have a successful result.
+
+    Attributes:
+        workers (int): Plans run at once on threads
+        processes (int): Worker processes; 0 plans on threads in this process
+        deadline (float): Default time budget of a plan, or None for PLAN_DEADLINE
+    """
+
+    def __init__(self, workers=None, processes=0, deadline=None):
+        """
+        Initialize the batch planner.
+
+        Args:
+            workers (int, optional): Plans run at once on threads. Defaults to BATCH_WORKERS.
+            processes (int, optional): Worker processes, each with its own
+                                       pipeline sharing the disk caches and
+                                       running one plan at a time. Defaults
+                                       to 0 (threads in this process).
+            deadline (float, optional): Default time budget of a plan in seconds.
+
+        Raises:
+            ValueError: If both workers and processes are given
+        """
+        if workers and processes:
+            raise ValueError("workers and processes cannot be combined; each process runs one plan at a time")
+
+        self.workers = workers or get_batch_workers()
+        self.processes = processes
+        self.deadline = deadline
+
+    def _executor(self) -> tuple:
+        """
+        Pool the plans run on, and the function running one plan in it.
+
+        Returns:
+            tuple: (executor, plan function, plans in flight at once)
+        """
+        if self.processes:
+            executor = ProcessPoolExecutor(max_workers=self.processes, initializer=_init_process)
+            return executor, _plan_in_process, self.processes
+
+        executor = ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="batch")
+        return executor, PlannerPipeline().plan, self.workers
+
+    def run(self, requests, output) -> dict:
+        """
+        Plan every request not already checkpointed in the output.
+
+        Args:
+            requests (iterable): Requests as yielded by read_requests
+            output (str): Output JSONL file, appended to
+
+        Returns:
+            dict: {"planned": int, "succeeded": int, "failed": int, "skipped": int, "seconds": float}
+        """
+        completed = load_checkpoint(output)
+        summary = {"planned": 0, "succeeded": 0, "failed": 0, "skipped": 0, "seconds": 0.0}
+        started = time.monotonic()
+
+        executor, plan, window = self._executor()
+        running = {}
+        waiting = {}
+
+        def write(out, request, result=None, error=None):
+            if error is None:
+                venues, catering = result
+                record = {"id": request["id"], "status": "success", "venues": venues, "catering": catering}
+                summary["succeeded"] += 1
+            else:
+                record = {"id": request["id"], "status": "error", "error": str(error)}
+                summary["failed"] += 1
+                logger.warning(f"Request {request['id']} failed: {error}")
+
+            out.write(json.dumps(record) + "\n")
+            out.flush()
+
+        def finish(out, futures):
+            for future in futures:
+                key = running.pop(future)
+                error = future.exception()
+                for request in waiting.pop(key):
+                    write(out, request, None if error else future.result(), error)
+
+        with executor, open(output, "a") as out:
+            for request in requests:
+                if request["id"] in completed:
+                    summary["skipped"] += 1
+                    continue
+
+                summary["planned"] += 1
+                key = (normalize_key(request["prompt"]), request["result_count"], request["radius"])
+                if key in waiting:
+                    waiting[key].append(request)
+                    continue
+
+                while len(running) >= window:
+                    done, _ = wait(running, return_when=FIRST_COMPLETED)
+                    finish(out, done)
+
+                args = (request["prompt"], request["result_count"], request["radius"], request["deadline"] or self.deadline)
+                running[executor.submit(plan, *args)] = key
+                waiting[key] = [request]
+
+            while running:
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+                finish(out, done)
+
+        summary["seconds"] = round(time.monotonic() - started, 2)
+        return summary
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Args:
+        argv (list, optional): Arguments. Defaults to sys.argv[1:].
+    """
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.batch",
+        description="Plan every prompt of a JSONL file, writing results as JSONL as they finish."
+    )
+    parser.add_argument("input", help="JSONL file of {\"prompt\", \"id\"?, \"result_count\"?, \"radius\"?, \"deadline\"?}")
+    parser.add_argument("output", help="JSONL results file; rerunning resumes after its successful results")
+    parser.add_argument("--workers", type=int, help="Plans run at once on threads (default BATCH_WORKERS)")
+    parser.add_argument("--processes", type=int, default=0, help="Run plans in this many processes instead of threads, one plan per process at a time")
+    parser.add_argument("--deadline", type=float, help="Time budget per plan in seconds (default PLAN_DEADLINE)")
+    args = parser.parse_args(argv)
+
+    if args.workers and args.processes:
+        parser.error("--workers and --processes cannot be combined; with --processes each process runs one plan at a time")
+
+    logging.basicConfig(level=get_log_level())
+
+    planner = BatchPlanner(workers=args.workers, processes=args.processes, deadline=args.deadline)
+    print(json.dumps(planner.run(read_requests(args.input), args.output)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,987 @@
+from collections import OrderedDict
+from concurrent.futures import Future
+from backend.config import (
+    get_cache_path, get_completion_cache_backend, get_completion_cache_ttl, get_completion_cache_size
+)
+from backend.metrics import coalesced
+import asyncio
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+
+class LRUCache:
+    """
+    Thread-safe in-process LRU cache with TTL expiry.
+
+    Attributes:
+        max_size (int): Maximum number of entries kept in memory
+        ttl (float): Seconds an entry stays fresh, or None for no expiry
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups that found no fresh entry
+    """
+
+    def __init__(self, max_size=1024, ttl=None):
+        """
+        Initialize an empty cache.
+
+        Args:
+            max_size (int, optional): Maximum number of entries. Defaults to 1024.
+            ttl (float, optional): Entry lifetime in seconds. Defaults to None.
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._data = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_entry(self, key):
+        """
+        Look up an entry regardless of its age.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (value, stored_at), or None if missing
+        """
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is not None:
+                self._data.move_to_end(key)
+
+            return entry
+
+    def get(self, key):
+        """
+        Look up a fresh entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        with self._lock:
+            entry = self._data.get(key)
+
+            if entry is None or (self.ttl is not None and time.time() - entry[1] > self.ttl):
+                self.misses += 1
+                return None
+
+            self._data.move_to_end(key)
+            self.hits += 1
+            return entry[0]
+
+    def count(self, hit):
+        """
+        Record a lookup answered from this cache, or a miss, for callers that check freshness themselves.
+
+        Args:
+            hit (bool): Whether the lookup found a fresh entry
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def set(self, key, value, stored_at=None):
+        """
+        Store an entry, evicting the least recently used one if full.
+
+        Args:
+            key (str): Cache key
+            value: Value to store
+            stored_at (float, optional): Timestamp of the value. Defaults to now.
+        """
+        with self._lock:
+            self._data[key] = (value, stored_at if stored_at is not None else time.time())
+            self._data.move_to_end(key)
+
+            while len(self._data) > self.max_size:
+                self._data.popitem(last=False)
+
+    def delete(self, key):
+        """
+        Remove an entry if present.
+
+        Args:
+            key (str): Cache key
+        """
+        with self._lock:
+            self._data.pop(key, None)
+
+    def stats(self) -> dict:
+        """
+        Report cache size and hit/miss counters.
+
+        Returns:
+            dict: {"size": int, "hits": int, "misses": int}
+        """
+        with self._lock:
+            return {"size": len(self._data), "hits": self.hits, "misses": self.misses}
+
+class SQLiteCache:
+    """
+    Disk-backed cache shared by every process that opens the same file.
+
+    Values are stored as JSON in a single table partitioned by namespace,
+    so several caches can share one database file. The database runs in
+    WAL mode so that concurrent uvicorn workers can read while one writes.
+
+    Attributes:
+        path (str): Path of the SQLite database file
+        namespace (str): Partition of the table used by this cache
+        ttl (float): Seconds an entry stays fresh, or None for no expiry
+        hits (int): Number of lookups answered from the cache
+        misses (int): Number of lookups that found no fresh entry
+    """
+
+    def __init__(self, path, namespace, ttl=None):
+        """
+        Open (and create if needed) the cache database.
+
+        Args:
+            path (str): Path of the SQLite database file
+            namespace (str): Partition of the table used by this cache
+            ttl (float, optional): Entry lifetime in seconds. Defaults to None.
+        """
+        self.path = path
+        self.namespace = namespace
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        self._conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS cache (
+                namespace TEXT NOT NULL,
+                key TEXT NOT NULL,
+                value TEXT NOT NULL,
+                stored_at REAL NOT NULL,
+                PRIMARY KEY (namespace, key)
+            )
+            """
+        )
+        self._conn.commit()
+
+    def get_entry(self, key):
+        """
+        Look up an entry regardless of its age.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (value, stored_at), or None if missing
+        """
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT value, stored_at FROM cache WHERE namespace = ? AND key = ?",
+                (self.namespace, key)
+            ).fetchone()
+
+        if row is None:
+            return None
+
+        return json.loads(row[0]), row[1]
+
+    def get(self, key):
+        """
+        Look up a fresh entry.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        entry = self.get_entry(key)
+
+        if entry is None or (self.ttl is not None and time.time() - entry[1] > self.ttl):
+            self.count(False)
+            return None
+
+        self.count(True)
+        return entry[0]
+
+    def count(self, hit):
+        """
+        Record a lookup answered from this cache, or a miss, for callers that check freshness themselves.
+
+        Args:
+            hit (bool): Whether the lookup found a fresh entry
+        """
+        with self._lock:
+            if hit:
+                self.hits += 1
+            else:
+                self.misses += 1
+
+    def set(self, key, value, stored_at=None):
+        """
+        Store an entry, replacing any previous value.
+
+        Args:
+            key (str): Cache key
+            value: JSON-serializable value
+            stored_at (float, optional): Timestamp of the value. Defaults to now.
+        """
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache (namespace, key, value, stored_at) VALUES (?, ?, ?, ?)",
+                (self.namespace, key, json.dumps(value), stored_at if stored_at is not None else time.time())
+            )
+            self._conn.commit()
+
+    def delete(self, key):
+        """
+        Remove an entry if present.
+
+        Args:
+            key (str): Cache key
+        """
+        with self._lock:
+            self._conn.execute("DELETE FROM cache WHERE namespace = ? AND key = ?", (self.namespace, key))
+            self._conn.commit()
+
+    def purge(self, max_age):
+        """
+        Delete entries older than max_age seconds.
+
+        Args:
+            max_age (float): Maximum age in seconds of entries to keep
+        """
+        with self._lock:
+            self._conn.execute(
+                "DELETE FROM cache WHERE namespace = ? AND stored_at < ?",
+                (self.namespace, time.time() - max_age)
+            )
+            self._conn.commit()
+
+    def trim(self, max_entries):
+        """
+        Delete the oldest entries beyond max_entries.
+
+        Args:
+            max_entries (int): Maximum number of entries to keep
+        """
+        with self._lock:
+            self._conn.execute(
+                """
+                DELETE FROM cache WHERE namespace = ? AND key NOT IN (
+                    SELECT key FROM cache WHERE namespace = ? ORDER BY stored_at DESC LIMIT ?
+                )
+                """,
+                (self.namespace, self.namespace, max_entries)
+            )
+            self._conn.commit()
+
+    def stats(self) -> dict:
+        """
+        Report cache size and hit/miss counters.
+
+        Returns:
+            dict: {"size": int, "hits": int, "misses": int}
+        """
+        with self._lock:
+            size = self._conn.execute("SELECT COUNT(*) FROM cache WHERE namespace = ?", (self.namespace,)).fetchone()[0]
+            return {"size": size, "hits": self.hits, "misses": self.misses}
+
+class TieredCache:
+    """
+    In-process LRU front backed by a shared SQLite store.
+
+    Lookups check memory first, then disk; disk hits are promoted into
+    memory with their original timestamp so they expire on schedule.
+    Expired rows are purged from disk every purge_interval writes, and
+    the disk tier is trimmed to max_disk_entries if one is set. The async
+    variants read memory inline and do disk work on a worker thread, so
+    a locked database never blocks the event loop.
+
+    Attributes:
+        memory (LRUCache): In-process front tier
+        disk (SQLiteCache): Shared persistent tier, or None for memory only
+        max_disk_entries (int): Maximum number of disk entries, or None
+        purge_interval (int): Number of writes between disk purges
+    """
+
+    purge_interval = 1000
+
+    def __init__(self, namespace, path=None, max_size=1024, ttl=None, max_disk_entries=None):
+        """
+        Initialize both tiers.
+
+        Args:
+            namespace (str): Partition of the disk table used by this cache
+            path (str, optional): SQLite database file. Memory only if omitted.
+            max_size (int, optional): Maximum in-memory entries. Defaults to 1024.
+            ttl (float, optional): Entry lifetime in seconds. Defaults to None.
+            max_disk_entries (int, optional): Maximum disk entries. Defaults to None.
+        """
+        self.memory = LRUCache(max_size=max_size, ttl=ttl)
+        self.disk = SQLiteCache(path, namespace, ttl=ttl) if path else None
+        self.max_disk_entries = max_disk_entries
+        self._writes = 0
+        self._lock = threading.Lock()
+
+    def get_entry(self, key):
+        """
+        Look up an unexpired entry in memory, then on disk, returning its age.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (value, stored_at), or None if missing or expired
+        """
+        entry = self._memory_entry(key)
+        if entry is not None or self.disk is None:
+            return entry
+
+        return self._disk_entry(key)
+
+    async def aget_entry(self, key):
+        """
+        Async variant of get_entry, reading the disk tier on a worker thread.
+        """
+        entry = self._memory_entry(key)
+        if entry is not None or self.disk is None:
+            return entry
+
+        return await asyncio.to_thread(self._disk_entry, key)
+
+    def _memory_entry(self, key):
+        """
+        Look up an unexpired entry in memory.
+        """
+        ttl = self.memory.ttl
+
+        entry = self.memory.get_entry(key)
+        if entry is not None and (ttl is None or time.time() - entry[1] <= ttl):
+            self.memory.count(True)
+            return entry
+
+        self.memory.count(False)
+        return None
+
+    def _disk_entry(self, key):
+        """
+        Look up an unexpired entry on disk, promoting it into memory.
+        """
+        ttl = self.memory.ttl
+
+        entry = self.disk.get_entry(key)
+        if entry is None or (ttl is not None and time.time() - entry[1] > ttl):
+            self.disk.count(False)
+            return None
+
+        self.disk.count(True)
+        self.memory.set(key, entry[0], stored_at=entry[1])
+        return entry
+
+    def get(self, key):
+        """
+        Look up a fresh entry in memory, then on disk.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            The cached value, or None if missing or expired
+        """
+        entry = self.get_entry(key)
+        return entry[0] if entry is not None else None
+
+    async def aget(self, key):
+        """
+        Async variant of get.
+        """
+        entry = await self.aget_entry(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key, value):
+        """
+        Store an entry in both tiers.
+
+        Args:
+            key (str): Cache key
+            value: JSON-serializable value
+        """
+        stored_at = time.time()
+        self.memory.set(key, value, stored_at=stored_at)
+
+        if self.disk is not None:
+            self._disk_set(key, value, stored_at)
+
+    async def aset(self, key, value):
+        """
+        Async variant of set, writing the disk tier on a worker thread.
+        """
+        stored_at = time.time()
+        self.memory.set(key, value, stored_at=stored_at)
+
+        if self.disk is not None:
+            await asyncio.to_thread(self._disk_set, key, value, stored_at)
+
+    def _disk_set(self, key, value, stored_at):
+        """
+        Store an entry on disk, purging and trimming every purge_interval writes.
+        """
+        self.disk.set(key, value, stored_at=stored_at)
+
+        with self._lock:
+            self._writes += 1
+            maintain = self._writes % self.purge_interval == 0
+
+        if maintain:
+            if self.disk.ttl is not None:
+                self.disk.purge(self.disk.ttl)
+            if self.max_disk_entries is not None:
+                self.disk.trim(self.max_disk_entries)
+
+    def stats(self) -> dict:
+        """
+        Report hit/miss counters for each tier.
+
+        Returns:
+            dict: {"memory": {...}, "disk": {...} or None}
+        """
+        return {
+            "memory": self.memory.stats(),
+            "disk": self.disk.stats() if self.disk is not None else None
+        }
+
+class SingleFlight:
+    """
+    Coalesces concurrent identical calls into one.
+
+    The first caller for a key runs the function; callers arriving while it
+    is still running wait for and share its result (or exception) instead
+    of repeating the work. Nothing is kept once the call finishes, so this
+    complements rather than replaces caching.
+
+    Async calls run as a separate task that every caller awaits through a
+    shield, so a caller that is cancelled (e.g. a client disconnecting)
+    does not cancel the work the other callers are waiting on.
+
+    Attributes:
+        name (str): Label used for the coalesced calls metric
+        shared (int): Number of calls that joined an in-flight call
+    """
+
+    def __init__(self, name):
+        """
+        Initialize an empty group.
+
+        Args:
+            name (str): Label used for the coalesced calls metric
+        """
+        self.name = name
+        self.shared = 0
+        self._inflight = {}
+        self._ainflight = {}
+        self._lock = threading.Lock()
+
+    def inflight(self, key) -> bool:
+        """
+        Whether a call for key is currently running.
+        """
+        with self._lock:
+            return key in self._inflight or key in self._ainflight
+
+    def _join(self):
+        """
+        Count a caller that joined an in-flight call.
+        """
+        with self._lock:
+            self.shared += 1
+        coalesced.inc(flight=self.name)
+
+    def do(self, key, fetch):
+        """
+        Run fetch, sharing the call with concurrent callers of the same key.
+
+        Args:
+            key (hashable): Identity of the call
+            fetch (callable): Zero-argument function producing the value
+
+        Returns:
+            The value produced by fetch
+
+        Raises:
+            Exception: Whatever fetch raised
+        """
+        with self._lock:
+            future = self._inflight.get(key)
+            owner = future is None
+
+            if owner:
+                future = Future()
+                self._inflight[key] = future
+
+        if not owner:
+            self._join()
+            return future.result()
+
+        try:
+            value = fetch()
+            future.set_result(value)
+            return value
+        except BaseException as e:
+            # Waiters are released even when the owner is interrupted
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._inflight.pop(key, None)
+
+    async def ado(self, key, fetch):
+        """
+        Async variant of do for coroutine fetchers.
+
+        Args:
+            key (hashable): Identity of the call
+            fetch (callable): Zero-argument coroutine function producing the value
+
+        Returns:
+            The value produced by fetch
+
+        Raises:
+            Exception: Whatever fetch raised
+        """
+        task = self._ainflight.get(key)
+
+        if task is None:
+            task = asyncio.ensure_future(fetch())
+            self._ainflight[key] = task
+
+            def done(finished):
+                self._ainflight.pop(key, None)
+                # Mark the exception as retrieved when every caller went away
+                if not finished.cancelled():
+                    finished.exception()
+
+            task.add_done_callback(done)
+        else:
+            self._join()
+
+        return await asyncio.shield(task)
+
+    def stats(self) -> dict:
+        """
+        Report the number of coalesced calls.
+
+        Returns:
+            dict: {"inflight": int, "shared": int}
+        """
+        with self._lock:
+            return {"inflight": len(self._inflight) + len(self._ainflight), "shared": self.shared}
+
+class StaleWhileRevalidateCache:
+    """
+    Read-through cache that serves stale entries while refreshing them.
+
+    Entries younger than fresh_ttl are returned directly. Entries older
+    than that but still held by the underlying cache are returned
+    immediately while a background refresh replaces them. Concurrent
+    lookups of the same missing key share one fetch.
+
+    Attributes:
+        cache (TieredCache): Underlying store; its TTL is the hard expiry
+        fresh_ttl (float): Seconds an entry is served without a refresh
+        executor (Executor): Pool used for background refreshes
+        flight (SingleFlight): Coalesces concurrent fetches of the same key
+        cacheable (callable): Predicate deciding whether a fetched value is stored
+    """
+
+    def __init__(self, cache, fresh_ttl, executor, name="cache", cacheable=None):
+        """
+        Initialize the cache.
+
+        Args:
+            cache (TieredCache): Underlying store
+            fresh_ttl (float): Seconds an entry is served without a refresh
+            executor (Executor): Pool used for background refreshes
+            name (str, optional): Label for the coalesced calls metric. Defaults to "cache".
+            cacheable (callable, optional): Called with each fetched value; values it
+                                            rejects are returned but not stored.
+                                            Defaults to storing every value.
+        """
+        self.cache = cache
+        self.fresh_ttl = fresh_ttl
+        self.executor = executor
+        self.flight = SingleFlight(name)
+        self.cacheable = cacheable
+        self.stale_hits = 0
+        self._refresh_tasks = set()
+        self._lock = threading.Lock()
+
+    def lookup(self, key):
+        """
+        Look up an entry without fetching it, counting stale entries as stale hits.
+
+        Args:
+            key (str): Cache key
+
+        Returns:
+            tuple: (value, fresh), or None if the underlying cache holds no entry
+        """
+        return self._classify(self.cache.get_entry(key))
+
+    async def alookup(self, key):
+        """
+        Async variant of lookup, reading the disk tier on a worker thread.
+        """
+        return self._classify(await self.cache.aget_entry(key))
+
+    def _classify(self, entry):
+        """
+        Split an underlying cache entry into (value, fresh), counting stale hits.
+        """
+        if entry is None:
+            return None
+
+        value, stored_at = entry
+        fresh = time.time() - stored_at <= self.fresh_ttl
+
+        if not fresh:
+            with self._lock:
+                self.stale_hits += 1
+
+        return value, fresh
+
+    def put(self, key, value):
+        """
+        Store a fetched value unless the cacheable predicate rejects it.
+        """
+        if self.cacheable is None or self.cacheable(value):
+            self.cache.set(key, value)
+
+    async def aput(self, key, value):
+        """
+        Async variant of put, writing the disk tier on a worker thread.
+        """
+        if self.cacheable is None or self.cacheable(value):
+            await self.cache.aset(key, value)
+
+    def load(self, key, fetch):
+        """
+        Fetch and store a value, sharing the call with concurrent loads of the same key.
+
+        Args:
+            key (str): Cache key
+            fetch (callable): Zero-argument function producing the value
+
+        Returns:
+            The fetched value
+
+        Raises:
+            Exception: Whatever fetch raised
+        """
+        def load():
+            value = fetch()
+            self.put(key, value)
+            return value
+
+        return self.flight.do(key, load)
+
+    def refresh(self, key, fetch):
+        """
+        Reload an entry in the background, keeping the stale value on failure.
+
+        Args:
+            key (str): Cache key
+            fetch (callable): Zero-argument function producing the value
+        """
+        if self.flight.inflight(key):
+            return
+
+        def run():
+            try:
+                self.load(key, fetch)
+            except Exception:
+                pass
+
+        self.executor.submit(run)
+
+    def get_or_fetch(self, key, fetch):
+        """
+        Return a cached value, fetching or refreshing it as needed.
+
+        Args:
+            key (str): Cache key
+            fetch (callable): Zero-argument function producing the value
+
+        Returns:
+            The cached or fetched value
+
+        Raises:
+            Exception: Whatever fetch raised, when no cached value exists
+        """
+        found = self.lookup(key)
+
+        if found is not None:
+            value, fresh = found
+            if not fresh:
+                self.refresh(key, fetch)
+            return value
+
+        return self.load(key, fetch)
+
+    async def aload(self, key, fetch):
+        """
+        Async variant of load for coroutine fetchers.
+
+        Args:
+            key (str): Cache key
+            fetch (callable): Zero-argument coroutine function producing the value
+
+        Returns:
+            The fetched value
+        """
+        async def load():
+            value = await fetch()
+            await self.aput(key, value)
+            return value
+
+        return await self.flight.ado(key, load)
+
+    def arefresh(self, key, fetch):
+        """
+        Async variant of refresh, running the reload as a task on the current event loop.
+
+        Args:
+            key (str): Cache key
+            fetch (callable): Zero-argument coroutine function producing the value
+        """
+        if self.flight.inflight(key):
+            return
+
+        async def run():
+            try:
+                await self.aload(key, fetch)
+            except Exception:
+                pass
+
+        task = asyncio.ensure_future(run())
+        self._refresh_tasks.add(task)
+        task.add_done_callback(self._refresh_tasks.discard)
+
+    async def aget_or_fetch(self, key, fetch):
+        """
+        Async variant of get_or_fetch for coroutine fetchers.
+
+        Args:
+            key (str): Cache key
+            fetch (callable): Zero-argument coroutine function producing the value
+
+        Returns:
+            The cached or fetched value
+        """
+        found = await self.alookup(key)
+
+        if found is not None:
+            value, fresh = found
+            if not fresh:
+                self.arefresh(key, fetch)
+            return value
+
+        return await self.aload(key, fetch)
+
+    def stats(self) -> dict:
+        """
+        Report hit/miss counters including stale hits.
+
+        Returns:
+            dict: Underlying cache stats plus {"stale_hits": int, "coalesced": int}
+        """
+        with self._lock:
+            stale_hits = self.stale_hits
+
+        return {**self.cache.stats(), "stale_hits": stale_hits, "coalesced": self.flight.stats()["shared"]}
+
+def completion_key(model, messages) -> str:
+    """
+    Hash a chat completion request into a stable key.
+
+    Args:
+        model (str): Model name
+        messages (list): Chat messages
+
+    Returns:
+        str: Hex SHA-256 digest of the canonical request
+    """
+    payload = json.dumps({"model": model, "messages": messages}, sort_keys=True, separators=(",", ":"))
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+class CompletionCache:
+    """
+    Content-addressed cache of parsed LLM completions.
+
+    Both agents call their models with temperature 0.0, so a (model,
+    messages) pair identifies its result. Entries hold the parsed JSON
+    result rather than raw completion text, and any store with get/set/stats
+    (LRUCache, SQLiteCache, TieredCache) can back the cache. The async
+    variants use the store's aget/aset when it has them (TieredCache), so
+    disk reads stay off the event loop.
+
+    Attributes:
+        store: Backing cache
+        agents (dict): Per-agent {"hits": int, "misses": int} counters
+    """
+
+    def __init__(self, store):
+        """
+        Initialize the cache.
+
+        Args:
+            store: Backing cache implementing get, set and stats
+        """
+        self.store = store
+        self.agents = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls):
+        """
+        Build the cache selected by COMPLETION_CACHE_BACKEND.
+
+        "memory" keeps an in-process LRU, "sqlite" adds the shared SQLite
+        store behind it, and "none" disables caching.
+
+        Returns:
+            CompletionCache: Configured cache, or None if disabled
+
+        Raises:
+            ValueError: If the backend name is not recognized
+        """
+        backend = get_completion_cache_backend()
+
+        if backend == "none":
+            return None
+        if backend == "memory":
+            return cls(LRUCache(max_size=get_completion_cache_size(), ttl=get_completion_cache_ttl()))
+        if backend == "sqlite":
+            return cls(TieredCache(
+                "completions",
+                path=get_cache_path(),
+                max_size=get_completion_cache_size(),
+                ttl=get_completion_cache_ttl(),
+                max_disk_entries=get_completion_cache_size() * 10
+            ))
+
+        raise ValueError(f"Unknown completion cache backend: {backend}")
+
+    def key(self, model, messages) -> str:
+        """
+        Hash a completion request into a cache key.
+
+        Args:
+            model (str): Model name
+            messages (list): Chat messages
+
+        Returns:
+            str: Hex SHA-256 digest of the canonical request
+        """
+        return completion_key(model, messages)
+
+    def _count(self, agent, outcome):
+        """
+        Increment a per-agent hit or miss counter.
+
+        Args:
+            agent (str): Name of the calling agent
+            outcome (str): "hits" or "misses"
+        """
+        with self._lock:
+            counters = self.agents.setdefault(agent, {"hits": 0, "misses": 0})
+            counters[outcome] += 1
+
+    def get(self, agent, model, messages):
+        """
+        Look up a cached parsed result.
+
+        Args:
+            agent (str): Name of the calling agent, for statistics
+            model (str): Model name
+            messages (list): Chat messages
+
+        Returns:
+            dict: Parsed result, or None on a miss
+        """
+        value = self.store.get(self.key(model, messages))
+        self._count(agent, "hits" if value is not None else "misses")
+        return value
+
+    def set(self, model, messages, value):
+        """
+        Store a parsed result.
+
+        Args:
+            model (str): Model name
+            messages (list): Chat messages
+            value (dict): Parsed JSON result
+        """
+        self.store.set(self.key(model, messages), value)
+
+    async def aget(self, agent, model, messages):
+        """
+        Async variant of get.
+        """
+        key = self.key(model, messages)
+        value = await self.store.aget(key) if hasattr(self.store, "aget") else self.store.get(key)
+        self._count(agent, "hits" if value is not None else "misses")
+        return value
+
+    async def aset(self, model, messages, value):
+        """
+        Async variant of set.
+        """
+        key = self.key(model, messages)
+        if hasattr(self.store, "aset"):
+            await self.store.aset(key, value)
+        else:
+            self.store.set(key, value)
+
+    def stats(self) -> dict:
+        """
+        Report per-agent hit rates and backing store stats.
+
+        Returns:
+            dict: {"agents": {name: {"hits", "misses", "hit_rate"}}, "store": {...}}
+        """
+        with self._lock:
+            agents = {
+                name: {**counters, "hit_rate": counters["hits"] / max(1, counters["hits"] + counters["misses"])}
+                for name, counters in self.agents.items()
+            }
+
+        return {"agents": agents, "store": self.store.stats()}
+
+def normalize_key(text) -> str:
+    """
+    Normalize free text for use as a cache key.
+
+    Lowercases, trims, and collapses runs of whitespace and commas so that
+    "New York City", " new york  city" and "New York City," share one key.
+
+    Args:
+        text (str): Raw text
+
+    Returns:
+        str: Normalized key
+    """
+    return " ".join(str(text).lower().replace(",", " ").split())
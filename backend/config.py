@@ -6,6 +6,129 @@ def get_hf_key():
 def get_google_maps_key():
     return os.getenv("GOOGLE_MAPS_API_KEY")
 
+def get_pipeline_concurrency():
+    return int(os.getenv("PIPELINE_CONCURRENCY", "4"))
+
+def get_details_workers():
+    return int(os.getenv("MAPS_DETAILS_WORKERS", "8"))
+
+def get_details_timeout():
+    return float(os.getenv("MAPS_DETAILS_TIMEOUT", "10"))
+
+def get_cache_path():
+    return os.getenv("CACHE_DB_PATH", ".cache/planner.sqlite3")
+
+def get_geocode_cache_ttl():
+    return float(os.getenv("GEOCODE_CACHE_TTL", str(30 * 24 * 3600)))
+
+def get_geocode_cache_size():
+    return int(os.getenv("GEOCODE_CACHE_SIZE", "1024"))
+
+def get_place_cache_ttl():
+    return float(os.getenv("PLACE_CACHE_TTL", str(24 * 3600)))
+
+def get_place_cache_max_age():
+    return float(os.getenv("PLACE_CACHE_MAX_AGE", str(7 * 24 * 3600)))
+
+def get_place_cache_size():
+    return int(os.getenv("PLACE_CACHE_SIZE", "4096"))
+
+def get_place_cache_disk_size():
+    return int(os.getenv("PLACE_CACHE_DISK_SIZE", "40960"))
+
+def get_place_refresh_workers():
+    return int(os.getenv("PLACE_REFRESH_WORKERS", "2"))
+
+def get_plan_cache_ttl():
+    return float(os.getenv("PLAN_CACHE_TTL", "3600"))
+
+def get_plan_cache_max_age():
+    return float(os.getenv("PLAN_CACHE_MAX_AGE", str(24 * 3600)))
+
+def get_plan_cache_size():
+    return int(os.getenv("PLAN_CACHE_SIZE", "256"))
+
+def get_place_index_ttl():
+    return float(os.getenv("PLACE_INDEX_TTL", str(24 * 3600)))
+
+def get_place_index_cell():
+    return float(os.getenv("PLACE_INDEX_CELL", "0.1"))
+
+def get_fast_path_threshold():
+    return float(os.getenv("SERIALIZER_FAST_PATH_THRESHOLD", "0.8"))
+
+def get_completion_cache_backend():
+    return os.getenv("COMPLETION_CACHE_BACKEND", "memory")
+
+def get_completion_cache_ttl():
+    return float(os.getenv("COMPLETION_CACHE_TTL", str(24 * 3600)))
+
+def get_completion_cache_size():
+    return int(os.getenv("COMPLETION_CACHE_SIZE", "512"))
+
+def get_catering_batch():
+    return os.getenv("CATERING_BATCH", "true").lower() in ("1", "true", "yes")
+
+def get_prerank_top_k():
+    return int(os.getenv("PRERANK_TOP_K", "8"))
+
+def get_bigagent_token_budget():
+    return int(os.getenv("BIGAGENT_TOKEN_BUDGET", "6000"))
+
+def get_log_level():
+    return os.getenv("LOG_LEVEL", "INFO").upper()
+
+def get_debug_sample_rate():
+    return float(os.getenv("DEBUG_SAMPLE_RATE", "0.01"))
+
+def get_lazy_enrichment():
+    return os.getenv("LAZY_ENRICHMENT", "true").lower() in ("1", "true", "yes")
+
+def get_job_workers():
+    return int(os.getenv("PLAN_JOB_WORKERS", "4"))
+
+def get_job_queue_size():
+    return int(os.getenv("PLAN_JOB_QUEUE_SIZE", "100"))
+
+def get_job_ttl():
+    return float(os.getenv("PLAN_JOB_TTL", "3600"))
+
+def get_maps_rate_limit():
+    return float(os.getenv("MAPS_RATE_LIMIT", "20"))
+
+def get_hf_rate_limit():
+    return float(os.getenv("HF_RATE_LIMIT", "5"))
+
+def get_upstream_max_retries():
+    return int(os.getenv("UPSTREAM_MAX_RETRIES", "3"))
+
+def get_plan_deadline():
+    return float(os.getenv("PLAN_DEADLINE", "60"))
+
+def get_hedge_model():
+    return os.getenv("BIGAGENT_HEDGE_MODEL", "Qwen/Qwen2.5-7B-Instruct")
+
+def get_hedge_window():
+    return float(os.getenv("BIGAGENT_HEDGE_WINDOW", "15"))
+
+def get_upstream_max_connections():
+    return int(os.getenv("UPSTREAM_MAX_CONNECTIONS", "20"))
+
+def get_upstream_keepalive():
+    return float(os.getenv("UPSTREAM_KEEPALIVE", "60"))
+
+def get_upstream_http2():
+    return os.getenv("UPSTREAM_HTTP2", "true").lower() in ("1", "true", "yes")
+
+def get_upstream_warm_connections():
+    return int(os.getenv("UPSTREAM_WARM_CONNECTIONS", "2"))
+
+def get_warm_workers():
+    return int(os.getenv("WARM_WORKERS", "4"))
+
+def get_batch_workers():
+    return int(os.getenv("BATCH_WORKERS", "8"))
+
 def validate_config():
     hf_key = os.getenv("HF_INFERENCE_KEY")
     maps_key = os.getenv("GOOGLE_MAPS_API_KEY")
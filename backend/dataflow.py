@@ -0,0 +1,178 @@
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait
+import asyncio
+import contextvars
+import inspect
+
+class DataflowScheduler:
+    """
+    Minimal dependency-graph executor for pipeline stages.
+
+    Stages are registered with the names of the stages they depend on and
+    are submitted to a bounded thread pool as soon as all of their inputs
+    have finished. Independent branches (e.g. venue search -> venue ranking
+    and cuisine search -> cuisine ranking) therefore overlap, and total
+    latency tracks the slowest branch instead of the sum of all stages.
+
+    Attributes:
+        max_workers (int): Maximum number of stages running at once
+    """
+
+    def __init__(self, max_workers=4):
+        """
+        Initialize an empty graph.
+
+        Args:
+            max_workers (int, optional): Concurrency limit. Defaults to 4.
+        """
+        if max_workers <= 0:
+            raise ValueError("max_workers must be a positive integer")
+
+        self.max_workers = max_workers
+        self._stages = {}
+
+    def add(self, name, func, deps=()):
+        """
+        Register a stage.
+
+        The stage function is called with the results of its dependencies
+        as positional arguments, in the order the dependencies are listed.
+
+        Args:
+            name (str): Unique stage name
+            func (callable): Function computing the stage result
+            deps (iterable, optional): Names of stages this one depends on
+
+        Raises:
+            ValueError: If the name is already registered
+        """
+        if name in self._stages:
+            raise ValueError(f"Duplicate stage: {name}")
+
+        self._stages[name] = (func, tuple(deps))
+
+    def _validate(self):
+        """
+        Check that every dependency refers to a registered stage.
+
+        Raises:
+            ValueError: If a dependency is unknown
+        """
+        for name, (_, deps) in self._stages.items():
+            for dep in deps:
+                if dep not in self._stages:
+                    raise ValueError(f"Stage '{name}' depends on unknown stage '{dep}'")
+
+    def run(self) -> dict:
+        """
+        Execute every registered stage, respecting dependencies.
+
+        Returns:
+            dict: Mapping of stage name to result
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle
+            Exception: The first exception raised by any stage
+        """
+        self._validate()
+
+        results = {}
+        pending = dict(self._stages)
+        running = {}
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            while pending or running:
+                ready = [
+                    name for name, (_, deps) in pending.items()
+                    if all(dep in results for dep in deps)
+                ]
+
+                for name in ready:
+                    func, deps = pending.pop(name)
+                    args = [results[dep] for dep in deps]
+                    # Stages see the caller's context variables (e.g. the request deadline)
+                    running[executor.submit(contextvars.copy_context().run, func, *args)] = name
+
+                if not running:
+                    raise ValueError(f"Dependency cycle between stages: {', '.join(pending)}")
+
+                done, _ = wait(running, return_when=FIRST_COMPLETED)
+
+                for future in done:
+                    name = running.pop(future)
+                    try:
+                        results[name] = future.result()
+                    except Exception:
+                        for other in running:
+                            other.cancel()
+                        raise
+
+        return results
+
+    async def astream(self):
+        """
+        Run a graph of coroutine stages, yielding each result as it completes.
+
+        Stages run as tasks on the current event loop, with at most
+        max_workers of them in flight at once. Stage functions may be
+        coroutine functions or plain functions; plain functions should be
+        cheap, as they run on the event loop. Remaining tasks are
+        cancelled if a stage fails or the consumer stops iterating.
+
+        Yields:
+            tuple: (stage name, result) in completion order
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle
+            Exception: The first exception raised by any stage
+        """
+        self._validate()
+
+        results = {}
+        pending = dict(self._stages)
+        running = {}
+        semaphore = asyncio.Semaphore(self.max_workers)
+
+        async def run_stage(func, args):
+            async with semaphore:
+                result = func(*args)
+                if inspect.isawaitable(result):
+                    result = await result
+                return result
+
+        try:
+            while pending or running:
+                ready = [
+                    name for name, (_, deps) in pending.items()
+                    if all(dep in results for dep in deps)
+                ]
+
+                for name in ready:
+                    func, deps = pending.pop(name)
+                    args = [results[dep] for dep in deps]
+                    running[asyncio.ensure_future(run_stage(func, args))] = name
+
+                if not running:
+                    raise ValueError(f"Dependency cycle between stages: {', '.join(pending)}")
+
+                done, _ = await asyncio.wait(running, return_when=asyncio.FIRST_COMPLETED)
+
+                for task in done:
+                    name = running.pop(task)
+                    results[name] = task.result()
+                    yield name, results[name]
+        finally:
+            for task in running:
+                task.cancel()
+
+    async def arun(self) -> dict:
+        """
+        Async variant of run for graphs of coroutine (or cheap plain) stage functions.
+
+        Returns:
+            dict: Mapping of stage name to result
+
+        Raises:
+            ValueError: If a dependency is unknown or the graph has a cycle
+            Exception: The first exception raised by any stage
+        """
+        return {name: result async for name, result in self.astream()}
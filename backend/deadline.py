@@ -0,0 +1,101 @@
+from contextlib import contextmanager
+import contextvars
+import time
+
+_current = contextvars.ContextVar("deadline", default=None)
+
+class DeadlineExceeded(TimeoutError):
+    """
+    Raised when a request's deadline passes before an upstream call finishes.
+    """
+
+class Deadline:
+    """
+    Point in time by which a request must be answered.
+
+    A deadline is installed for the duration of a plan with scope() and read
+    wherever time is spent waiting on an upstream (Map, the agents, the rate
+    limiter) with current(), so it does not have to be threaded through
+    every call signature.
+
+    Attributes:
+        expires_at (float): time.monotonic() value at which the deadline passes
+    """
+
+    def __init__(self, seconds):
+        """
+        Start a deadline.
+
+        Args:
+            seconds (float): Time budget from now
+        """
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """
+        Seconds left, never negative.
+        """
+        return max(0.0, self.expires_at - time.monotonic())
+
+    def expired(self) -> bool:
+        """
+        Whether the deadline has passed.
+        """
+        return self.remaining() <= 0
+
+def current():
+    """
+    Deadline of the request being served, or None if it has none.
+    """
+    return _current.get()
+
+def timeout(cap=None):
+    """
+    Timeout for a single wait, bounded by the current deadline.
+
+    Args:
+        cap (float, optional): Timeout to use when it is shorter than the
+                               remaining budget. Defaults to None (no cap).
+
+    Returns:
+        float: Seconds to wait, or None to wait without limit
+    """
+    deadline = current()
+    if deadline is None:
+        return cap
+
+    return deadline.remaining() if cap is None else min(cap, deadline.remaining())
+
+@contextmanager
+def scope(deadline):
+    """
+    Install a deadline for the enclosed code, including tasks it starts.
+
+    Args:
+        deadline (Deadline): Deadline to install, or None for no deadline
+    """
+    token = _current.set(deadline)
+    try:
+        yield deadline
+    finally:
+        _current.reset(token)
+
+def propagate(func):
+    """
+    Wrap a function so it runs with the caller's deadline in worker threads.
+
+    Thread pools do not inherit context variables; the wrapper captures the
+    current context and runs each call in its own copy of it.
+
+    Args:
+        func (callable): Function to submit to a thread pool
+
+    Returns:
+        callable: Wrapped function
+    """
+    context = contextvars.copy_context()
+
+    def run(*args, **kwargs):
+        return context.copy().run(func, *args, **kwargs)
+
+    return run
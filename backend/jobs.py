@@ -0,0 +1,252 @@
+from backend.config import get_job_workers, get_job_queue_size, get_job_ttl
+from backend.metrics import registry
+import asyncio
+import itertools
+import logging
+import time
+import uuid
+
+logger = logging.getLogger(__name__)
+
+jobs_total = registry.counter("planner_jobs_total", "Plan jobs by outcome")
+
+class PlanJob:
+    """
+    State of a single queued plan.
+
+    Attributes:
+        id (str): Job ID returned to the client
+        prompt (str): Natural language description of the event
+        result_count (int): Number of results to fetch from Google Maps
+        radius (int): Search radius in meters
+        priority (int): Higher priorities run first
+        deadline (float): Time budget in seconds once the job starts, or None for the default
+        status (str): "queued", "running", "succeeded" or "failed"
+        result (dict): Partial or final {"requirements", "venues", "catering"}
+        error (str): Failure detail, or None
+        created_at (float): Submission time
+        started_at (float): Time a worker picked the job up, or None
+        finished_at (float): Completion time, or None
+    """
+
+    def __init__(self, prompt, result_count, radius, priority, deadline=None):
+        """
+        Initialize a queued job.
+
+        Args:
+            prompt (str): Natural language description of the event
+            result_count (int): Number of results to fetch from Google Maps
+            radius (int): Search radius in meters
+            priority (int): Higher priorities run first
+            deadline (float, optional): Time budget in seconds once the job starts
+        """
+        self.id = uuid.uuid4().hex
+        self.prompt = prompt
+        self.result_count = result_count
+        self.radius = radius
+        self.priority = priority
+        self.deadline = deadline
+        self.status = "queued"
+        self.result = {"requirements": None, "venues": None, "catering": []}
+        self.error = None
+        self.created_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    def to_dict(self) -> dict:
+        """
+        Public view of the job returned by the API.
+
+        Returns:
+            dict: Job ID, status, timestamps, (partial) result and error
+        """
+        return {
+            "job_id": self.id,
+            "status": self.status,
+            "priority": self.priority,
+            "created_at": self.created_at,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "result": self.result,
+            "error": self.error
+        }
+
+class PlanJobQueue:
+    """
+    Bounded priority queue of plans run by a fixed pool of async workers.
+
+    Jobs are submitted without waiting for the plan; workers run them with
+    PlannerPipeline.astream_plan and record each ranking in the job as soon
+    as it completes, so clients polling a job see partial results.
+    Finished jobs are dropped ttl seconds after they complete.
+
+    Attributes:
+        pipeline (PlannerPipeline): Pipeline used to run the plans
+        workers (int): Number of plans run at once
+        max_queue (int): Maximum number of jobs waiting for a worker
+        ttl (float): Seconds a finished job is kept
+    """
+
+    def __init__(self, pipeline, workers=None, max_queue=None, ttl=None):
+        """
+        Initialize an empty queue. Workers start on the first submission.
+
+        Args:
+            pipeline (PlannerPipeline): Pipeline used to run the plans
+            workers (int, optional): Worker count. Defaults to PLAN_JOB_WORKERS.
+            max_queue (int, optional): Queue bound. Defaults to PLAN_JOB_QUEUE_SIZE.
+            ttl (float, optional): Finished job lifetime. Defaults to PLAN_JOB_TTL.
+        """
+        self.pipeline = pipeline
+        self.workers = workers or get_job_workers()
+        self.max_queue = max_queue or get_job_queue_size()
+        self.ttl = ttl or get_job_ttl()
+        self._jobs = {}
+        self._queue = None
+        self._tasks = []
+        self._sequence = itertools.count()
+
+        registry.register_collector("jobs", self._metrics)
+
+    def _metrics(self) -> list:
+        """
+        Export queue depth and job counts on /metrics.
+
+        Returns:
+            list: Prometheus exposition lines
+        """
+        statuses = {"queued": 0, "running": 0, "succeeded": 0, "failed": 0}
+        for job in list(self._jobs.values()):
+            statuses[job.status] += 1
+
+        lines = ["# HELP planner_jobs Plan jobs currently held by status", "# TYPE planner_jobs gauge"]
+        lines.extend(f'planner_jobs{{status="{status}"}} {count}' for status, count in statuses.items())
+        return lines
+
+    def _start(self):
+        """
+        Start the worker tasks on the running event loop if they are not running.
+        """
+        if self._tasks and not all(task.done() for task in self._tasks):
+            return
+
+        self._queue = asyncio.PriorityQueue(maxsize=self.max_queue)
+        self._tasks = [asyncio.ensure_future(self._worker()) for _ in range(self.workers)]
+
+        for job in sorted(self._jobs.values(), key=lambda job: job.created_at):
+            if job.status == "queued":
+                self._queue.put_nowait((-job.priority, next(self._sequence), job.id))
+
+    def _expire(self):
+        """
+        Drop finished jobs older than the TTL.
+        """
+        now = time.time()
+        expired = [
+            job_id for job_id, job in self._jobs.items()
+            if job.finished_at is not None and now - job.finished_at > self.ttl
+        ]
+
+        for job_id in expired:
+            del self._jobs[job_id]
+
+    def submit(self, prompt, result_count=15, radius=20000, priority=0, deadline=None) -> PlanJob:
+        """
+        Queue a plan.
+
+        Must be called from the event loop the workers should run on.
+
+        Args:
+            prompt (str): Natural language description of the event
+            result_count (int, optional): Number of results to fetch from Google Maps.
+                                         Defaults to 15.
+            radius (int, optional): Search radius in meters. Defaults to 20000.
+            priority (int, optional): Higher priorities run first. Defaults to 0.
+            deadline (float, optional): Time budget in seconds once the job starts.
+                                        Defaults to the PLAN_DEADLINE setting.
+
+        Returns:
+            PlanJob: The queued job
+
+        Raises:
+            asyncio.QueueFull: If max_queue jobs are already waiting
+        """
+        self._expire()
+        self._start()
+
+        job = PlanJob(prompt, result_count, radius, priority, deadline)
+        self._queue.put_nowait((-priority, next(self._sequence), job.id))
+        self._jobs[job.id] = job
+        jobs_total.inc(outcome="submitted")
+        return job
+
+    def get(self, job_id) -> PlanJob:
+        """
+        Look up a job.
+
+        Args:
+            job_id (str): Job ID returned by submit
+
+        Returns:
+            PlanJob: The job, or None if unknown or expired
+        """
+        self._expire()
+        return self._jobs.get(job_id)
+
+    async def _run(self, job):
+        """
+        Run a job's plan, recording rankings as they complete.
+
+        Args:
+            job (PlanJob): Job to run
+        """
+        job.status = "running"
+        job.started_at = time.time()
+
+        try:
+            async for event in self.pipeline.astream_plan(job.prompt, job.result_count, job.radius, job.deadline):
+                if event["event"] == "requirements":
+                    job.result["requirements"] = event["data"]
+                    job.result["catering"] = [None] * len(event["data"].get("cuisines", []))
+                elif event["event"] == "venue_ranking":
+                    job.result["venues"] = event["data"]
+                elif event["event"] == "catering_ranking":
+                    job.result["catering"][event["index"]] = event["data"]
+
+            job.status = "succeeded"
+            jobs_total.inc(outcome="success")
+        except asyncio.CancelledError:
+            job.status = "failed"
+            job.error = "Job cancelled"
+            raise
+        except Exception as e:
+            job.status = "failed"
+            job.error = str(e)
+            jobs_total.inc(outcome="error")
+            logger.warning(f"Plan job {job.id} failed: {e}")
+        finally:
+            job.finished_at = time.time()
+
+    async def _worker(self):
+        """
+        Take jobs off the queue, highest priority first, until cancelled.
+        """
+        while True:
+            _, _, job_id = await self._queue.get()
+
+            try:
+                job = self._jobs.get(job_id)
+                if job is not None and job.status == "queued":
+                    await self._run(job)
+            finally:
+                self._queue.task_done()
+
+    async def aclose(self):
+        """
+        Stop the workers. Running jobs are cancelled.
+        """
+        for task in self._tasks:
+            task.cancel()
+
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -1,23 +1,91 @@
-from fastapi import FastAPI, HTTPException
+from fastapi import FastAPI, HTTPException, Header
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse, PlainTextResponse, JSONResponse
 from pydantic import BaseModel
 from dotenv import load_dotenv
+from contextlib import asynccontextmanager
 from typing import Optional
+import asyncio
+import json
+import logging
 
 load_dotenv()
 
-from backend.config import get_hf_key, validate_config
-from backend.pipeline import PlannerPipeline
-from backend.config import *
+from backend.config import get_log_level, validate_config
+from backend.jobs import PlanJobQueue
+from backend.metrics import registry
 
-# Validate config on startup
-validate_config()
+logging.basicConfig(level=get_log_level())
+
+# Components are built at startup, not on import, so importing this module
+# stays fast and needs no credentials. The pipeline (and the Google Maps and
+# HF clients it pulls in) is imported and constructed in the background
+# while the worker already answers liveness checks.
+planner = None
+jobs = None
+startup = None
+
+async def start_components():
+    """
+    Build the pipeline and job queue, then open upstream connections.
+    """
+    global planner, jobs
+
+    from backend.pipeline import PlannerPipeline
+
+    planner = await asyncio.to_thread(PlannerPipeline)
+    jobs = PlanJobQueue(planner)
+    await planner.transport.awarm()
+
+async def components():
+    """
+    Wait for startup to finish and return the pipeline and job queue.
+
+    Requests arriving before the worker is ready wait for it instead of
+    failing. Outside a running lifespan (e.g. in tests) startup begins on
+    the first request.
+
+    Returns:
+        tuple: (PlannerPipeline, PlanJobQueue)
+    """
+    global startup
+
+    if startup is None:
+        startup = asyncio.ensure_future(start_components())
+
+    await asyncio.shield(startup)
+    return planner, jobs
+
+@asynccontextmanager
+async def lifespan(app):
+    """
+    Validate the configuration and start building components; close them on shutdown.
+    """
+    global startup, planner, jobs
+
+    validate_config()
+    startup = asyncio.ensure_future(start_components())
+
+    try:
+        yield
+    finally:
+        if not startup.done():
+            startup.cancel()
+        await asyncio.gather(startup, return_exceptions=True)
+
+        if jobs is not None:
+            await jobs.aclose()
+        if planner is not None:
+            await planner.aclose()
+
+        startup = planner = jobs = None
 
 # Initialize FastAPI app
 app = FastAPI(
     title="Mosque Event Planner API",
     description="API for planning mosque community events with venue and catering recommendations",
-    version="1.0.0"
+    version="1.0.0",
+    lifespan=lifespan
 )
 
 app.add_middleware(
@@ -28,17 +96,12 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
-print(get_hf_key())
-print(get_google_maps_key())
-
-# Initialize pipeline
-planner = PlannerPipeline()
-
 # Request models
 class EventPlanRequest(BaseModel):
     prompt: str
     result_count: Optional[int] = 15
     radius: Optional[int] = 20000
+    deadline: Optional[float] = None
     
     class Config:
         json_schema_extra = {
@@ -49,12 +112,35 @@ class EventPlanRequest(BaseModel):
             }
         }
 
+class PlanJobRequest(EventPlanRequest):
+    priority: Optional[int] = 0
+
+    class Config:
+        json_schema_extra = {
+            "example": {
+                "prompt": "Community iftar in NYC for 100 people on a budget of 10 thousand dollars, indian food preferred",
+                "result_count": 15,
+                "radius": 20000,
+                "priority": 0
+            }
+        }
+
 # Response models
 class EventPlanResponse(BaseModel):
     venues: dict
     catering: list
     status: str = "success"
 
+class PlanJobResponse(BaseModel):
+    job_id: str
+    status: str
+    priority: int
+    created_at: float
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+    result: dict
+    error: Optional[str] = None
+
 @app.get("/")
 def read_root():
     """Health check endpoint"""
@@ -66,31 +152,80 @@ def read_root():
 
 @app.get("/health")
 def health_check():
-    """Detailed health check"""
+    """
+    Detailed health check
+
+    Upstream status comes from the outcomes of recent calls: "online",
+    "degraded" (some failures), "down" (mostly failures), or "unknown"
+    (no calls yet).
+    """
+    services = {
+        "api": "online",
+        "serializer": registry.upstream_status("serializer"),
+        "maps": registry.upstream_status("maps"),
+        "bigagent": registry.upstream_status("bigagent")
+    }
+
     return {
-        "status": "healthy",
-        "services": {
-            "api": "online",
-            "serializer": "online",
-            "maps": "online",
-            "bigagent": "online"
-        }
+        "status": "healthy" if all(status in ("online", "unknown") for status in services.values()) else "degraded",
+        "services": services
     }
 
+@app.get("/ready")
+def readiness_check():
+    """
+    Readiness check
+
+    Returns 200 once the pipeline is built and upstream connections are
+    open, and 503 while the worker is starting or if startup failed. Use
+    `/health` for liveness.
+    """
+    if startup is None or not startup.done():
+        return JSONResponse({"status": "starting"}, status_code=503)
+
+    if startup.cancelled() or startup.exception() is not None:
+        detail = "cancelled" if startup.cancelled() else str(startup.exception())
+        return JSONResponse({"status": "failed", "detail": detail}, status_code=503)
+
+    return {"status": "ready"}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+def metrics():
+    """Prometheus metrics"""
+    return PlainTextResponse(registry.render(), media_type="text/plain; version=0.0.4")
+
+def use_plan_cache(cache_control) -> bool:
+    """
+    Whether a request's Cache-Control header allows the plan cache.
+    """
+    directives = {directive.strip().lower() for directive in (cache_control or "").split(",")}
+    return not directives & {"no-cache", "no-store"}
+
 @app.post("/api/plan-event", response_model=EventPlanResponse)
-def plan_event(request: EventPlanRequest):
+async def plan_event(request: EventPlanRequest, cache_control: Optional[str] = Header(None)):
     """
     Plan an event with venue and catering recommendations
     
     - **prompt**: Natural language description of the event
     - **result_count**: Number of results to fetch from Google Maps (default: 15)
     - **radius**: Search radius in meters (default: 20000)
+    - **deadline**: Time budget in seconds (default: PLAN_DEADLINE). Rankings that
+      cannot finish in time fall back to a deterministic order; each ranking's
+      `ranked_by` field says whether it came from the primary model, the hedge
+      model, or the fallback.
+
+    Plans are cached by their parsed requirements. Send `Cache-Control: no-cache`
+    to plan from scratch without reading or storing the cache.
     """
+    planner, _ = await components()
+
     try:
-        venue_res, catering_res = planner.plan(
+        venue_res, catering_res = await planner.aplan(
             prompt=request.prompt,
             result_count=request.result_count or 15,
-            radius=request.radius or 20000
+            radius=request.radius or 20000,
+            deadline=request.deadline,
+            cache=use_plan_cache(cache_control)
         )
         
         return EventPlanResponse(
@@ -104,6 +239,86 @@ def plan_event(request: EventPlanRequest):
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Internal server error: {str(e)}")
 
+@app.post("/api/plan-event/stream")
+async def plan_event_stream(request: EventPlanRequest, cache_control: Optional[str] = Header(None)):
+    """
+    Plan an event, streaming each stage as newline-delimited JSON
+
+    Emits one JSON object per line as soon as it is available: the serialized
+    requirements, venue candidates, the venue ranking, then each cuisine's
+    catering candidates and ranking. The last line is either
+    `{"event": "done"}` or `{"event": "error", "detail": ...}`. Plans served
+    from the plan cache skip the candidate events; `Cache-Control: no-cache`
+    bypasses the cache.
+
+    - **prompt**: Natural language description of the event
+    - **result_count**: Number of results to fetch from Google Maps (default: 15)
+    - **radius**: Search radius in meters (default: 20000)
+    - **deadline**: Time budget in seconds (default: PLAN_DEADLINE)
+    """
+    planner, _ = await components()
+
+    async def events():
+        try:
+            async for event in planner.astream_plan(
+                prompt=request.prompt,
+                result_count=request.result_count or 15,
+                radius=request.radius or 20000,
+                deadline=request.deadline,
+                cache=use_plan_cache(cache_control)
+            ):
+                yield json.dumps(event) + "\n"
+        except Exception as e:
+            yield json.dumps({"event": "error", "detail": str(e)}) + "\n"
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
+
+@app.post("/api/plan-jobs", response_model=PlanJobResponse, status_code=202)
+async def create_plan_job(request: PlanJobRequest):
+    """
+    Queue an event plan and return its job ID immediately
+
+    Poll `GET /api/plan-jobs/{job_id}` for status and partial results.
+    Jobs with a higher priority run first. Finished jobs are kept for
+    PLAN_JOB_TTL seconds.
+
+    - **prompt**: Natural language description of the event
+    - **result_count**: Number of results to fetch from Google Maps (default: 15)
+    - **radius**: Search radius in meters (default: 20000)
+    - **priority**: Higher runs first (default: 0)
+    """
+    _, jobs = await components()
+
+    try:
+        job = jobs.submit(
+            prompt=request.prompt,
+            result_count=request.result_count or 15,
+            radius=request.radius or 20000,
+            priority=request.priority or 0,
+            deadline=request.deadline
+        )
+    except asyncio.QueueFull:
+        raise HTTPException(status_code=429, detail="Plan job queue is full, retry later")
+
+    return PlanJobResponse(**job.to_dict())
+
+@app.get("/api/plan-jobs/{job_id}", response_model=PlanJobResponse)
+async def get_plan_job(job_id: str):
+    """
+    Status and (partial) result of a queued plan
+
+    `status` is "queued", "running", "succeeded" or "failed". While the job
+    runs, `result.venues` and each entry of `result.catering` are filled in
+    as their rankings complete.
+    """
+    _, jobs = await components()
+
+    job = jobs.get(job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail="Unknown or expired job")
+
+    return PlanJobResponse(**job.to_dict())
+
 # For testing locally
 if __name__ == "__main__":
     import uvicorn
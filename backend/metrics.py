@@ -0,0 +1,338 @@
+from collections import deque
+from contextlib import contextmanager
+import threading
+import time
+
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60)
+
+def _label_key(labels) -> tuple:
+    """
+    Canonical, hashable form of a label set.
+    """
+    return tuple(sorted(labels.items()))
+
+def _format_labels(key, extra=()) -> str:
+    """
+    Render a label set as {name="value",...}, or "" if empty.
+    """
+    pairs = list(key) + list(extra)
+    if not pairs:
+        return ""
+
+    escaped = [
+        '{}="{}"'.format(name, str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n"))
+        for name, value in pairs
+    ]
+    return "{" + ",".join(escaped) + "}"
+
+class Counter:
+    """
+    Monotonic counter with labels.
+
+    Attributes:
+        name (str): Metric name
+        description (str): Help text
+    """
+
+    def __init__(self, name, description):
+        """
+        Initialize the counter.
+
+        Args:
+            name (str): Metric name
+            description (str): Help text
+        """
+        self.name = name
+        self.description = description
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount=1, **labels):
+        """
+        Increment the counter.
+
+        Args:
+            amount (float, optional): Increment. Defaults to 1.
+            **labels: Label values
+        """
+        key = _label_key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """
+        Current value for a label set.
+
+        Returns:
+            float: Counter value, 0 if never incremented
+        """
+        with self._lock:
+            return self._values.get(_label_key(labels), 0)
+
+    def render(self) -> list:
+        """
+        Render in Prometheus text exposition format.
+
+        Returns:
+            list: Lines of output
+        """
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(key)} {value}")
+        return lines
+
+class Histogram:
+    """
+    Cumulative histogram with labels.
+
+    Attributes:
+        name (str): Metric name
+        description (str): Help text
+        buckets (tuple): Upper bounds of the buckets
+    """
+
+    def __init__(self, name, description, buckets=DEFAULT_BUCKETS):
+        """
+        Initialize the histogram.
+
+        Args:
+            name (str): Metric name
+            description (str): Help text
+            buckets (tuple, optional): Upper bounds. Defaults to DEFAULT_BUCKETS.
+        """
+        self.name = name
+        self.description = description
+        self.buckets = tuple(buckets)
+        self._values = {}
+        self._lock = threading.Lock()
+
+    def observe(self, value, **labels):
+        """
+        Record an observation.
+
+        Args:
+            value (float): Observed value
+            **labels: Label values
+        """
+        key = _label_key(labels)
+        with self._lock:
+            counts, total, count = self._values.get(key, ([0] * len(self.buckets), 0.0, 0))
+            counts = [c + (1 if value <= bound else 0) for c, bound in zip(counts, self.buckets)]
+            self._values[key] = (counts, total + value, count + 1)
+
+    def render(self) -> list:
+        """
+        Render in Prometheus text exposition format.
+
+        Returns:
+            list: Lines of output
+        """
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._values.items()):
+                for bound, bucket_count in zip(self.buckets, counts):
+                    lines.append(f"{self.name}_bucket{_format_labels(key, [('le', bound)])} {bucket_count}")
+                lines.append(f"{self.name}_bucket{_format_labels(key, [('le', '+Inf')])} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(key)} {total}")
+                lines.append(f"{self.name}_count{_format_labels(key)} {count}")
+        return lines
+
+class MetricsRegistry:
+    """
+    Process-wide collection of metrics exported on /metrics.
+
+    Besides counters and histograms, collectors can be registered to
+    export values computed at scrape time (e.g. cache statistics). The
+    registry also keeps a short window of recent outcomes per upstream,
+    which /health uses to report real service status.
+
+    Attributes:
+        window (int): Number of recent calls kept per upstream
+    """
+
+    window = 50
+
+    def __init__(self):
+        """
+        Initialize an empty registry.
+        """
+        self._metrics = []
+        self._collectors = {}
+        self._recent = {}
+        self._lock = threading.Lock()
+
+    def counter(self, name, description) -> Counter:
+        """
+        Create and register a counter.
+        """
+        metric = Counter(name, description)
+        self._metrics.append(metric)
+        return metric
+
+    def histogram(self, name, description, buckets=DEFAULT_BUCKETS) -> Histogram:
+        """
+        Create and register a histogram.
+        """
+        metric = Histogram(name, description, buckets)
+        self._metrics.append(metric)
+        return metric
+
+    def register_collector(self, name, collect):
+        """
+        Register (or replace) a scrape-time collector.
+
+        Args:
+            name (str): Collector name
+            collect (callable): Returns a list of output lines
+        """
+        with self._lock:
+            self._collectors[name] = collect
+
+    def record_outcome(self, upstream, ok):
+        """
+        Record the outcome of an upstream call for health reporting.
+
+        Args:
+            upstream (str): Upstream name
+            ok (bool): Whether the call succeeded
+        """
+        with self._lock:
+            recent = self._recent.setdefault(upstream, deque(maxlen=self.window))
+            recent.append(ok)
+
+    def upstream_status(self, upstream) -> str:
+        """
+        Status of an upstream from its recent outcomes.
+
+        Returns:
+            str: "unknown" before any call, "online" when recent calls succeed,
+                 "degraded" with some failures, "down" when most calls fail
+        """
+        with self._lock:
+            recent = list(self._recent.get(upstream, ()))
+
+        if not recent:
+            return "unknown"
+
+        error_rate = recent.count(False) / len(recent)
+        if error_rate == 0:
+            return "online"
+        if error_rate < 0.5:
+            return "degraded"
+        return "down"
+
+    def render(self) -> str:
+        """
+        Render every metric and collector in Prometheus text exposition format.
+
+        Returns:
+            str: Exposition text
+        """
+        lines = []
+        for metric in self._metrics:
+            lines.extend(metric.render())
+
+        with self._lock:
+            collectors = list(self._collectors.values())
+
+        for collect in collectors:
+            try:
+                lines.extend(collect())
+            except Exception:
+                pass
+
+        return "\n".join(lines) + "\n"
+
+registry = MetricsRegistry()
+
+stage_latency = registry.histogram("planner_stage_latency_seconds", "Latency of pipeline stages and upstream calls")
+upstream_errors = registry.counter("planner_upstream_errors_total", "Failed upstream calls by stage")
+llm_tokens = registry.counter("planner_llm_tokens_total", "LLM tokens by agent, direction and source (reported usage or estimate)")
+plans = registry.counter("planner_plans_total", "Plans by outcome")
+fast_path = registry.counter("planner_serializer_fast_path_total", "Serializer requests answered by the rule-based fast path")
+rate_limit_wait = registry.histogram(
+    "planner_rate_limit_wait_seconds",
+    "Time calls waited for a rate limiter token, by upstream",
+    buckets=(0, 0.01, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30)
+)
+upstream_retries = registry.counter("planner_upstream_retries_total", "Upstream calls retried after a 429 or 5xx, by upstream and status")
+deadline_fallbacks = registry.counter("planner_deadline_fallbacks_total", "Rankings answered by the deterministic ranker because the request deadline passed")
+coalesced = registry.counter("planner_coalesced_calls_total", "Calls that joined an identical in-flight call instead of running their own")
+llm_first_item = registry.histogram("planner_llm_first_item_seconds", "Time from sending an LLM request to its first complete recommendation")
+
+# Stage -> upstream service reported by /health
+UPSTREAMS = {
+    "serializer": "serializer",
+    "geocode": "maps",
+    "places_search": "maps",
+    "details": "maps",
+    "bigagent": "bigagent",
+}
+
+@contextmanager
+def span(stage):
+    """
+    Time a block as a pipeline stage, counting failures as upstream errors.
+
+    Works around synchronous code and around awaits inside coroutines.
+
+    Args:
+        stage (str): Stage name (serializer, geocode, places_search, details, bigagent, ...)
+    """
+    start = time.perf_counter()
+    ok = False
+    try:
+        yield
+        ok = True
+    finally:
+        stage_latency.observe(time.perf_counter() - start, stage=stage)
+
+        if not ok:
+            upstream_errors.inc(stage=stage)
+
+        if stage in UPSTREAMS:
+            registry.record_outcome(UPSTREAMS[stage], ok)
+
+def record_usage(agent, completion, estimated=False):
+    """
+    Count prompt and completion tokens reported by an inference response.
+
+    Args:
+        agent (str): Agent name
+        completion: Chat completion output, possibly carrying a usage field
+        estimated (bool, optional): Whether the usage is an estimate rather than
+                                    reported by the upstream. Defaults to False.
+    """
+    usage = getattr(completion, "usage", None)
+    if usage is None:
+        return
+
+    source = "estimate" if estimated else "usage"
+    llm_tokens.inc(getattr(usage, "prompt_tokens", 0) or 0, agent=agent, direction="input", source=source)
+    llm_tokens.inc(getattr(usage, "completion_tokens", 0) or 0, agent=agent, direction="output", source=source)
+
+def cache_lines(caches) -> list:
+    """
+    Render cache statistics as Prometheus gauge lines.
+
+    Args:
+        caches (dict): Cache name -> output of its stats() method (possibly nested per tier)
+
+    Returns:
+        list: Lines of output
+    """
+    lines = ["# HELP planner_cache Cache sizes and hit/miss counters", "# TYPE planner_cache gauge"]
+
+    def walk(name, prefix, value):
+        if isinstance(value, dict):
+            for key, child in value.items():
+                walk(name, prefix + [key], child)
+        elif isinstance(value, (int, float)):
+            labels = _format_labels([("cache", name), ("field", ".".join(prefix))])
+            lines.append(f"planner_cache{labels} {value}")
+
+    for name, stats in caches.items():
+        walk(name, [], stats)
+
+    return lines
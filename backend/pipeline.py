@@ -1,7 +1,46 @@
 from backend.agents import SerializerAgent, BigAgent
-from backend.scraper import Map
+from backend.scraper import Map, CandidateRanker, Place
+from backend.dataflow import DataflowScheduler
+from backend.transport import UpstreamTransport
+from backend.cache import CompletionCache, SingleFlight, StaleWhileRevalidateCache, TieredCache, normalize_key
+from backend.config import (
+    get_pipeline_concurrency, get_catering_batch, get_prerank_top_k, get_debug_sample_rate,
+    get_lazy_enrichment, get_plan_deadline, get_cache_path, get_plan_cache_ttl,
+    get_plan_cache_max_age, get_plan_cache_size
+)
+from backend.metrics import registry, span, plans, deadline_fallbacks, cache_lines
+from backend.deadline import Deadline, current as current_deadline, scope as deadline_scope
 
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import replace
+
+import asyncio
+import hashlib
 import json
+import logging
+import math
+import random
+
+logger = logging.getLogger(__name__)
+
+# Headcounts and budgets in the plan cache key are bucketed geometrically with
+# this ratio, so "90 people, $10,000" and "105 people, $11,000" share a plan.
+# Values either side of a bucket boundary (108 and 110 people) do not.
+BUCKET_RATIO = 1.25
+
+def _bucket(value):
+    """
+    Geometric bucket of a numeric requirement, or its normalized text if it is not a number.
+    """
+    try:
+        number = float(str(value).replace("$", "").replace(",", "").strip())
+    except ValueError:
+        return normalize_key(value)
+
+    if number <= 1:
+        return 0
+
+    return math.floor(math.log(number, BUCKET_RATIO))
 
 class PlannerPipeline:
     """
@@ -13,22 +52,148 @@ class PlannerPipeline:
     3. Using AI agents to analyze and recommend the best options
     
     Attributes:
+        transport (UpstreamTransport): Connection pools shared by every upstream client
         map (Map): Google Maps API client for location queries
         serializer (SerializerAgent): LLM agent for parsing natural language
         bigagent (BigAgent): LLM agent for evaluating and ranking options
+        completion_cache (CompletionCache): LLM completion cache shared by both agents
+        ranker (CandidateRanker): Deterministic pre-ranking applied before BigAgent
+        max_concurrency (int): Maximum number of pipeline stages run at once
+        catering_batch (bool): Rank all cuisines' caterers in a single BigAgent call
+        lazy_enrichment (bool): Fetch place details only for recommended places
+        debug_sample_rate (float): Fraction of plans whose intermediate data is logged at DEBUG
+        flight (SingleFlight): Coalesces concurrent identical plan requests
+        plan_cache (StaleWhileRevalidateCache): Canonical requirements -> full plan
+                                                cache, or None if PLAN_CACHE_TTL is 0
     """
     
-    def __init__(self):
+    def __init__(self, max_concurrency=None, catering_batch=None, lazy_enrichment=None):
         """
         Initialize the pipeline with all required components.
+
+        Args:
+            max_concurrency (int, optional): Maximum number of search/ranking
+                                             stages run concurrently. Defaults to
+                                             the PIPELINE_CONCURRENCY setting.
+            catering_batch (bool, optional): Whether to merge catering candidates
+                                             across cuisines and rank them in one
+                                             call. Defaults to the CATERING_BATCH setting.
+            lazy_enrichment (bool, optional): Whether to search without place details
+                                              and fetch them only for the places BigAgent
+                                              recommends. Defaults to the LAZY_ENRICHMENT setting.
+        """
+        self.transport = UpstreamTransport()
+        self.transport.install_hf()
+        self.map = Map(transport=self.transport)
+        self.completion_cache = CompletionCache.from_config()
+        self.serializer = SerializerAgent(completion_cache=self.completion_cache)
+        self.bigagent = BigAgent(completion_cache=self.completion_cache)
+        self.ranker = CandidateRanker(top_k=get_prerank_top_k())
+        self.max_concurrency = max_concurrency or get_pipeline_concurrency()
+        self.catering_batch = get_catering_batch() if catering_batch is None else catering_batch
+        self.lazy_enrichment = get_lazy_enrichment() if lazy_enrichment is None else lazy_enrichment
+        self.debug_sample_rate = get_debug_sample_rate()
+        self.flight = SingleFlight("plan")
+        self._refresh_pool = ThreadPoolExecutor(max_workers=2, thread_name_prefix="plan-refresh")
+        self.plan_cache = None
+
+        if get_plan_cache_ttl():
+            self.plan_cache = StaleWhileRevalidateCache(
+                TieredCache(
+                    "plans",
+                    path=get_cache_path(),
+                    max_size=get_plan_cache_size(),
+                    ttl=get_plan_cache_max_age(),
+                    max_disk_entries=get_plan_cache_size() * 10
+                ),
+                fresh_ttl=get_plan_cache_ttl(),
+                executor=self._refresh_pool,
+                name="plans",
+                cacheable=self._complete
+            )
+
+        registry.register_collector("caches", self._cache_metrics)
+
+    def _cache_metrics(self) -> list:
+        """
+        Export cache statistics on /metrics.
+
+        Returns:
+            list: Prometheus exposition lines
+        """
+        caches = {
+            "geocode": self.map.geocode_cache.stats(),
+            "place_details": self.map.details_cache.stats(),
+            "place_index": self.map.place_index.stats()
+        }
+
+        if self.completion_cache is not None:
+            caches["completions"] = self.completion_cache.stats()
+
+        if self.plan_cache is not None:
+            caches["plans"] = self.plan_cache.stats()
+
+        caches["inflight_plans"] = self.flight.stats()
+
+        return cache_lines(caches)
+
+    def _ranking_data(self, json_data) -> dict:
+        """
+        Select the event requirements passed to BigAgent alongside candidates.
+
+        Args:
+            json_data (dict): Serialized prompt data
+
+        Returns:
+            dict: Event requirements for ranking
+        """
+        return {
+            "event_type": json_data["event_type"],
+            "budget": json_data["budget"],
+            "min_head_count": json_data["min_head_count"],
+            "max_head_count": json_data["max_head_count"],
+            "other_requirements": json_data["other_requirements"],
+            "dietary_preferences": json_data["dietary_preferences"]
+        }
+
+    def _sampled(self) -> bool:
+        """
+        Decide whether this plan's intermediate data is logged.
+
+        Returns:
+            bool: True if DEBUG logging is enabled and the plan is sampled
         """
-        self.map = Map()
-        self.serializer = SerializerAgent()
-        self.bigagent = BigAgent()
+        return logger.isEnabledFor(logging.DEBUG) and random.random() < self.debug_sample_rate
 
-    def plan(self, prompt, result_count=15, radius=20000):
+    def _dump(self, sampled, event, data):
+        """
+        Log intermediate pipeline data as a structured DEBUG record.
+
+        Args:
+            sampled (bool): Result of _sampled() for the current plan
+            event (str): Name of the data being logged
+            data: JSON-serializable data, possibly holding places
+        """
+        if sampled:
+            logger.debug(json.dumps({"event": event, "data": data}, default=Place.to_dict))
+
+    def plan(self, prompt, result_count=15, radius=20000, deadline=None, cache=True):
         """
         Execute the complete event planning pipeline.
+
+        Concurrent calls with the same prompt (ignoring case, commas and
+        extra whitespace), result_count and radius share one computation
+        and receive the same result objects.
+
+        Once the prompt is serialized, finished plans are looked up in the
+        plan cache by their canonical requirements (see _requirements_key),
+        so a hit skips every search and ranking stage. Plans older than
+        PLAN_CACHE_TTL are served while they are recomputed in the background.
+
+        The deadline bounds upstream waits throughout the pipeline. BigAgent
+        calls are hedged to a smaller model as it nears, and rankings that
+        cannot finish in time fall back to the deterministic CandidateRanker
+        order. Each ranking's "ranked_by" field says which path produced it.
         
         Args:
             prompt (str): Natural language description of the event requirements.
@@ -37,6 +202,10 @@ class PlannerPipeline:
                                          Defaults to 15.
             radius (int, optional): Search radius in meters from the location.
                                    Defaults to 20000 (20km).
+            deadline (float, optional): Time budget in seconds. Defaults to the
+                                        PLAN_DEADLINE setting.
+            cache (bool, optional): Whether to read and store the plan cache.
+                                    Defaults to True.
         
         Returns:
             tuple: A tuple containing:
@@ -54,45 +223,643 @@ class PlannerPipeline:
             ...     radius=15000
             ... )
         """
+        return self.flight.do(self._plan_key(prompt, result_count, radius, cache), lambda: self._plan(prompt, result_count, radius, deadline, cache))
+
+    def _plan_key(self, prompt, result_count, radius, cache=True) -> tuple:
+        """
+        Identity of a plan request for coalescing.
+
+        Returns:
+            tuple: (normalized prompt, result_count, radius, cache)
+        """
+        return normalize_key(prompt), result_count, radius, cache
+
+    def _requirements_key(self, json_data, result_count, radius) -> str:
+        """
+        Plan cache key of serialized requirements.
+
+        Requests that differ only in wording share a key: location and
+        event type are normalized, cuisine, dietary and other requirement
+        lists are normalized and sorted, and headcounts and budget are
+        bucketed by BUCKET_RATIO.
+
+        Args:
+            json_data (dict): Serialized prompt data
+            result_count (int): Number of results fetched from Google Maps
+            radius (int): Search radius in meters
+
+        Returns:
+            str: Hex SHA-256 digest of the canonical requirements
+        """
+        def terms(field):
+            items = json_data.get(field) or []
+            if isinstance(items, str):
+                items = [items]
+            return sorted({normalize_key(item) for item in items})
+
+        requirements = {
+            "location": normalize_key(json_data.get("location", "")),
+            "event_type": normalize_key(json_data.get("event_type", "")),
+            "cuisines": terms("cuisines"),
+            "dietary_preferences": terms("dietary_preferences"),
+            "other_requirements": terms("other_requirements"),
+            "budget": _bucket(json_data.get("budget")),
+            "min_head_count": _bucket(json_data.get("min_head_count")),
+            "max_head_count": _bucket(json_data.get("max_head_count")),
+            "result_count": result_count,
+            "radius": radius
+        }
+
+        payload = json.dumps(requirements, sort_keys=True, separators=(",", ":"))
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _entry(self, results, cuisines) -> dict:
+        """
+        Plan cache entry of finished stage results.
+
+        Returns:
+            dict: {"cuisines": normalized cuisines, "venues": dict, "catering": list}
+        """
+        venues, catering = self._collect(results, cuisines)
+        return {"cuisines": [normalize_key(cuisine) for cuisine in cuisines], "venues": venues, "catering": catering}
+
+    def _from_entry(self, entry, cuisines) -> tuple:
+        """
+        (venues, catering) of a plan cache entry, with catering in the requested cuisine order.
+
+        Entries are shared by requests listing the same cuisines in any
+        order, so catering rankings are matched back to cuisines by name.
+        """
+        catering = dict(zip(entry["cuisines"], entry["catering"]))
+        return entry["venues"], [catering[normalize_key(cuisine)] for cuisine in cuisines]
+
+    def _complete(self, entry) -> bool:
+        """
+        Whether a plan may be cached: every ranking came from the primary model.
+
+        Hedge and fallback rankings are answers to a deadline, not the best
+        plan, so they are returned but never served to later requests.
+        """
+        return all(
+            ((ranking or {}).get("ranked_by") or {}).get("path") == "primary"
+            for ranking in [entry["venues"], *entry["catering"]]
+        )
+
+    def _refreshable(self, fetch):
+        """
+        Give a plan cache fetch a fresh deadline when it runs as a background refresh.
+        """
+        def run():
+            if current_deadline() is not None:
+                return fetch()
+
+            with deadline_scope(Deadline(get_plan_deadline())):
+                return fetch()
+
+        return run
+
+    def _plan(self, prompt, result_count, radius, deadline, cache):
+        """
+        Run the pipeline for plan without coalescing.
+        """
+        sampled = self._sampled()
+
         try:
-            json_data = self.serializer.serialize_prompt(prompt)
+            with span("plan"), deadline_scope(Deadline(deadline or get_plan_deadline())):
+                json_data = self.serializer.serialize_prompt(prompt)
 
-            if not json_data:
-                raise ValueError("Failed to serialize prompt")
+                if not json_data:
+                    raise ValueError("Failed to serialize prompt")
             
-            print("\n================== Serialized Prompt Data ==================")
-            print(json.dumps(json_data, indent=2))
-            print("============================================================\n")
+                self._dump(sampled, "serialized_prompt", json_data)
             
-            cuisines = json_data.get("cuisines", [])
-            catering = [self.map.query_catering(location=json_data["location"], cuisine=cuisine, result_count=result_count, radius=radius) for cuisine in cuisines]
-
-            venues = self.map.query_venue(location=json_data["location"], venue_type=json_data["event_type"], result_count=result_count, radius=radius)
-
-            print("================== Queried Venue Data ==================")
-            print(json.dumps(venues, indent=2))
-            print("============================================================\n")
-
-            print("================== Queried Catering Data ==================")
-            print(json.dumps(catering, indent=2))
-            print("============================================================\n")
-            big_agent_data = {
-                "event_type": json_data["event_type"],
-                "budget": json_data["budget"],
-                "min_head_count": json_data["min_head_count"],
-                "max_head_count": json_data["max_head_count"],
-                "other_requirements": json_data["other_requirements"],
-                "dietary_preferences": json_data["dietary_preferences"]
-            }
-
-            big_agent_venue_data = {
-                "venues": venues,
-                "data": big_agent_data
-            }
-
-            big_agent_venues_response = self.bigagent.process_venue(json.dumps(big_agent_venue_data))
-            big_agent_catering_response = [self.bigagent.process_catering(json.dumps({"catering": catering_option, "data": big_agent_data})) for catering_option in catering]
-
-            return big_agent_venues_response, big_agent_catering_response
+                cuisines = json_data.get("cuisines", [])
+
+                def run():
+                    results = self._graph(json_data, result_count, radius).run()
+
+                    self._dump(sampled, "venue_candidates", results["venues"])
+                    self._dump(sampled, "catering_candidates", [results[f"catering:{i}"] for i in range(len(cuisines))])
+
+                    return self._entry(results, cuisines)
+
+                if self.plan_cache is None or not cache:
+                    entry = run()
+                else:
+                    key = self._requirements_key(json_data, result_count, radius)
+                    entry = self.plan_cache.get_or_fetch(key, self._refreshable(run))
+
+                plans.inc(outcome="success")
+                return self._from_entry(entry, cuisines)
+        except Exception as e:
+            plans.inc(outcome="error")
+            raise ValueError(f"Pipeline planning failed: {e}")
+
+    def _merge_catering(self, catering, cuisines) -> list:
+        """
+        Merge per-cuisine catering results, deduplicating by place_id.
+
+        Each merged candidate is a copy with cuisines set to every cuisine
+        whose search returned it, in the order the cuisines were requested.
+
+        Args:
+            catering (list): One list of places per cuisine
+            cuisines (list): Cuisine searched for each list
+
+        Returns:
+            list: Unique candidates in first-seen order
+        """
+        merged = {}
+
+        for cuisine, places in zip(cuisines, catering):
+            for place in places:
+                key = place.place_id or (place.name, place.address)
+
+                if key not in merged:
+                    merged[key] = replace(place, cuisines=[])
+
+                if cuisine not in merged[key].cuisines:
+                    merged[key].cuisines.append(cuisine)
+
+        return list(merged.values())
+
+    def _shortlisted(self, response, candidates) -> list:
+        """
+        Match BigAgent recommendations back to the candidates they came from.
+
+        Recommendations are matched by name and address, falling back to
+        name alone when BigAgent rewrote the address.
+
+        Args:
+            response: Ranking dict, or list of ranking dicts in catering batch mode
+            candidates (list): Candidates the ranking was built from
+
+        Returns:
+            list: (recommendation entry, candidate) pairs for every match
+        """
+        by_name_address = {}
+        by_name = {}
+        for candidate in candidates:
+            by_name_address.setdefault((candidate.name, candidate.address), candidate)
+            by_name.setdefault(candidate.name, candidate)
+
+        groups = response if isinstance(response, list) else [response]
+        matches = []
+
+        for group in groups:
+            if not isinstance(group, dict):
+                continue
+
+            for entry in group.get("recommended_venues", []) + group.get("recommended_catering", []):
+                if not isinstance(entry, dict):
+                    continue
+
+                candidate = by_name_address.get((entry.get("name"), entry.get("address"))) or by_name.get(entry.get("name"))
+                if candidate is not None:
+                    matches.append((entry, candidate))
+
+        return matches
+
+    def _attach_details(self, matches, enriched):
+        """
+        Copy contact fields from enriched candidates onto recommendation entries.
+
+        Args:
+            matches (list): (entry, candidate) pairs from _shortlisted
+            enriched (list): Enriched candidates, aligned with matches
+        """
+        for (entry, _), place in zip(matches, enriched):
+            entry["place_id"] = place.place_id
+            entry["phone_number"] = place.phone_number
+            entry["website"] = place.website
+            entry["opening_hours"] = place.opening_hours
+
+    def _enrich(self, response, candidates):
+        """
+        Fetch place details for the recommended places only.
+
+        Args:
+            response: Ranking dict, or list of ranking dicts in catering batch mode
+            candidates (list): Candidates the ranking was built from
+
+        Returns:
+            The response, with contact fields set on every matched recommendation
+        """
+        matches = self._shortlisted(response, candidates)
+        self._attach_details(matches, self.map.enrich([candidate for _, candidate in matches]))
+        return response
+
+    async def _aenrich(self, response, candidates):
+        """
+        Async variant of _enrich.
+        """
+        matches = self._shortlisted(response, candidates)
+        self._attach_details(matches, await self.map.aenrich([candidate for _, candidate in matches]))
+        return response
+
+    def _guarded(self, kind, rank, fallback):
+        """
+        Run a BigAgent ranking, falling back to the deterministic order at the deadline.
+
+        Args:
+            kind (str): "venue" or "catering", for metrics
+            rank (callable): Zero-argument function calling BigAgent
+            fallback (callable): Zero-argument function building the deterministic ranking
+
+        Returns:
+            The BigAgent ranking, or the fallback ranking if the request
+            deadline passed before or while BigAgent was ranking
+        """
+        request_deadline = current_deadline()
+
+        if request_deadline is None or not request_deadline.expired():
+            try:
+                return rank()
+            except Exception:
+                if request_deadline is None or not request_deadline.expired():
+                    raise
+
+        deadline_fallbacks.inc(kind=kind)
+        return fallback()
+
+    async def _aguarded(self, kind, rank, fallback):
+        """
+        Async variant of _guarded, for coroutine rankings.
+        """
+        request_deadline = current_deadline()
+
+        if request_deadline is None or not request_deadline.expired():
+            try:
+                return await rank()
+            except Exception:
+                if request_deadline is None or not request_deadline.expired():
+                    raise
+
+        deadline_fallbacks.inc(kind=kind)
+        return fallback()
+
+    def _center(self, location):
+        """
+        Geocode the event location for pre-ranking.
+
+        Args:
+            location (str): Event location
+
+        Returns:
+            dict: {"lat", "lng"}, or None if the location cannot be geocoded
+        """
+        try:
+            return self.map.geocode(location)
+        except Exception:
+            return None
+
+    async def _acenter(self, location):
+        """
+        Async variant of _center.
+        """
+        try:
+            return await self.map.ageocode(location)
+        except Exception:
+            return None
+
+    def _graph(self, json_data, result_count, radius, is_async=False):
+        """
+        Build the stage graph for a serialized prompt.
+
+        Stages are "venues" -> "venue_ranking" and, for the i-th cuisine,
+        "catering:i" -> "catering_ranking:i". In catering batch mode every
+        "catering:i" feeds a single "catering_ranking" stage instead. Every
+        ranking stage also depends on "center" and pre-ranks its candidates
+        with the CandidateRanker before calling BigAgent; once the request
+        deadline passes, that pre-ranking is returned instead.
+
+        With lazy enrichment, searches skip place details and each ranking
+        is split in two: a "*_picks" stage calls BigAgent on the cheap
+        fields, and the "*_ranking" stage fetches details for the picked
+        places only.
+
+        Args:
+            json_data (dict): Serialized prompt data
+            result_count (int): Number of results to fetch from Google Maps
+            radius (int): Search radius in meters
+            is_async (bool, optional): Use the async clients, for arun/astream.
+                                       Defaults to False.
+
+        Returns:
+            DataflowScheduler: Graph ready to run
+        """
+        big_agent_data = self._ranking_data(json_data)
+        cuisines = json_data.get("cuisines", [])
+        graph = DataflowScheduler(max_workers=self.max_concurrency)
+        enrich = not self.lazy_enrichment
+
+        query_venue = self.map.aquery_venue if is_async else self.map.query_venue
+        query_catering = self.map.aquery_catering if is_async else self.map.query_catering
+        process_venue = self.bigagent.aprocess_venue if is_async else self.bigagent.process_venue
+        process_catering = self.bigagent.aprocess_catering if is_async else self.bigagent.process_catering
+        process_catering_batch = self.bigagent.aprocess_catering_batch if is_async else self.bigagent.process_catering_batch
+        locate = self._acenter if is_async else self._center
+        enrich_ranking = self._aenrich if is_async else self._enrich
+        guarded = self._aguarded if is_async else self._guarded
+
+        def shortlist(candidates, center, kind):
+            return self.ranker.rank(candidates, center, radius, kind)
+
+        def rank_venues(center, venues):
+            shortlisted = shortlist(venues, center, "venue")
+            return guarded(
+                "venue",
+                lambda: process_venue(json.dumps({"venues": shortlisted, "data": big_agent_data}, default=Place.to_dict)),
+                lambda: self.ranker.recommend(shortlisted, "venue")
+            )
+
+        def rank_catering(center, catering_option):
+            shortlisted = shortlist(catering_option, center, "catering")
+            return guarded(
+                "catering",
+                lambda: process_catering(json.dumps({"catering": shortlisted, "data": big_agent_data}, default=Place.to_dict)),
+                lambda: self.ranker.recommend(shortlisted, "catering")
+            )
+
+        def rank_catering_batch(center, *catering):
+            merged = self._merge_catering([shortlist(option, center, "catering") for option in catering], cuisines)
+            return guarded(
+                "catering",
+                lambda: process_catering_batch(json.dumps({"catering": merged, "cuisines": cuisines, "data": big_agent_data}, default=Place.to_dict), cuisines),
+                lambda: [self.ranker.recommend([place for place in merged if cuisine in place.cuisines], "catering") for cuisine in cuisines]
+            )
+
+        def add_ranking(name, func, deps):
+            if not self.lazy_enrichment:
+                graph.add(name, func, deps=deps)
+                return
+
+            stage, _, index = name.partition(":")
+            picks = stage.replace("_ranking", "_picks") + (f":{index}" if index else "")
+            graph.add(picks, func, deps=deps)
+            graph.add(name, lambda response, *candidates: enrich_ranking(response, [place for places in candidates for place in places]), deps=[picks] + deps[1:])
+
+        graph.add("center", lambda: locate(json_data["location"]))
+        graph.add("venues", lambda: query_venue(location=json_data["location"], venue_type=json_data["event_type"], result_count=result_count, radius=radius, enrich=enrich))
+        add_ranking("venue_ranking", rank_venues, deps=["center", "venues"])
+
+        for i, cuisine in enumerate(cuisines):
+            graph.add(f"catering:{i}", lambda cuisine=cuisine: query_catering(location=json_data["location"], cuisine=cuisine, result_count=result_count, radius=radius, enrich=enrich))
+
+            if not self.catering_batch:
+                add_ranking(f"catering_ranking:{i}", rank_catering, deps=["center", f"catering:{i}"])
+
+        if self.catering_batch and cuisines:
+            add_ranking("catering_ranking", rank_catering_batch, deps=["center"] + [f"catering:{i}" for i in range(len(cuisines))])
+
+        return graph
+
+    def _collect(self, results, cuisines):
+        """
+        Assemble the (venues, catering) response from stage results.
+
+        Args:
+            results (dict): Stage name -> result
+            cuisines (list): Requested cuisines
+
+        Returns:
+            tuple: (venue ranking dict, list of per-cuisine catering dicts)
+        """
+        if "catering_ranking" in results:
+            catering = results["catering_ranking"]
+        else:
+            catering = [results[f"catering_ranking:{i}"] for i in range(len(cuisines))]
+
+        return results["venue_ranking"], catering
+
+    async def aplan(self, prompt, result_count=15, radius=20000, deadline=None, cache=True):
+        """
+        Async variant of plan.
+
+        Runs the same stages on the event loop using the async serializer,
+        Maps, and BigAgent clients, so a single worker can hold many plans
+        that are waiting on upstream I/O. Identical concurrent plans are
+        coalesced and finished plans cached as in plan.
+
+        Args:
+            prompt (str): Natural language description of the event requirements.
+            result_count (int, optional): Number of results to fetch from Google Maps.
+                                         Defaults to 15.
+            radius (int, optional): Search radius in meters from the location.
+                                   Defaults to 20000 (20km).
+            deadline (float, optional): Time budget in seconds. Defaults to the
+                                        PLAN_DEADLINE setting.
+            cache (bool, optional): Whether to read and store the plan cache.
+                                    Defaults to True.
+
+        Returns:
+            tuple: (venues, catering) as returned by plan
+
+        Raises:
+            ValueError: If prompt serialization fails or required fields are missing
+        """
+        return await self.flight.ado(self._plan_key(prompt, result_count, radius, cache), lambda: self._aplan(prompt, result_count, radius, deadline, cache))
+
+    async def _aplan(self, prompt, result_count, radius, deadline, cache):
+        """
+        Run the pipeline for aplan without coalescing.
+        """
+        sampled = self._sampled()
+
+        try:
+            with span("plan"), deadline_scope(Deadline(deadline or get_plan_deadline())):
+                json_data = await self.serializer.aserialize_prompt(prompt)
+
+                if not json_data:
+                    raise ValueError("Failed to serialize prompt")
+
+                self._dump(sampled, "serialized_prompt", json_data)
+
+                cuisines = json_data.get("cuisines", [])
+
+                async def run():
+                    results = await self._graph(json_data, result_count, radius, is_async=True).arun()
+
+                    self._dump(sampled, "venue_candidates", results["venues"])
+                    self._dump(sampled, "catering_candidates", [results[f"catering:{i}"] for i in range(len(cuisines))])
+
+                    return self._entry(results, cuisines)
+
+                if self.plan_cache is None or not cache:
+                    entry = await run()
+                else:
+                    key = self._requirements_key(json_data, result_count, radius)
+                    entry = await self.plan_cache.aget_or_fetch(key, run)
+
+                plans.inc(outcome="success")
+                return self._from_entry(entry, cuisines)
+        except Exception as e:
+            plans.inc(outcome="error")
+            raise ValueError(f"Pipeline planning failed: {e}")
+
+    async def astream_plan(self, prompt, result_count=15, radius=20000, deadline=None, cache=True):
+        """
+        Run the async pipeline, yielding a typed event as each stage completes.
+
+        Events are dicts with an "event" field:
+            - {"event": "requirements", "data": dict}: serialized prompt
+            - {"event": "venue_candidates", "data": list}: raw venue results
+            - {"event": "venue_ranking", "data": dict}: BigAgent venue response
+            - {"event": "catering_candidates", "cuisine": str, "index": int, "data": list}
+            - {"event": "catering_ranking", "cuisine": str, "index": int, "data": dict}
+            - {"event": "done"}: every stage finished
+
+        Finished plans are cached and concurrent identical streams coalesced
+        as in aplan. On a plan cache hit, and for a stream that joined one
+        already running, the candidate events are skipped: the rankings
+        follow the requirements event directly.
+
+        Args:
+            prompt (str): Natural language description of the event requirements.
+            result_count (int, optional): Number of results to fetch from Google Maps.
+                                         Defaults to 15.
+            radius (int, optional): Search radius in meters from the location.
+                                   Defaults to 20000 (20km).
+            deadline (float, optional): Time budget in seconds. Defaults to the
+                                        PLAN_DEADLINE setting.
+            cache (bool, optional): Whether to read and store the plan cache.
+                                    Defaults to True.
+
+        Yields:
+            dict: Pipeline events in completion order
+
+        Raises:
+            ValueError: If prompt serialization or any stage fails
+        """
+        sampled = self._sampled()
+
+        try:
+            with span("plan"), deadline_scope(Deadline(deadline or get_plan_deadline())):
+                json_data = await self.serializer.aserialize_prompt(prompt)
+
+                if not json_data:
+                    raise ValueError("Failed to serialize prompt")
+
+                self._dump(sampled, "serialized_prompt", json_data)
+                yield {"event": "requirements", "data": json_data}
+
+                cuisines = json_data.get("cuisines", [])
+                key = self._requirements_key(json_data, result_count, radius)
+                cached = self.plan_cache is not None and cache
+                stages = asyncio.Queue()
+
+                async def run():
+                    results = {}
+                    async for name, result in self._graph(json_data, result_count, radius, is_async=True).astream():
+                        results[name] = result
+                        stages.put_nowait((name, result))
+
+                    self._dump(sampled, "venue_candidates", results["venues"])
+                    self._dump(sampled, "catering_candidates", [results[f"catering:{i}"] for i in range(len(cuisines))])
+
+                    return self._entry(results, cuisines)
+
+                found = await self.plan_cache.alookup(key) if cached else None
+
+                if found is not None:
+                    entry, fresh = found
+                    if not fresh:
+                        self.plan_cache.arefresh(key, run)
+
+                    for event in self._ranking_events(entry, cuisines):
+                        yield event
+                else:
+                    # Identical streams share one run; only the stream that started it sees the stage events
+                    computation = asyncio.ensure_future(
+                        self.plan_cache.aload(key, run) if cached else self.flight.ado((key, "stream"), run)
+                    )
+                    streamed = False
+
+                    try:
+                        while not computation.done() or not stages.empty():
+                            if stages.empty():
+                                waiter = asyncio.ensure_future(stages.get())
+                                await asyncio.wait({waiter, computation}, return_when=asyncio.FIRST_COMPLETED)
+
+                                if not waiter.done():
+                                    waiter.cancel()
+                                    continue
+
+                                name, result = waiter.result()
+                            else:
+                                name, result = stages.get_nowait()
+
+                            streamed = True
+                            for event in self._stage_events(name, result, cuisines):
+                                yield event
+
+                        entry = computation.result()
+                    finally:
+                        # Only stops waiting; the shared run finishes and still fills the cache
+                        computation.cancel()
+
+                    if not streamed:
+                        for event in self._ranking_events(entry, cuisines):
+                            yield event
+
+                plans.inc(outcome="success")
+                yield {"event": "done"}
         except Exception as e:
+            plans.inc(outcome="error")
             raise ValueError(f"Pipeline planning failed: {e}")
+
+    def _stage_events(self, name, result, cuisines) -> list:
+        """
+        Stream events for one finished stage.
+
+        Args:
+            name (str): Stage name
+            result: Stage result
+            cuisines (list): Requested cuisines
+
+        Returns:
+            list: Events, empty for internal stages
+        """
+        stage, _, index = name.partition(":")
+
+        if stage == "center" or stage.endswith("_picks"):
+            return []
+        if stage == "venues":
+            return [{"event": "venue_candidates", "data": [place.to_dict() for place in result]}]
+        if stage == "venue_ranking":
+            return [{"event": "venue_ranking", "data": result}]
+        if name == "catering_ranking":
+            return [
+                {"event": "catering_ranking", "cuisine": cuisines[i], "index": i, "data": ranking}
+                for i, ranking in enumerate(result)
+            ]
+
+        if stage == "catering":
+            return [{"event": "catering_candidates", "cuisine": cuisines[int(index)], "index": int(index), "data": [place.to_dict() for place in result]}]
+
+        return [{"event": "catering_ranking", "cuisine": cuisines[int(index)], "index": int(index), "data": result}]
+
+    def _ranking_events(self, entry, cuisines) -> list:
+        """
+        Stream events for a plan answered without running its stages.
+
+        Args:
+            entry (dict): Plan cache entry
+            cuisines (list): Requested cuisines
+
+        Returns:
+            list: Venue ranking event, then one catering ranking event per cuisine
+        """
+        venues, catering = self._from_entry(entry, cuisines)
+        return [{"event": "venue_ranking", "data": venues}] + [
+            {"event": "catering_ranking", "cuisine": cuisines[i], "index": i, "data": ranking}
+            for i, ranking in enumerate(catering)
+        ]
+
+    async def aclose(self):
+        """
+        Release connections held by the async clients.
+        """
+        await self.map.aclose()
+        await self.transport.aclose()
+        self._refresh_pool.shutdown(wait=False)
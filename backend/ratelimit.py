@@ -0,0 +1,266 @@
+from backend.config import get_maps_rate_limit, get_hf_rate_limit, get_upstream_max_retries
+from backend.metrics import rate_limit_wait, upstream_retries
+from backend import deadline
+import asyncio
+import random
+import threading
+import time
+
+# HTTP statuses worth retrying, and the Google Maps API statuses that mean the same.
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RETRYABLE_API_STATUSES = {"OVER_QUERY_LIMIT": 429, "UNKNOWN_ERROR": 500}
+
+def _status(error):
+    """
+    HTTP-equivalent status of an upstream error, or None if it has none.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    if status is None:
+        status = RETRYABLE_API_STATUSES.get(getattr(error, "status", None))
+
+    return status
+
+def _retry_after(error):
+    """
+    Seconds requested by a Retry-After header on the error's response, or None.
+    """
+    headers = getattr(getattr(error, "response", None), "headers", None) or {}
+    try:
+        return max(0.0, float(headers.get("Retry-After")))
+    except (TypeError, ValueError):
+        return None
+
+class RateLimiter:
+    """
+    Token-bucket rate limiter with retries for a single upstream service.
+
+    One limiter is shared by every thread and task in the process that
+    calls the upstream. Each call takes a token; tokens refill at rate per
+    second up to burst, and callers that find the bucket empty wait for
+    their turn instead of sending the request. No request is sent once the
+    request deadline has passed, and no caller waits for a turn that comes
+    after it. Calls failing with 429 or a 5xx status are retried with
+    jittered exponential backoff, or after the Retry-After delay when the
+    upstream sends one, unless the wait would outlast the request deadline.
+    A 429 also pauses the whole bucket so concurrent callers back off
+    together.
+
+    Attributes:
+        name (str): Upstream name used in metrics
+        rate (float): Sustained requests per second
+        burst (int): Maximum tokens held
+        max_retries (int): Retries after the first attempt
+        base_delay (float): Backoff before the first retry, in seconds
+        max_delay (float): Upper bound of a single backoff, in seconds
+    """
+
+    def __init__(self, name, rate, burst=None, max_retries=3, base_delay=0.5, max_delay=10.0):
+        """
+        Initialize a full bucket.
+
+        Args:
+            name (str): Upstream name used in metrics
+            rate (float): Sustained requests per second
+            burst (int, optional): Maximum tokens held. Defaults to one second of rate.
+            max_retries (int, optional): Retries after the first attempt. Defaults to 3.
+            base_delay (float, optional): First backoff in seconds. Defaults to 0.5.
+            max_delay (float, optional): Backoff cap in seconds. Defaults to 10.0.
+
+        Raises:
+            ValueError: If rate is not positive
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+
+        self.name = name
+        self.rate = rate
+        self.burst = burst or max(1, int(rate))
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def _reserve(self) -> float:
+        """
+        Take a token, going into debt if none is available.
+
+        Returns:
+            float: Seconds the caller must wait before using the token
+        """
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+
+            wait = -self._tokens / self.rate if self._tokens < 0 else 0.0
+
+        rate_limit_wait.observe(wait, upstream=self.name)
+        return wait
+
+    def pause(self, seconds):
+        """
+        Hold back every caller for at least the given time.
+
+        Args:
+            seconds (float): Pause length
+        """
+        with self._lock:
+            self._tokens = min(self._tokens, -seconds * self.rate)
+
+    def _wait(self) -> float:
+        """
+        Take a token and return the wait for it, bounded by the request deadline.
+
+        Returns:
+            float: Seconds to wait before using the token
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed or the token only becomes available after it
+        """
+        wait = self._reserve()
+
+        budget = deadline.timeout()
+        if budget is not None and wait >= budget:
+            with self._lock:
+                self._tokens += 1
+            raise deadline.DeadlineExceeded(f"{self.name} rate limit wait of {wait:.2f}s outlasts the deadline")
+
+        return wait
+
+    def acquire(self):
+        """
+        Block the calling thread until a token is available.
+
+        Raises:
+            DeadlineExceeded: If the deadline has passed or the token only becomes available after it
+        """
+        wait = self._wait()
+        if wait:
+            time.sleep(wait)
+
+    async def aacquire(self):
+        """
+        Async variant of acquire.
+        """
+        wait = self._wait()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def _backoff(self, error, attempt):
+        """
+        Decide whether and how long to wait before retrying a failed call.
+
+        Args:
+            error (Exception): Error raised by the call
+            attempt (int): Number of the failed attempt, starting at 0
+
+        Returns:
+            float: Seconds to wait before retrying, or None to give up
+        """
+        status = _status(error)
+        if status not in RETRYABLE_STATUSES or attempt >= self.max_retries:
+            return None
+
+        delay = _retry_after(error)
+        if delay is None:
+            delay = random.uniform(0, min(self.max_delay, self.base_delay * 2 ** attempt))
+
+        budget = deadline.timeout()
+        if budget is not None and delay >= budget:
+            return None
+
+        upstream_retries.inc(upstream=self.name, status=status)
+
+        if status == 429:
+            self.pause(delay)
+            return 0.0
+
+        return delay
+
+    def call(self, func):
+        """
+        Call func under the rate limit, retrying on 429 and 5xx errors.
+
+        Args:
+            func (callable): Zero-argument function making one upstream request
+
+        Returns:
+            The value returned by func
+
+        Raises:
+            Exception: The last error once retries are exhausted or for non-retryable errors
+        """
+        attempt = 0
+
+        while True:
+            self.acquire()
+
+            try:
+                return func()
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+
+            time.sleep(delay)
+            attempt += 1
+
+    async def acall(self, func):
+        """
+        Async variant of call.
+
+        Args:
+            func (callable): Zero-argument coroutine function making one upstream request
+
+        Returns:
+            The value returned by func
+        """
+        attempt = 0
+
+        while True:
+            await self.aacquire()
+
+            try:
+                return await func()
+            except Exception as e:
+                delay = self._backoff(e, attempt)
+                if delay is None:
+                    raise
+
+            await asyncio.sleep(delay)
+            attempt += 1
+
+_limiters = {}
+_limiters_lock = threading.Lock()
+
+def get_limiter(upstream) -> RateLimiter:
+    """
+    Process-wide limiter for an upstream, created on first use.
+
+    Args:
+        upstream (str): "maps" or "hf"
+
+    Returns:
+        RateLimiter: Shared limiter
+
+    Raises:
+        ValueError: If the upstream is not known
+    """
+    rates = {
+        "maps": get_maps_rate_limit,
+        "hf": get_hf_rate_limit,
+    }
+
+    if upstream not in rates:
+        raise ValueError(f"Unknown upstream: {upstream}")
+
+    with _limiters_lock:
+        if upstream not in _limiters:
+            _limiters[upstream] = RateLimiter(upstream, rates[upstream](), max_retries=get_upstream_max_retries())
+
+        return _limiters[upstream]
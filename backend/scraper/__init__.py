@@ -1 +1,3 @@
 from .mapsearch import Map
+from .ranking import CandidateRanker
+from .place import Place, encode_places, decode_places
@@ -0,0 +1,236 @@
+from backend.config import get_cache_path, get_place_index_ttl, get_place_index_cell
+from backend.cache import TieredCache, normalize_key
+from .ranking import haversine
+import asyncio
+import math
+import threading
+import time
+
+# Results per text search page; a search returning fewer found every match.
+FULL_PAGE = 20
+# Searches kept per query, newest first.
+MAX_SEARCHES = 32
+METERS_PER_DEGREE = 111320
+
+class PlaceIndex:
+    """
+    Local spatial index of text searches already run against Google Maps.
+
+    Every search is recorded with its center, radius and result places,
+    and registered in the cells of a lat/lng grid that its circle touches,
+    per normalized query. A later search for the same query is answered
+    locally when a fresh recorded search fully covers its circle: the
+    recorded places inside the new circle are returned in their original
+    order, provided there are at least as many as requested or the
+    recorded search was not truncated to a full page.
+
+    Records are persisted in the shared cache database so every worker
+    (and the pre-warming job) contributes to and reads from the same index.
+
+    Attributes:
+        ttl (float): Seconds a recorded search may answer queries; 0 disables the index
+        cell (float): Grid cell size in degrees
+        store (TieredCache): Persistent query -> recorded searches store
+        hits (int): Searches answered locally
+        misses (int): Searches that had to go to Google Maps
+    """
+
+    def __init__(self, ttl=None, cell=None, path=None):
+        """
+        Initialize an empty index over the shared cache database.
+
+        Args:
+            ttl (float, optional): Freshness of recorded searches. Defaults to PLACE_INDEX_TTL.
+            cell (float, optional): Grid cell size in degrees. Defaults to PLACE_INDEX_CELL.
+            path (str, optional): SQLite database file. Defaults to CACHE_DB_PATH.
+        """
+        self.ttl = get_place_index_ttl() if ttl is None else ttl
+        self.cell = cell or get_place_index_cell()
+        self.store = TieredCache("place_index", path=path or get_cache_path(), max_size=256, ttl=self.ttl or None)
+        self.hits = 0
+        self.misses = 0
+        self._grids = {}
+        self._lock = threading.Lock()
+
+    def _cell(self, lat, lng) -> tuple:
+        """
+        Grid cell containing a point.
+        """
+        return math.floor(lat / self.cell), math.floor(lng / self.cell)
+
+    def _cells(self, search) -> list:
+        """
+        Grid cells overlapped by the bounding box of a search circle.
+        """
+        dlat = search["radius"] / METERS_PER_DEGREE
+        dlng = search["radius"] / (METERS_PER_DEGREE * max(math.cos(math.radians(search["lat"])), 0.01))
+        low = self._cell(search["lat"] - dlat, search["lng"] - dlng)
+        high = self._cell(search["lat"] + dlat, search["lng"] + dlng)
+
+        return [(i, j) for i in range(low[0], high[0] + 1) for j in range(low[1], high[1] + 1)]
+
+    def _grid(self, searches) -> dict:
+        """
+        Build the cell -> searches grid for one query's recorded searches.
+        """
+        grid = {}
+        for search in searches:
+            for cell in self._cells(search):
+                grid.setdefault(cell, []).append(search)
+        return grid
+
+    def _fresh(self, search) -> bool:
+        """
+        Whether a recorded search may still answer queries.
+        """
+        return time.time() - search["stored_at"] <= self.ttl
+
+    def _answer(self, search, latlng, radius, result_count):
+        """
+        Places of a recorded search that answer a new search, or None if it does not cover it.
+        """
+        offset = haversine(search["lat"], search["lng"], latlng["lat"], latlng["lng"])
+        if offset + radius > search["radius"] or not self._fresh(search):
+            return None
+
+        if offset < 1 and radius == search["radius"]:
+            return search["results"]
+
+        inside = [
+            place for place in search["results"]
+            if (place.get("geometry") or {}).get("location")
+            and haversine(
+                latlng["lat"], latlng["lng"],
+                place["geometry"]["location"]["lat"], place["geometry"]["location"]["lng"]
+            ) <= radius
+        ]
+
+        if len(inside) < result_count and len(search["results"]) >= FULL_PAGE:
+            return None
+
+        return inside
+
+    def lookup(self, query, latlng, radius, result_count):
+        """
+        Answer a text search from recorded searches, if one covers it.
+
+        Args:
+            query (str): Text search query
+            latlng (dict): {"lat", "lng"} search center
+            radius (int): Search radius in meters
+            result_count (int): Number of results the caller needs
+
+        Returns:
+            list: Raw place results, or None if no fresh recorded search covers the circle
+        """
+        if not self.ttl:
+            return None
+
+        key = normalize_key(query)
+        cell = self._cell(latlng["lat"], latlng["lng"])
+
+        results = self._find_loaded(key, cell, latlng, radius, result_count)
+        if results is None:
+            # Other workers may have recorded searches since this one last looked
+            results = self._find(self._load(key), cell, latlng, radius, result_count)
+
+        return self._count(results)
+
+    async def alookup(self, query, latlng, radius, result_count):
+        """
+        Async variant of lookup, reading the persistent store on a worker thread.
+        """
+        if not self.ttl:
+            return None
+
+        key = normalize_key(query)
+        cell = self._cell(latlng["lat"], latlng["lng"])
+
+        results = self._find_loaded(key, cell, latlng, radius, result_count)
+        if results is None:
+            grid = await asyncio.to_thread(self._load, key)
+            results = self._find(grid, cell, latlng, radius, result_count)
+
+        return self._count(results)
+
+    def _find_loaded(self, key, cell, latlng, radius, result_count):
+        """
+        Answer from the grid already loaded for a query, if any.
+        """
+        with self._lock:
+            grid = self._grids.get(key)
+
+        return self._find(grid, cell, latlng, radius, result_count) if grid is not None else None
+
+    def _count(self, results):
+        """
+        Count a lookup as a hit or a miss and pass its results through.
+        """
+        with self._lock:
+            if results is None:
+                self.misses += 1
+            else:
+                self.hits += 1
+
+        return results
+
+    def _load(self, key) -> dict:
+        """
+        Rebuild a query's grid from the persistent store.
+        """
+        grid = self._grid(self.store.get(key) or [])
+        with self._lock:
+            self._grids[key] = grid
+        return grid
+
+    def _find(self, grid, cell, latlng, radius, result_count):
+        """
+        Answer from the first recorded search in the center's cell that covers the circle.
+        """
+        for search in grid.get(cell, []):
+            results = self._answer(search, latlng, radius, result_count)
+            if results is not None:
+                return results
+        return None
+
+    def add(self, query, latlng, radius, results):
+        """
+        Record a search run against Google Maps.
+
+        Args:
+            query (str): Text search query
+            latlng (dict): {"lat", "lng"} search center
+            radius (int): Search radius in meters
+            results (list): Raw place results of the search
+        """
+        if not self.ttl:
+            return
+
+        key = normalize_key(query)
+        search = {"lat": latlng["lat"], "lng": latlng["lng"], "radius": radius, "results": results, "stored_at": time.time()}
+
+        with self._lock:
+            searches = [
+                recorded for recorded in self.store.get(key) or []
+                if self._fresh(recorded) and (recorded["lat"], recorded["lng"], recorded["radius"]) != (search["lat"], search["lng"], radius)
+            ]
+            searches = [search] + searches[:MAX_SEARCHES - 1]
+
+            self.store.set(key, searches)
+            self._grids[key] = self._grid(searches)
+
+    async def aadd(self, query, latlng, radius, results):
+        """
+        Async variant of add, updating the persistent store on a worker thread.
+        """
+        await asyncio.to_thread(self.add, query, latlng, radius, results)
+
+    def stats(self) -> dict:
+        """
+        Report recorded queries and hit/miss counters.
+
+        Returns:
+            dict: {"queries": int, "hits": int, "misses": int}
+        """
+        with self._lock:
+            return {"queries": len(self._grids), "hits": self.hits, "misses": self.misses}
@@ -1,5 +1,55 @@
 from googlemaps import Client
-from backend.config import get_google_maps_key
+from googlemaps.exceptions import ApiError, HTTPError
+from backend.config import (
+    get_google_maps_key, get_details_workers, get_details_timeout,
+    get_cache_path, get_geocode_cache_ttl, get_geocode_cache_size,
+    get_place_cache_ttl, get_place_cache_max_age, get_place_cache_size,
+    get_place_cache_disk_size, get_place_refresh_workers
+)
+from backend.metrics import span
+from backend.ratelimit import get_limiter
+from backend import deadline
+from backend.cache import TieredCache, StaleWhileRevalidateCache, SingleFlight, normalize_key
+from .geoindex import PlaceIndex
+from .place import Place
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from dataclasses import replace
+import asyncio
+import httpx
+import logging
+import threading
+
+logger = logging.getLogger(__name__)
+
+MAPS_API_URL = "https://maps.googleapis.com/maps/api"
+
+class MapsClient(Client):
+    """
+    googlemaps client that leaves 5xx retries to the shared rate limiter.
+
+    The stock client retries 500, 503 and 504 responses on its own for up
+    to retry_timeout, underneath the limiter's retries. Here the first
+    such response is raised as an HTTPError with its status instead, so
+    the limiter's deadline-aware backoff is the only retry loop.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._last_status = threading.local()
+        self.requests_kwargs["hooks"] = {"response": self._record_status}
+
+    def _record_status(self, response, *args, **kwargs):
+        """
+        Remember the status of the calling thread's last response.
+        """
+        self._last_status.code = response.status_code
+
+    def _request(self, url, params, first_request_time=None, retry_counter=0, *args, **kwargs):
+        # With over-query-limit retries off, only a 5xx response leads here with retry_counter > 0
+        if retry_counter:
+            raise HTTPError(getattr(self._last_status, "code", 503))
+
+        return super()._request(url, params, first_request_time, retry_counter, *args, **kwargs)
 
 class Map:
     """
@@ -10,67 +60,302 @@ class Map:
     results with additional details like phone numbers and websites.
     
     Attributes:
-        client (Client): Google Maps API client instance
+        client (MapsClient): Google Maps API client instance
+        details_timeout (float): Seconds to wait for a single place details call
+        geocode_cache (TieredCache): Location -> lat/lng cache shared across workers
+        details_cache (StaleWhileRevalidateCache): place_id -> place details cache
+        geocode_flight (SingleFlight): Coalesces concurrent geocodes of the same location
+        search_flight (SingleFlight): Coalesces concurrent identical text searches
+        place_index (PlaceIndex): Earlier text searches that can answer covered searches locally
+        limiter (RateLimiter): Process-wide Google Maps rate limiter
+        transport (UpstreamTransport): Shared connection pools, or None for private ones
     """
     
-    def __init__(self):
+    def __init__(self, details_workers=None, details_timeout=None, transport=None):
         """
         Initialize the Map client with Google Maps API key.
+
+        Args:
+            details_workers (int, optional): Size of the worker pool used for
+                                             place details enrichment. Defaults
+                                             to the MAPS_DETAILS_WORKERS setting.
+            details_timeout (float, optional): Per-call timeout in seconds for place
+                                               details. Defaults to MAPS_DETAILS_TIMEOUT.
+            transport (UpstreamTransport, optional): Connection pools shared with other
+                                                     upstream clients. Defaults to None,
+                                                     giving this client its own connections.
+        """
+        self.transport = transport
+        # Over-quota and 5xx responses are retried by the shared limiter, which paces every caller
+        self.client = MapsClient(
+            key=get_google_maps_key(),
+            retry_over_query_limit=False,
+            requests_session=transport.session if transport is not None else None
+        )
+        self.limiter = get_limiter("maps")
+        self.key = get_google_maps_key()
+        self._http = None
+        self._details_semaphore = asyncio.Semaphore(details_workers or get_details_workers())
+        self.details_timeout = details_timeout or get_details_timeout()
+        self._details_pool = ThreadPoolExecutor(
+            max_workers=details_workers or get_details_workers(),
+            thread_name_prefix="place-details"
+        )
+        # Stale details are refreshed on their own pool so refreshes never hold up foreground lookups
+        self._refresh_pool = ThreadPoolExecutor(
+            max_workers=get_place_refresh_workers(),
+            thread_name_prefix="place-details-refresh"
+        )
+        self.geocode_cache = TieredCache(
+            "geocode",
+            path=get_cache_path(),
+            max_size=get_geocode_cache_size(),
+            ttl=get_geocode_cache_ttl()
+        )
+        self.details_cache = StaleWhileRevalidateCache(
+            TieredCache(
+                "place_details",
+                path=get_cache_path(),
+                max_size=get_place_cache_size(),
+                ttl=get_place_cache_max_age(),
+                max_disk_entries=get_place_cache_disk_size()
+            ),
+            fresh_ttl=get_place_cache_ttl(),
+            executor=self._refresh_pool,
+            name="place_details"
+        )
+        self.geocode_flight = SingleFlight("geocode")
+        self.search_flight = SingleFlight("places_search")
+        self.place_index = PlaceIndex()
+
+    def geocode(self, location) -> dict:
+        """
+        Resolve a location to coordinates, using the geocode cache.
+
+        Concurrent misses for the same location share one request.
+
+        Args:
+            location (str): Location to resolve (city name, address, etc.)
+
+        Returns:
+            dict: {"lat": float, "lng": float}
+
+        Raises:
+            IndexError: If Google Maps returns no match for the location
+        """
+        key = normalize_key(location)
+        latlng = self.geocode_cache.get(key)
+
+        if latlng is None:
+            def request():
+                with span("geocode"):
+                    geocode = self.limiter.call(lambda: self.client.geocode(location))[0] # type: ignore
+                self.geocode_cache.set(key, geocode["geometry"]["location"])
+                return geocode["geometry"]["location"]
+
+            latlng = self.geocode_flight.do(key, request)
+
+        return latlng
+
+    def _search(self, query, latlng, radius, result_count) -> dict:
+        """
+        Run a text search, sharing the request with concurrent identical searches.
+
+        Searches covered by an earlier search in the place index are
+        answered locally.
+
+        Args:
+            query (str): Text search query
+            latlng (dict): {"lat", "lng"} search center
+            radius (int): Search radius in meters
+            result_count (int): Number of results needed
+
+        Returns:
+            dict: Raw text search response
+        """
+        results = self.place_index.lookup(query, latlng, radius, result_count)
+        if results is not None:
+            return {"results": results}
+
+        def request():
+            with span("places_search"):
+                response = self.limiter.call(lambda: self.client.places( # type: ignore
+                    query=query,
+                    location=(latlng["lat"], latlng["lng"]),
+                    radius=radius
+                ))
+            self.place_index.add(query, latlng, radius, response.get("results", []))
+            return response
+
+        return self.search_flight.do((query, latlng["lat"], latlng["lng"], radius), request)
+
+    def _request_details(self, place_id) -> dict:
+        """
+        Request phone number, website, and hours for a single place from Google Maps.
+
+        Args:
+            place_id (str): Google Maps place ID
+
+        Returns:
+            dict: Raw details result
+        """
+        with span("details"):
+            details_resp = self.limiter.call(lambda: self.client.place( # type: ignore
+                place_id=place_id,
+                fields=[
+                    "formatted_phone_number",
+                    "website",
+                    "opening_hours"
+                ]
+            ))
+        return details_resp.get("result", {})
+
+    def _fetch_details(self, place_id) -> dict:
+        """
+        Fetch phone number, website, and hours for a single place.
+
+        Served from the place details cache when possible; stale entries are
+        returned immediately and refreshed in the background.
+
+        Args:
+            place_id (str): Google Maps place ID
+
+        Returns:
+            dict: Raw details result, or an empty dict if the lookup failed
+        """
+        if not place_id:
+            return {}
+
+        try:
+            return self.details_cache.get_or_fetch(place_id, lambda: self._request_details(place_id))
+        except Exception:
+            return {}
+
+    def fetch_details(self, place_ids: list) -> list:
+        """
+        Fetch details for several places in parallel.
+
+        Lookups are submitted to the bounded worker pool and collected in
+        input order. A lookup that exceeds the per-call timeout, or the
+        request deadline, is treated like a failed lookup. Once the deadline
+        has passed, only cached details are returned.
+
+        Args:
+            place_ids (list): Google Maps place IDs
+
+        Returns:
+            list: Raw details results (empty dicts on failure), in input order
         """
-        self.client = Client(key=get_google_maps_key())
+        if self._past_deadline():
+            return self._cached_details(place_ids)
 
-    def _map_place(self, place: dict) -> dict:
+        fetch = deadline.propagate(self._fetch_details)
+        futures = [self._details_pool.submit(fetch, place_id) for place_id in place_ids]
+
+        details = []
+        for future in futures:
+            try:
+                details.append(future.result(timeout=deadline.timeout(self.details_timeout)))
+            except FutureTimeoutError:
+                future.cancel()
+                details.append({})
+
+        return details
+
+    def _past_deadline(self) -> bool:
+        """
+        Whether the request deadline, if any, has passed.
+        """
+        request_deadline = deadline.current()
+        return request_deadline is not None and request_deadline.expired()
+
+    def _cached_details(self, place_ids: list) -> list:
+        """
+        Details already in the place details cache, fresh or stale, without calling Google Maps.
+
+        Args:
+            place_ids (list): Google Maps place IDs
+
+        Returns:
+            list: Raw details results (empty dicts when not cached), in input order
+        """
+        details = []
+        for place_id in place_ids:
+            found = self.details_cache.lookup(place_id) if place_id else None
+            details.append(found[0] if found is not None else {})
+        return details
+
+    def _map_places(self, places: list, enrich=True) -> list:
+        """
+        Transform a page of Google Maps results, enriching them in parallel.
+
+        Args:
+            places (list): Raw place data from Google Maps API
+            enrich (bool, optional): Fetch phone, website and hours for each place.
+                                     Defaults to True.
+
+        Returns:
+            list: Places in the same order as the input
+        """
+        if not enrich:
+            return [self._map_place(place, {}) for place in places]
+
+        details = self.fetch_details([place.get("place_id") for place in places])
+        return [self._map_place(place, place_details) for place, place_details in zip(places, details)]
+
+    def _map_place(self, place: dict, details=None) -> Place:
         """
         Transform Google Maps place data into standardized format.
         
         Enriches basic place data with additional details by making
-        a follow-up API call for phone number, website, and hours.
+        a follow-up API call for phone number, website, and hours,
+        unless the details have already been fetched.
         
         Args:
             place (dict): Raw place data from Google Maps API
+            details (dict, optional): Pre-fetched place details result
         
         Returns:
-            dict: Standardized place data with fields:
-                  - name: Business name
-                  - address: Full formatted address
-                  - types: List of place types
-                  - rating: Average rating (1-5)
-                  - price_level: Price level (1-4)
-                  - vicinity: Neighborhood/area
-                  - phone_number: Formatted phone number
-                  - website: Business website URL
-                  - opening_hours: Weekly hours as list of strings
-        """
-        place_id = place.get("place_id")
-
-        details = {}
-        if place_id:
-            try:
-                details_resp = self.client.place( # type: ignore
-                    place_id=place_id,
-                    fields=[
-                        "formatted_phone_number",
-                        "website",
-                        "opening_hours"
-                    ]
-                )
-                details = details_resp.get("result", {})
-            except Exception:
-                details = {}
+            Place: Standardized place data (see Place for its fields)
+        """
+        if details is None:
+            details = self._fetch_details(place.get("place_id"))
 
+        return Place.from_maps(place, self._contact_fields(details))
+
+    def _contact_fields(self, details: dict) -> dict:
+        """
+        Extract the standardized contact fields from a place details result.
+
+        Args:
+            details (dict): Raw details result, possibly empty
+
+        Returns:
+            dict: phone_number, website, and opening_hours (None when unknown)
+        """
         return {
-            "name": place.get("name"),
-            "address": place.get("formatted_address"),
-            "types": place.get("types", []),
-            "rating": place.get("rating"),
-            "price_level": place.get("price_level"),
-            "vicinity": place.get("vicinity"),
             "phone_number": details.get("formatted_phone_number"),
             "website": details.get("website"),
             "opening_hours": details.get("opening_hours", {}).get("weekday_text")
         }
 
-    def query_venue(self, location, venue_type, result_count=15, radius=20000):
+    def enrich(self, places: list) -> list:
+        """
+        Fill in contact fields for places mapped without details.
+
+        Used by lazy enrichment, where searches skip the details lookups and
+        only the places that survive ranking are enriched.
+
+        Args:
+            places (list): Places from query_venue/query_catering
+
+        Returns:
+            list: Copies of the places with phone_number, website, and opening_hours set
+        """
+        details = self.fetch_details([place.place_id for place in places])
+        return [replace(place, **self._contact_fields(place_details)) for place, place_details in zip(places, details)]
+
+    def query_venue(self, location, venue_type, result_count=15, radius=20000, enrich=True):
         """
         Search for event venues near a location.
         
@@ -82,9 +367,11 @@ class Map:
             venue_type (str): Type of venue to search for (e.g., "wedding", "conference")
             result_count (int, optional): Maximum number of results to return. Defaults to 15.
             radius (int, optional): Search radius in meters. Defaults to 20000.
+            enrich (bool, optional): Fetch phone, website and hours for every result.
+                                     Defaults to True.
         
         Returns:
-            list: List of venue dictionaries with standardized place data
+            list: Venues as Place records
         
         Raises:
             ValueError: If result_count is not a positive integer
@@ -102,25 +389,20 @@ class Map:
             if result_count <= 0:
                 raise ValueError("result_count must be a positive integer")
 
-            geocode = self.client.geocode(location)[0] # type: ignore
-            latlng = geocode["geometry"]["location"]
+            latlng = self.geocode(location)
 
-            response = self.client.places( # type: ignore
-                query=venue_type,
-                location=(latlng["lat"], latlng["lng"]),
-                radius=radius
-            )
+            response = self._search(venue_type, latlng, radius, result_count)
 
             results = response.get("results", [])[:result_count]
-            mapped_results = [self._map_place(place) for place in results]
+            mapped_results = self._map_places(results, enrich)
 
             return mapped_results
         
         except Exception as e:
-            print(f"Error querying Google Maps: {e}")
+            logger.warning(f"Error querying Google Maps: {e}")
             return []
 
-    def query_catering(self, location, cuisine, result_count=15, radius=20000):
+    def query_catering(self, location, cuisine, result_count=15, radius=20000, enrich=True):
         """
         Search for halal catering options near a location.
         
@@ -133,9 +415,11 @@ class Map:
             cuisine (str): Type of cuisine (e.g., "Indian", "Pakistani", "Italian")
             result_count (int, optional): Maximum number of results to return. Defaults to 15.
             radius (int, optional): Search radius in meters. Defaults to 20000.
+            enrich (bool, optional): Fetch phone, website and hours for every result.
+                                     Defaults to True.
         
         Returns:
-            list: List of caterer dictionaries with standardized place data
+            list: Caterers as Place records
         
         Raises:
             ValueError: If result_count is not a positive integer
@@ -152,20 +436,258 @@ class Map:
             if result_count <= 0:
                 raise ValueError("result_count must be a positive integer")
 
-            geocode = self.client.geocode(location)[0] # type: ignore
-            latlng = geocode["geometry"]["location"]
+            latlng = self.geocode(location)
 
-            response = self.client.places( # type: ignore
-                query= "halal " + cuisine + " catering",
-                location=(latlng["lat"], latlng["lng"]),
-                radius=radius
-            )
+            response = self._search("halal " + cuisine + " catering", latlng, radius, result_count)
 
             results = response.get("results", [])[:result_count]
-            mapped_results = [self._map_place(place) for place in results]
+            mapped_results = self._map_places(results, enrich)
 
             return mapped_results
         
         except Exception as e:
-            print(f"Error querying Google Maps: {e}")
+            logger.warning(f"Error querying Google Maps: {e}")
+            return []
+
+    async def _aget(self, endpoint, params) -> dict:
+        """
+        Call a Google Maps web service endpoint over the shared async HTTP client.
+
+        Requests go through the shared rate limiter and are retried on
+        over-quota and server errors, within the request deadline if any.
+
+        Args:
+            endpoint (str): Endpoint path, e.g. "geocode" or "place/textsearch"
+            params (dict): Query parameters, without the API key
+
+        Returns:
+            dict: Decoded JSON response body
+
+        Raises:
+            ApiError: If Google Maps reports an error status
+        """
+        if self._http is None:
+            if self.transport is not None:
+                self._http = self.transport.maps_client()
+            else:
+                self._http = httpx.AsyncClient(timeout=self.details_timeout)
+
+        async def request():
+            response = await self._http.get(f"{MAPS_API_URL}/{endpoint}/json", params={**params, "key": self.key})
+            response.raise_for_status()
+            body = response.json()
+
+            status = body.get("status")
+            if status not in ("OK", "ZERO_RESULTS"):
+                raise ApiError(status, body.get("error_message"))
+
+            return body
+
+        return await asyncio.wait_for(self.limiter.acall(request), deadline.timeout())
+
+    async def ageocode(self, location) -> dict:
+        """
+        Async variant of geocode.
+
+        Args:
+            location (str): Location to resolve (city name, address, etc.)
+
+        Returns:
+            dict: {"lat": float, "lng": float}
+        """
+        key = normalize_key(location)
+        latlng = await self.geocode_cache.aget(key)
+
+        if latlng is None:
+            async def request():
+                with span("geocode"):
+                    body = await self._aget("geocode", {"address": location})
+                await self.geocode_cache.aset(key, body["results"][0]["geometry"]["location"])
+                return body["results"][0]["geometry"]["location"]
+
+            latlng = await self.geocode_flight.ado(key, request)
+
+        return latlng
+
+    async def _arequest_details(self, place_id) -> dict:
+        """
+        Async variant of _request_details, bounded by the details pool size, timeout and request deadline.
+
+        Args:
+            place_id (str): Google Maps place ID
+
+        Returns:
+            dict: Raw details result
+        """
+        async with self._details_semaphore:
+            with span("details"):
+                body = await asyncio.wait_for(
+                    self._aget("place/details", {
+                        "place_id": place_id,
+                        "fields": "formatted_phone_number,website,opening_hours"
+                    }),
+                    deadline.timeout(self.details_timeout)
+                )
+
+        return body.get("result", {})
+
+    async def _afetch_details(self, place_id) -> dict:
+        """
+        Async variant of _fetch_details.
+
+        Args:
+            place_id (str): Google Maps place ID
+
+        Returns:
+            dict: Raw details result, or an empty dict if the lookup failed
+        """
+        if not place_id:
+            return {}
+
+        try:
+            return await self.details_cache.aget_or_fetch(place_id, lambda: self._arequest_details(place_id))
+        except Exception:
+            return {}
+
+    async def afetch_details(self, place_ids: list) -> list:
+        """
+        Async variant of fetch_details.
+
+        Args:
+            place_ids (list): Google Maps place IDs
+
+        Returns:
+            list: Raw details results (empty dicts on failure), in input order
+        """
+        if self._past_deadline():
+            return await self._acached_details(place_ids)
+
+        return list(await asyncio.gather(*[self._afetch_details(place_id) for place_id in place_ids]))
+
+    async def _acached_details(self, place_ids: list) -> list:
+        """
+        Async variant of _cached_details.
+        """
+        details = []
+        for place_id in place_ids:
+            found = await self.details_cache.alookup(place_id) if place_id else None
+            details.append(found[0] if found is not None else {})
+        return details
+
+    async def aenrich(self, places: list) -> list:
+        """
+        Async variant of enrich.
+
+        Args:
+            places (list): Places from aquery_venue/aquery_catering
+
+        Returns:
+            list: Copies of the places with phone_number, website, and opening_hours set
+        """
+        details = await self.afetch_details([place.place_id for place in places])
+        return [replace(place, **self._contact_fields(place_details)) for place, place_details in zip(places, details)]
+
+    async def _amap_places(self, places: list, enrich=True) -> list:
+        """
+        Async variant of _map_places.
+
+        Args:
+            places (list): Raw place data from Google Maps API
+            enrich (bool, optional): Fetch phone, website and hours for each place.
+                                     Defaults to True.
+
+        Returns:
+            list: Places in the same order as the input
+        """
+        if not enrich:
+            return [self._map_place(place, {}) for place in places]
+
+        details = await self.afetch_details([place.get("place_id") for place in places])
+        return [self._map_place(place, place_details) for place, place_details in zip(places, details)]
+
+    async def _asearch(self, location, query, result_count, radius, enrich=True) -> list:
+        """
+        Geocode a location, run a text search around it, and enrich the results.
+
+        Args:
+            location (str): Location to search near
+            query (str): Text search query
+            result_count (int): Maximum number of results to return
+            radius (int): Search radius in meters
+            enrich (bool, optional): Fetch phone, website and hours for every result.
+                                     Defaults to True.
+
+        Returns:
+            list: Places, or an empty list on error
+        """
+        try:
+            if result_count <= 0:
+                raise ValueError("result_count must be a positive integer")
+
+            latlng = await self.ageocode(location)
+            results = await self.place_index.alookup(query, latlng, radius, result_count)
+
+            async def request():
+                with span("places_search"):
+                    response = await self._aget("place/textsearch", {
+                        "query": query,
+                        "location": f"{latlng['lat']},{latlng['lng']}",
+                        "radius": radius
+                    })
+                await self.place_index.aadd(query, latlng, radius, response.get("results", []))
+                return response
+
+            if results is None:
+                response = await self.search_flight.ado((query, latlng["lat"], latlng["lng"], radius), request)
+                results = response.get("results", [])
+
+            results = results[:result_count]
+            return await self._amap_places(results, enrich)
+
+        except Exception as e:
+            logger.warning(f"Error querying Google Maps: {e}")
             return []
+
+    async def aquery_venue(self, location, venue_type, result_count=15, radius=20000, enrich=True):
+        """
+        Async variant of query_venue.
+
+        Args:
+            location (str): Location to search near (city name, address, etc.)
+            venue_type (str): Type of venue to search for
+            result_count (int, optional): Maximum number of results to return. Defaults to 15.
+            radius (int, optional): Search radius in meters. Defaults to 20000.
+            enrich (bool, optional): Fetch phone, website and hours for every result.
+                                     Defaults to True.
+
+        Returns:
+            list: Venues as Place records
+        """
+        return await self._asearch(location, venue_type, result_count, radius, enrich)
+
+    async def aquery_catering(self, location, cuisine, result_count=15, radius=20000, enrich=True):
+        """
+        Async variant of query_catering.
+
+        Args:
+            location (str): Location to search near (city name, address, etc.)
+            cuisine (str): Type of cuisine (e.g., "Indian", "Pakistani", "Italian")
+            result_count (int, optional): Maximum number of results to return. Defaults to 15.
+            radius (int, optional): Search radius in meters. Defaults to 20000.
+            enrich (bool, optional): Fetch phone, website and hours for every result.
+                                     Defaults to True.
+
+        Returns:
+            list: Caterers as Place records
+        """
+        return await self._asearch(location, "halal " + cuisine + " catering", result_count, radius, enrich)
+
+    async def aclose(self):
+        """
+        Close the async HTTP client, if this client opened its own.
+
+        Shared transports are closed by their owner.
+        """
+        if self._http is not None and self.transport is None:
+            await self._http.aclose()
+        self._http = None
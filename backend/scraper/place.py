@@ -0,0 +1,209 @@
+from dataclasses import dataclass, field, fields
+
+# Table columns for LLM payloads: (code, place field, description), in output order.
+COLUMNS = [
+    ("n", "name", "name"),
+    ("a", "address", "address"),
+    ("r", "rating", "rating"),
+    ("rc", "user_ratings_total", "review count"),
+    ("p", "price_level", "price level 1-4"),
+    ("d", "distance_m", "km from event location"),
+    ("t", "types", "place types"),
+    ("c", "cuisines", "cuisines"),
+    ("h", "opening_hours", "opening hours"),
+]
+
+# Place types every result carries; they say nothing about suitability.
+GENERIC_TYPES = {"point_of_interest", "establishment"}
+
+# Fields set after search by ranking and catering merges; left out of the dict form until set.
+DOWNSTREAM_FIELDS = {"distance_m", "cuisines"}
+
+@dataclass(slots=True)
+class Place:
+    """
+    Standardized Google Maps place, as returned by Map.
+
+    Places are carried through pre-ranking and prompt encoding as is and
+    converted to dicts only where they leave the pipeline (BigAgent
+    requests, streamed events and logs).
+
+    Attributes:
+        place_id (str): Google Maps place ID
+        name (str): Business name
+        address (str): Full formatted address
+        types (list): Place types
+        rating (float): Average rating (1-5)
+        user_ratings_total (int): Number of reviews
+        price_level (int): Price level (1-4)
+        vicinity (str): Neighborhood/area
+        location (dict): {"lat", "lng"} coordinates
+        phone_number (str): Formatted phone number
+        website (str): Business website URL
+        opening_hours (list): Weekly hours as list of strings
+        distance_m (float): Meters from the search center, set by CandidateRanker.rank
+        cuisines (list): Cuisines whose searches returned the place, set by catering merges
+    """
+
+    place_id: str = None
+    name: str = None
+    address: str = None
+    types: list = field(default_factory=list)
+    rating: float = None
+    user_ratings_total: int = None
+    price_level: int = None
+    vicinity: str = None
+    location: dict = None
+    phone_number: str = None
+    website: str = None
+    opening_hours: list = None
+    distance_m: float = None
+    cuisines: list = None
+
+    @classmethod
+    def from_maps(cls, place: dict, contact: dict) -> "Place":
+        """
+        Build a place from a raw text search result and its contact fields.
+
+        Args:
+            place (dict): Raw place data from Google Maps API
+            contact (dict): phone_number, website and opening_hours
+
+        Returns:
+            Place: Standardized place
+        """
+        return cls(
+            place_id=place.get("place_id"),
+            name=place.get("name"),
+            address=place.get("formatted_address"),
+            types=place.get("types", []),
+            rating=place.get("rating"),
+            user_ratings_total=place.get("user_ratings_total"),
+            price_level=place.get("price_level"),
+            vicinity=place.get("vicinity"),
+            location=place.get("geometry", {}).get("location"),
+            **contact
+        )
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Place":
+        """
+        Build a place from its dict form, ignoring unknown keys.
+        """
+        return cls(**{item.name: data[item.name] for item in fields(cls) if item.name in data})
+
+    def to_dict(self) -> dict:
+        """
+        Dict form of the place, as returned by the API, without unset downstream fields.
+        """
+        return {
+            item.name: getattr(self, item.name) for item in fields(self)
+            if item.name not in DOWNSTREAM_FIELDS or getattr(self, item.name) is not None
+        }
+
+def summarize_hours(opening_hours) -> str:
+    """
+    Collapse weekday_text hours into runs of days with the same hours.
+
+    Example: seven "Monday: 9:00 AM – 5:00 PM" style lines become
+    "Mon-Fri 9:00 AM – 5:00 PM; Sat-Sun Closed".
+
+    Args:
+        opening_hours (list): Weekly hours as list of strings, or None
+
+    Returns:
+        str: Summary, or "" if the hours are unknown
+    """
+    runs = []
+    for line in opening_hours or []:
+        day, _, hours = line.partition(": ")
+        day, hours = day[:3], hours.strip()
+
+        if runs and runs[-1][2] == hours:
+            runs[-1][1] = day
+        else:
+            runs.append([day, day, hours])
+
+    return "; ".join(
+        f"{first}-{last} {hours}" if first != last else f"{first} {hours}"
+        for first, last, hours in runs
+    )
+
+def _cell(code, value) -> str:
+    """
+    Render one table cell.
+    """
+    if value is None or value == [] or value == "":
+        return ""
+    if code == "d":
+        return f"{value / 1000:.1f}"
+    if code == "t":
+        return ",".join(kind for kind in value if kind not in GENERIC_TYPES)
+    if code == "c":
+        return ",".join(value)
+    if code == "h":
+        return summarize_hours(value)
+
+    return str(value).replace("|", "/").replace("\n", " ")
+
+def encode_places(places: list) -> str:
+    """
+    Encode places as a compact table for LLM prompts.
+
+    The table has a legend line, a header of short field codes, and one
+    row per place with cells separated by "|". Columns that are empty
+    for every place are left out, generic place types are dropped, and
+    opening hours are summarized, so each key is written once instead of
+    once per place.
+
+    Args:
+        places (list): Places, possibly with distance_m and cuisines set
+
+    Returns:
+        str: Encoded table
+    """
+    rows = [[_cell(code, getattr(place, key)) for code, key, _ in COLUMNS] for place in places]
+    used = [index for index in range(len(COLUMNS)) if any(row[index] for row in rows)] or [0]
+
+    legend = ", ".join(f"{COLUMNS[index][0]}={COLUMNS[index][2]}" for index in used)
+    lines = [f"Fields: {legend}", "|".join(COLUMNS[index][0] for index in used)]
+    lines.extend("|".join(row[index] for index in used) for row in rows)
+    return "\n".join(lines)
+
+def decode_places(table: str) -> list:
+    """
+    Decode a table written by encode_places.
+
+    Summarized and filtered cells come back as written (opening hours as
+    a single summary string, distance in km, types without generic ones).
+
+    Args:
+        table (str): Encoded table
+
+    Returns:
+        list: One dict per row, keyed by place field
+    """
+    lines = table.splitlines()[1:]
+    if not lines:
+        return []
+
+    keys = {code: key for code, key, _ in COLUMNS}
+    header = [keys[code] for code in lines[0].split("|")]
+    places = []
+
+    for line in lines[1:]:
+        place = {}
+        for key, cell in zip(header, line.split("|")):
+            if cell == "":
+                place[key] = None
+            elif key in ("rating", "distance_m"):
+                place[key] = float(cell) * (1000 if key == "distance_m" else 1)
+            elif key in ("user_ratings_total", "price_level"):
+                place[key] = int(cell)
+            elif key in ("types", "cuisines"):
+                place[key] = cell.split(",")
+            else:
+                place[key] = cell
+        places.append(place)
+
+    return places
@@ -0,0 +1,175 @@
+from dataclasses import replace
+import math
+
+EARTH_RADIUS_M = 6371000
+
+# Google Maps place types that indicate a relevant candidate for each search kind.
+RELEVANT_TYPES = {
+    "venue": {
+        "event_venue", "banquet_hall", "convention_center", "community_center",
+        "mosque", "place_of_worship", "lodging", "university", "school",
+        "library", "park", "stadium", "restaurant"
+    },
+    "catering": {
+        "restaurant", "food", "meal_delivery", "meal_takeaway", "caterer",
+        "bakery", "cafe"
+    },
+}
+
+def haversine(lat1, lng1, lat2, lng2) -> float:
+    """
+    Great-circle distance between two points.
+
+    Args:
+        lat1 (float): Latitude of the first point in degrees
+        lng1 (float): Longitude of the first point in degrees
+        lat2 (float): Latitude of the second point in degrees
+        lng2 (float): Longitude of the second point in degrees
+
+    Returns:
+        float: Distance in meters
+    """
+    phi1, phi2 = math.radians(lat1), math.radians(lat2)
+    dphi = phi2 - phi1
+    dlambda = math.radians(lng2 - lng1)
+
+    a = math.sin(dphi / 2) ** 2 + math.cos(phi1) * math.cos(phi2) * math.sin(dlambda / 2) ** 2
+    return 2 * EARTH_RADIUS_M * math.asin(math.sqrt(a))
+
+class CandidateRanker:
+    """
+    Deterministic pre-ranking of Maps candidates before they reach BigAgent.
+
+    Drops candidates outside the search radius (text search only biases
+    toward the location), scores the rest on rating, review count, place
+    type relevance and distance, and keeps the top K. Ties keep the Maps
+    order, so the same input always produces the same ranking.
+
+    Attributes:
+        top_k (int): Number of candidates kept
+        weights (dict): Contribution of each score component
+    """
+
+    weights = {
+        "rating": 0.45,
+        "reviews": 0.25,
+        "type": 0.15,
+        "distance": 0.15,
+    }
+
+    def __init__(self, top_k=8):
+        """
+        Initialize the ranker.
+
+        Args:
+            top_k (int, optional): Number of candidates kept. Defaults to 8.
+        """
+        self.top_k = top_k
+
+    def _distance(self, candidate, center):
+        """
+        Distance in meters from the search center, or None if unknown.
+        """
+        location = candidate.location
+        if not center or not location:
+            return None
+
+        return haversine(center["lat"], center["lng"], location["lat"], location["lng"])
+
+    def score(self, candidate, distance, radius, max_reviews, kind) -> float:
+        """
+        Score a single candidate between 0.0 and 1.0.
+
+        Args:
+            candidate (Place): Mapped place
+            distance (float): Meters from the search center, or None if unknown
+            radius (int): Search radius in meters
+            max_reviews (int): Highest review count among the candidates
+            kind (str): "venue" or "catering"
+
+        Returns:
+            float: Weighted score
+        """
+        rating = (candidate.rating or 0) / 5
+        reviews = math.log1p(candidate.user_ratings_total or 0) / math.log1p(max_reviews) if max_reviews else 0
+        type_match = 1.0 if RELEVANT_TYPES.get(kind, set()) & set(candidate.types or []) else 0.0
+        nearness = 1 - min(distance, radius) / radius if distance is not None and radius else 0.5
+
+        return (
+            self.weights["rating"] * rating
+            + self.weights["reviews"] * reviews
+            + self.weights["type"] * type_match
+            + self.weights["distance"] * nearness
+        )
+
+    def rank(self, candidates, center, radius, kind) -> list:
+        """
+        Filter, score, and truncate a candidate list.
+
+        Args:
+            candidates (list): Places from Map
+            center (dict): {"lat", "lng"} of the geocoded location, or None
+            radius (int): Search radius in meters
+            kind (str): "venue" or "catering"
+
+        Returns:
+            list: Up to top_k copies of the candidates, best first, with distance_m set
+        """
+        max_reviews = max((candidate.user_ratings_total or 0 for candidate in candidates), default=0)
+
+        scored = []
+        for index, candidate in enumerate(candidates):
+            distance = self._distance(candidate, center)
+
+            if distance is not None and radius and distance > radius:
+                continue
+
+            score = self.score(candidate, distance, radius, max_reviews, kind)
+            ranked = replace(candidate, distance_m=round(distance) if distance is not None else None)
+            scored.append((-score, index, ranked))
+
+        scored.sort(key=lambda item: (item[0], item[1]))
+        return [candidate for _, _, candidate in scored[:self.top_k]]
+
+    def recommend(self, candidates, kind, count=5) -> dict:
+        """
+        Build a BigAgent-shaped ranking from pre-ranked candidates.
+
+        Used when BigAgent cannot answer before the request deadline, so the
+        response still lists the best candidates by the deterministic score.
+
+        Args:
+            candidates (list): Output of rank, best first
+            kind (str): "venue" or "catering"
+            count (int, optional): Number of recommendations. Defaults to 5.
+
+        Returns:
+            dict: {"recommended_venues" or "recommended_catering", "general_notes", "ranked_by"}
+        """
+        recommendations = []
+
+        for candidate in candidates[:count]:
+            reasons = []
+            if candidate.rating is not None:
+                reasons.append(f"rated {candidate.rating} from {candidate.user_ratings_total or 0} reviews")
+            if candidate.distance_m is not None:
+                reasons.append(f"{candidate.distance_m / 1000:.1f} km from the event location")
+
+            entry = {
+                "name": candidate.name,
+                "address": candidate.address,
+                "rating": candidate.rating,
+                "price_level": candidate.price_level,
+                "why_recommended": "Top match by rating, reviews, place type and distance" + (": " + ", ".join(reasons) if reasons else ""),
+                "notes": []
+            }
+            if kind == "catering":
+                entry["dietary_support"] = []
+
+            recommendations.append(entry)
+
+        return {
+            "recommended_venues" if kind == "venue" else "recommended_catering": recommendations,
+            "general_notes": ["Ranked without AI analysis because the planning deadline was reached; verify suitability directly."],
+            "ranked_by": {"path": "fallback", "model": None}
+        }
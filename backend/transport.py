@@ -0,0 +1,225 @@
+from backend.config import (
+    get_upstream_max_connections, get_upstream_keepalive, get_upstream_http2,
+    get_upstream_warm_connections, get_details_timeout
+)
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import asyncio
+import httpx
+import logging
+import requests
+
+try:
+    import h2  # noqa: F401 - enables HTTP/2 in httpx
+    HTTP2_AVAILABLE = True
+except ImportError:
+    HTTP2_AVAILABLE = False
+
+logger = logging.getLogger(__name__)
+
+# Hosts contacted at warm-up, by upstream.
+WARM_URLS = {
+    "maps": "https://maps.googleapis.com/",
+    "hf": "https://router.huggingface.co/",
+}
+
+class BorrowedTransport(httpx.BaseTransport):
+    """
+    View of a shared sync transport whose close() leaves the pool open.
+
+    httpx clients close their transport when they are closed, so clients
+    created per call over a shared pool use this instead of the pool itself.
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    def handle_request(self, request):
+        return self.transport.handle_request(request)
+
+    def close(self):
+        pass
+
+class AsyncBorrowedTransport(httpx.AsyncBaseTransport):
+    """
+    Async variant of BorrowedTransport.
+    """
+
+    def __init__(self, transport):
+        self.transport = transport
+
+    async def handle_async_request(self, request):
+        return await self.transport.handle_async_request(request)
+
+    async def aclose(self):
+        pass
+
+class UpstreamTransport:
+    """
+    Connection pools shared by every upstream client of a pipeline.
+
+    Google Maps calls from the googlemaps client go through a pooled
+    requests session; async Maps calls and both HF Inference clients go
+    through httpx transports with one pool per upstream host, keep-alive,
+    and HTTP/2 when the h2 package is installed. Pools can be warmed at
+    startup so the first plans do not pay for DNS and TLS handshakes.
+
+    The HF clients pick the pools up through huggingface_hub's client
+    factories, which are process-wide; install_hf() registers them.
+
+    Attributes:
+        max_connections (int): Maximum open connections per upstream host
+        keepalive (float): Seconds an idle connection is kept open
+        http2 (bool): Whether httpx pools negotiate HTTP/2
+        timeout (float): Timeout for async Maps requests
+        session (requests.Session): Pooled session for the googlemaps client
+    """
+
+    def __init__(self, max_connections=None, keepalive=None, http2=None, timeout=None):
+        """
+        Initialize the pools. Connections are opened on first use or by warm-up.
+
+        Args:
+            max_connections (int, optional): Connections per host. Defaults to UPSTREAM_MAX_CONNECTIONS.
+            keepalive (float, optional): Idle keep-alive in seconds. Defaults to UPSTREAM_KEEPALIVE.
+            http2 (bool, optional): Negotiate HTTP/2 if available. Defaults to UPSTREAM_HTTP2.
+            timeout (float, optional): Async Maps request timeout. Defaults to MAPS_DETAILS_TIMEOUT.
+        """
+        self.max_connections = max_connections or get_upstream_max_connections()
+        self.keepalive = keepalive or get_upstream_keepalive()
+        self.http2 = (get_upstream_http2() if http2 is None else http2) and HTTP2_AVAILABLE
+        self.timeout = timeout or get_details_timeout()
+
+        self.session = requests.Session()
+        self.session.mount("https://", HTTPAdapter(pool_connections=len(WARM_URLS), pool_maxsize=self.max_connections))
+
+        self._transports = {}
+        self._async_transports = {}
+        self._maps_client = None
+
+    def _limits(self) -> httpx.Limits:
+        """
+        Pool limits applied to each upstream host.
+        """
+        return httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_connections,
+            keepalive_expiry=self.keepalive
+        )
+
+    def transport(self, upstream) -> httpx.HTTPTransport:
+        """
+        Shared sync httpx transport for an upstream.
+        """
+        if upstream not in self._transports:
+            self._transports[upstream] = httpx.HTTPTransport(limits=self._limits(), http2=self.http2)
+        return self._transports[upstream]
+
+    def async_transport(self, upstream) -> httpx.AsyncHTTPTransport:
+        """
+        Shared async httpx transport for an upstream.
+        """
+        if upstream not in self._async_transports:
+            self._async_transports[upstream] = httpx.AsyncHTTPTransport(limits=self._limits(), http2=self.http2)
+        return self._async_transports[upstream]
+
+    def maps_client(self) -> httpx.AsyncClient:
+        """
+        Async client for the Google Maps web services.
+        """
+        if self._maps_client is None:
+            self._maps_client = httpx.AsyncClient(transport=self.async_transport("maps"), timeout=self.timeout)
+        return self._maps_client
+
+    def hf_client(self) -> httpx.Client:
+        """
+        Sync client factory for huggingface_hub, over the shared HF pool.
+
+        Closing the client leaves the pool open.
+        """
+        return httpx.Client(transport=BorrowedTransport(self.transport("hf")), follow_redirects=True, timeout=None)
+
+    def hf_async_client(self) -> httpx.AsyncClient:
+        """
+        Async client factory for huggingface_hub, over the shared HF pool.
+
+        huggingface_hub opens one async client per AsyncInferenceClient, so
+        each call returns a new client; they all share one connection pool,
+        which stays open when a client is closed.
+        """
+        return httpx.AsyncClient(transport=AsyncBorrowedTransport(self.async_transport("hf")), follow_redirects=True, timeout=None)
+
+    def install_hf(self):
+        """
+        Route huggingface_hub's HTTP clients through the shared HF pool.
+        """
+        try:
+            from huggingface_hub import set_client_factory, set_async_client_factory
+        except ImportError:
+            logger.warning("huggingface_hub does not support client factories; HF clients keep their own connections")
+            return
+
+        set_client_factory(self.hf_client)
+        set_async_client_factory(self.hf_async_client)
+
+    def warm(self, connections=None):
+        """
+        Open connections to every upstream on the sync pools.
+
+        Failures are logged and ignored; warm-up only saves handshakes.
+
+        Args:
+            connections (int, optional): Connections per host. Defaults to UPSTREAM_WARM_CONNECTIONS.
+        """
+        connections = min(connections or get_upstream_warm_connections(), self.max_connections)
+
+        def head(request, url):
+            try:
+                request(url, timeout=self.timeout)
+            except Exception as e:
+                logger.debug(f"Warm-up request to {url} failed: {e}")
+
+        with self.hf_client() as hf, ThreadPoolExecutor(max_workers=connections * len(WARM_URLS)) as executor:
+            for _ in range(connections):
+                executor.submit(head, self.session.head, WARM_URLS["maps"])
+                executor.submit(head, hf.head, WARM_URLS["hf"])
+
+    async def awarm(self, connections=None):
+        """
+        Async variant of warm, for the async pools.
+
+        Args:
+            connections (int, optional): Connections per host. Defaults to UPSTREAM_WARM_CONNECTIONS.
+        """
+        connections = min(connections or get_upstream_warm_connections(), self.max_connections)
+
+        async def head(client, url):
+            try:
+                await client.head(url, timeout=self.timeout)
+            except Exception as e:
+                logger.debug(f"Warm-up request to {url} failed: {e}")
+
+        async with self.hf_async_client() as hf:
+            await asyncio.gather(*[
+                head(client, url)
+                for _ in range(connections)
+                for client, url in ((self.maps_client(), WARM_URLS["maps"]), (hf, WARM_URLS["hf"]))
+            ])
+
+    async def aclose(self):
+        """
+        Close every pool.
+        """
+        if self._maps_client is not None:
+            await self._maps_client.aclose()
+            self._maps_client = None
+
+        for transport in self._async_transports.values():
+            await transport.aclose()
+        self._async_transports = {}
+
+        for transport in self._transports.values():
+            transport.close()
+        self._transports = {}
+
+        self.session.close()
@@ -0,0 +1,132 @@
+from dotenv import load_dotenv
+from backend.config import get_warm_workers, get_log_level
+from backend.scraper import Map
+from backend.transport import UpstreamTransport
+from backend.agents.fastpath import EVENT_TYPES, CUISINES
+from concurrent.futures import ThreadPoolExecutor, as_completed
+import argparse
+import json
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+def build_tasks(cities, event_types, cuisines) -> list:
+    """
+    Expand a matrix into the distinct searches it needs.
+
+    Venue searches depend only on (city, event_type) and catering searches
+    only on (city, cuisine), so the full cross product collapses to their sum.
+
+    Args:
+        cities (list): Locations as users write them
+        event_types (list): Event types, used as the venue search query
+        cuisines (list): Cuisines, used in the catering search query
+
+    Returns:
+        list: ("venue" or "catering", city, event type or cuisine) tuples
+    """
+    tasks = []
+    for city in cities:
+        tasks.extend(("venue", city, event_type) for event_type in dict.fromkeys(event_types))
+        tasks.extend(("catering", city, cuisine) for cuisine in dict.fromkeys(cuisines))
+    return tasks
+
+def warm(cities, event_types, cuisines, result_count=15, radius=20000, workers=None, enrich=True) -> dict:
+    """
+    Run every search of a matrix with bounded parallelism.
+
+    Calls go through the process-wide Google Maps rate limiter, so warming
+    can run next to the API without exceeding the quota.
+
+    Args:
+        cities (list): Locations to warm
+        event_types (list): Event types to warm venue searches for
+        cuisines (list): Cuisines to warm catering searches for
+        result_count (int, optional): Results per search. Defaults to 15.
+        radius (int, optional): Search radius in meters. Defaults to 20000.
+        workers (int, optional): Searches run at once. Defaults to WARM_WORKERS.
+        enrich (bool, optional): Also fetch place details for every result. Defaults to True.
+
+    Returns:
+        dict: {"searches": int, "places": int, "empty": int, "seconds": float}
+    """
+    transport = UpstreamTransport()
+    maps = Map(transport=transport)
+    tasks = build_tasks(cities, event_types, cuisines)
+    summary = {"searches": len(tasks), "places": 0, "empty": 0, "seconds": 0.0}
+    started = time.monotonic()
+
+    def run(task):
+        kind, city, term = task
+        query = maps.query_venue if kind == "venue" else maps.query_catering
+        return query(city, term, result_count, radius, enrich)
+
+    with ThreadPoolExecutor(max_workers=workers or get_warm_workers(), thread_name_prefix="warm") as executor:
+        futures = {executor.submit(run, task): task for task in tasks}
+
+        for done, future in enumerate(as_completed(futures), 1):
+            kind, city, term = futures[future]
+            places = future.result()
+
+            summary["places"] += len(places)
+            if not places:
+                summary["empty"] += 1
+            logger.info(f"[{done}/{len(tasks)}] {kind} {term} in {city}: {len(places)} places")
+
+    transport.session.close()
+    summary["seconds"] = round(time.monotonic() - started, 2)
+    return summary
+
+def main(argv=None):
+    """
+    Command line entry point.
+
+    Args:
+        argv (list, optional): Arguments. Defaults to sys.argv[1:].
+    """
+    load_dotenv()
+
+    parser = argparse.ArgumentParser(
+        prog="python -m backend.warm",
+        description="Run the Google Maps searches of a city x event type x cuisine matrix to fill the persistent caches."
+    )
+    parser.add_argument("--matrix", help="JSON file with cities, event_types, cuisines, result_count and radius")
+    parser.add_argument("--cities", help="Comma-separated cities (overrides the matrix)")
+    parser.add_argument("--event-types", help="Comma-separated event types (overrides the matrix)")
+    parser.add_argument("--cuisines", help="Comma-separated cuisines (overrides the matrix)")
+    parser.add_argument("--result-count", type=int, help="Results per search (default 15)")
+    parser.add_argument("--radius", type=int, help="Search radius in meters (default 20000)")
+    parser.add_argument("--workers", type=int, help="Searches run at once (default WARM_WORKERS)")
+    parser.add_argument("--skip-details", action="store_true", help="Do not fetch place details")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=get_log_level())
+
+    matrix = {}
+    if args.matrix:
+        with open(args.matrix) as f:
+            matrix = json.load(f)
+
+    def listed(option, key, default):
+        if option:
+            return [item.strip() for item in option.split(",") if item.strip()]
+        return matrix.get(key, default)
+
+    cities = listed(args.cities, "cities", [])
+    if not cities:
+        parser.error("no cities given; pass --cities or a --matrix file with \"cities\"")
+
+    summary = warm(
+        cities,
+        listed(args.event_types, "event_types", [event_type for event_type, _ in EVENT_TYPES]),
+        listed(args.cuisines, "cuisines", list(dict.fromkeys(CUISINES.values()))),
+        result_count=args.result_count or matrix.get("result_count", 15),
+        radius=args.radius or matrix.get("radius", 20000),
+        workers=args.workers,
+        enrich=not args.skip_details
+    )
+    print(json.dumps(summary))
+
+if __name__ == "__main__":
+    main()
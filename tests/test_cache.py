@@ -0,0 +1,66 @@
+import asyncio
+import threading
+
+from backend.cache import TieredCache, StaleWhileRevalidateCache
+
+def disk_threads(cache):
+    threads = []
+    get_entry, set_entry = cache.disk.get_entry, cache.disk.set
+
+    def record_get(key):
+        threads.append(threading.current_thread())
+        return get_entry(key)
+
+    def record_set(key, value, stored_at=None):
+        threads.append(threading.current_thread())
+        return set_entry(key, value, stored_at=stored_at)
+
+    cache.disk.get_entry, cache.disk.set = record_get, record_set
+    return threads
+
+def test_async_disk_access_runs_off_the_event_loop(tmp_path):
+    path = str(tmp_path / "cache.sqlite3")
+    TieredCache("test", path=path).set("a", {"value": 1})
+
+    cache = TieredCache("test", path=path)
+    threads = disk_threads(cache)
+
+    async def run():
+        loop_thread = threading.current_thread()
+        value = await cache.aget("a")
+        await cache.aset("b", 2)
+        return loop_thread, value
+
+    loop_thread, value = asyncio.run(run())
+
+    assert value == {"value": 1}
+    assert len(threads) == 2
+    assert loop_thread not in threads
+    assert cache.get("b") == 2
+
+def test_async_memory_hit_skips_disk(tmp_path):
+    cache = TieredCache("test", path=str(tmp_path / "cache.sqlite3"))
+    cache.set("a", 1)
+    threads = disk_threads(cache)
+
+    assert asyncio.run(cache.aget("a")) == 1
+    assert threads == []
+
+def test_swr_async_load_stores_through_worker_thread(tmp_path):
+    tiered = TieredCache("test", path=str(tmp_path / "cache.sqlite3"))
+    cache = StaleWhileRevalidateCache(tiered, fresh_ttl=60, executor=None)
+    threads = disk_threads(tiered)
+
+    async def fetch():
+        return "fetched"
+
+    async def run():
+        first = await cache.aget_or_fetch("a", fetch)
+        second = await cache.alookup("a")
+        return threading.current_thread(), first, second
+
+    loop_thread, first, second = asyncio.run(run())
+
+    assert first == "fetched"
+    assert second == ("fetched", True)
+    assert threads and loop_thread not in threads
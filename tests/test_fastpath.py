@@ -0,0 +1,22 @@
+from backend.agents.fastpath import RuleBasedSerializer
+from backend.agents.serializer import SerializerAgent
+
+def test_extracts_well_formed_prompt():
+    data, confidence = RuleBasedSerializer().extract("Birthday party in Austin for 50 people, budget $2000")
+
+    assert confidence == 1.0
+    assert data["location"] == "Austin"
+    assert data["event_type"] == "Party"
+    assert (data["min_head_count"], data["max_head_count"]) == ("50", "50")
+    assert data["budget"] == "2000"
+
+def test_two_location_candidates_give_zero_confidence():
+    data, confidence = RuleBasedSerializer().extract("Iftar at The Grand Hall in Brooklyn for 100 people, $5000")
+
+    assert data["location"] == "Grand Hall"
+    assert confidence == 0.0
+
+def test_ambiguous_location_falls_back_to_llm(monkeypatch):
+    monkeypatch.setenv("SERIALIZER_FAST_PATH_THRESHOLD", "0.0001")
+
+    assert SerializerAgent()._fast_path("Iftar at The Grand Hall in Brooklyn for 100 people, $5000") is None
@@ -0,0 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+
+from backend.scraper.geoindex import PlaceIndex
+
+CENTER = {"lat": 40.0, "lng": -75.0}
+RESULTS = [{"name": "Hall", "geometry": {"location": {"lat": 40.001, "lng": -75.0}}}]
+
+def index(tmp_path):
+    return PlaceIndex(ttl=3600, cell=0.1, path=str(tmp_path / "index.sqlite3"))
+
+def test_covered_search_is_answered_locally(tmp_path):
+    places = index(tmp_path)
+    places.add("banquet hall", CENTER, 5000, RESULTS)
+
+    assert places.lookup("Banquet  Hall", CENTER, 1000, 5) == RESULTS
+    assert places.lookup("banquet hall", {"lat": 41.0, "lng": -75.0}, 1000, 5) is None
+    assert places.stats() == {"queries": 1, "hits": 1, "misses": 1}
+
+def test_concurrent_lookups_are_all_counted(tmp_path):
+    places = index(tmp_path)
+    places.add("banquet hall", CENTER, 5000, RESULTS)
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        list(executor.map(lambda _: places.lookup("banquet hall", CENTER, 1000, 5), range(2000)))
+
+    assert places.stats()["hits"] == 2000
@@ -0,0 +1,69 @@
+from types import SimpleNamespace
+
+from backend.agents.jsonstream import StreamingJSONParser, consume, estimate_tokens, parse_response
+from backend.metrics import llm_tokens
+
+def chunk(text=None, usage=None):
+    choices = [SimpleNamespace(delta=SimpleNamespace(content=text))] if text is not None else []
+    return SimpleNamespace(choices=choices, usage=usage)
+
+class Stream:
+    def __init__(self, chunks):
+        self.chunks = chunks
+        self.read = 0
+        self.closed = False
+
+    def __iter__(self):
+        for item in self.chunks:
+            self.read += 1
+            yield item
+
+    def close(self):
+        self.closed = True
+
+MESSAGES = [{"role": "user", "content": "x" * 400}]
+
+def tokens(agent, direction, source):
+    return llm_tokens.value(agent=agent, direction=direction, source=source)
+
+def test_parse_response_skips_think_and_fences():
+    reply = '<think>{"draft": 1}</think>```json\n{"recommended_venues": [{"name": "A"}]}\n```'
+
+    assert parse_response(reply) == {"recommended_venues": [{"name": "A"}]}
+
+def test_parser_marks_first_item_and_done():
+    parser = StreamingJSONParser()
+    parser.feed('{"recommended_venues": [{"name": "A"}')
+    assert parser.first_item_at is not None
+    assert not parser.done
+
+    parser.feed("]} trailing")
+    assert parser.done
+    assert parser.result() == {"recommended_venues": [{"name": "A"}]}
+
+def test_consume_stops_at_object_and_estimates_usage():
+    stream = Stream([
+        chunk('{"recommended_venues": '),
+        chunk('[{"name": "A"}]'),
+        chunk("}"),
+        chunk(" Hope this helps!"),
+        chunk(usage=SimpleNamespace(prompt_tokens=120, completion_tokens=9)),
+    ])
+
+    result = consume("test-cut", stream, MESSAGES)
+
+    assert result == {"recommended_venues": [{"name": "A"}]}
+    assert stream.read == 3
+    assert stream.closed
+    assert tokens("test-cut", "input", "estimate") == estimate_tokens(MESSAGES)
+    assert tokens("test-cut", "output", "estimate") == 3
+    assert tokens("test-cut", "input", "usage") == 0
+
+def test_consume_records_reported_usage():
+    stream = Stream([chunk('{"a": 1', SimpleNamespace(prompt_tokens=120, completion_tokens=9)), chunk("}")])
+
+    consume("test-usage", stream, MESSAGES)
+
+    assert tokens("test-usage", "input", "usage") == 120
+    assert tokens("test-usage", "output", "usage") == 9
+    assert tokens("test-usage", "input", "estimate") == 0
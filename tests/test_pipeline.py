@@ -0,0 +1,40 @@
+import asyncio
+
+import pytest
+
+from backend.pipeline import PlannerPipeline, _bucket
+
+REQUIREMENTS = {
+    "location": "Austin",
+    "event_type": "Wedding",
+    "cuisines": ["Italian"],
+    "dietary_preferences": [],
+    "other_requirements": [],
+}
+
+@pytest.fixture
+def pipeline(monkeypatch, tmp_path):
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "AIza-test-key")
+    monkeypatch.setenv("CACHE_DB_PATH", str(tmp_path / "planner.sqlite3"))
+    pipeline = PlannerPipeline()
+    yield pipeline
+    asyncio.run(pipeline.aclose())
+
+def key(pipeline, head_count, budget):
+    data = {**REQUIREMENTS, "min_head_count": head_count, "max_head_count": head_count, "budget": budget}
+    return pipeline._requirements_key(data, 15, 20000)
+
+@pytest.mark.parametrize("low, high", [(90, 105), (110, 130), ("$10,000", "$11,000"), ("9500", "11,754")])
+def test_bucket_collisions(low, high):
+    assert _bucket(low) == _bucket(high)
+
+@pytest.mark.parametrize("low, high", [(108, 110), (86, 87), ("$11,754", "$12,000")])
+def test_bucket_boundaries(low, high):
+    assert _bucket(low) != _bucket(high)
+
+def test_bucket_of_unknown_value():
+    assert _bucket("Unknown ") == _bucket("unknown")
+
+def test_requirements_key_shares_bucketed_plans(pipeline):
+    assert key(pipeline, "90", "$10,000") == key(pipeline, "105", "$11,000")
+    assert key(pipeline, "108", "$10,000") != key(pipeline, "110", "$10,000")
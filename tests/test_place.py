@@ -0,0 +1,140 @@
+import pytest
+
+from backend.scraper import Map, Place, encode_places, decode_places
+
+RAW_PLACE = {
+    "place_id": "ChIJ-hall",
+    "name": "Riverside Hall",
+    "formatted_address": "1 River Rd, Springfield",
+    "types": ["event_venue", "point_of_interest", "establishment"],
+    "rating": 4.6,
+    "user_ratings_total": 212,
+    "price_level": 3,
+    "vicinity": "Downtown",
+    "geometry": {"location": {"lat": 40.1, "lng": -75.2}},
+}
+
+DETAILS = {
+    "formatted_phone_number": "(555) 010-0100",
+    "website": "https://riverside.example",
+    "opening_hours": {"weekday_text": ["Monday: 9:00 AM – 5:00 PM", "Tuesday: 9:00 AM – 5:00 PM"]},
+}
+
+@pytest.fixture
+def maps(monkeypatch, tmp_path):
+    monkeypatch.setenv("GOOGLE_MAPS_API_KEY", "AIza-test-key")
+    monkeypatch.setenv("CACHE_DB_PATH", str(tmp_path / "planner.sqlite3"))
+    return Map()
+
+def test_from_dict_round_trips_to_dict():
+    place = {
+        "place_id": "ChIJ-hall",
+        "name": "Riverside Hall",
+        "address": "1 River Rd, Springfield",
+        "types": ["event_venue"],
+        "rating": 4.6,
+        "user_ratings_total": 212,
+        "price_level": 3,
+        "vicinity": "Downtown",
+        "location": {"lat": 40.1, "lng": -75.2},
+        "phone_number": "(555) 010-0100",
+        "website": "https://riverside.example",
+        "opening_hours": ["Monday: 9:00 AM – 5:00 PM"],
+    }
+
+    assert Place.from_dict(place).to_dict() == place
+
+def test_to_dict_leaves_out_unset_downstream_fields():
+    assert "distance_m" not in Place(name="Riverside Hall").to_dict()
+    assert "cuisines" not in Place(name="Riverside Hall").to_dict()
+
+def test_from_dict_keeps_downstream_fields_and_ignores_unknown_keys():
+    place = {**Place(name="Riverside Hall").to_dict(), "distance_m": 1200, "cuisines": ["Thai"]}
+
+    assert Place.from_dict({**place, "why_recommended": "close by"}).to_dict() == place
+
+def test_map_place_matches_previous_dict(maps):
+    expected = {
+        "place_id": RAW_PLACE["place_id"],
+        "name": RAW_PLACE["name"],
+        "address": RAW_PLACE["formatted_address"],
+        "types": RAW_PLACE["types"],
+        "rating": RAW_PLACE["rating"],
+        "user_ratings_total": RAW_PLACE["user_ratings_total"],
+        "price_level": RAW_PLACE["price_level"],
+        "vicinity": RAW_PLACE["vicinity"],
+        "location": RAW_PLACE["geometry"]["location"],
+        "phone_number": DETAILS["formatted_phone_number"],
+        "website": DETAILS["website"],
+        "opening_hours": DETAILS["opening_hours"]["weekday_text"],
+    }
+
+    mapped = maps._map_place(RAW_PLACE, DETAILS)
+
+    assert isinstance(mapped, Place)
+    assert mapped.to_dict() == expected
+    assert list(mapped.to_dict()) == list(expected)
+
+def test_map_place_without_details(maps):
+    mapped = maps._map_place({"name": "Riverside Hall"}, {})
+
+    assert mapped.types == []
+    assert mapped.location is None
+    assert mapped.phone_number is None
+    assert mapped.website is None
+    assert mapped.opening_hours is None
+
+def test_decode_places_round_trips_missing_fields():
+    places = [
+        Place(
+            name="Riverside Hall",
+            address="1 River Rd, Springfield",
+            rating=4.6,
+            user_ratings_total=212,
+            price_level=3,
+            types=["event_venue"],
+            opening_hours=["Monday: 9:00 AM – 5:00 PM", "Tuesday: 9:00 AM – 5:00 PM"],
+            phone_number="(555) 010-0100",
+        ),
+        Place(
+            name="Corner Loft",
+            address="2 Main St, Springfield",
+            rating=4.1,
+            user_ratings_total=35,
+            price_level=None,
+            types=[],
+            opening_hours=None,
+            phone_number=None,
+        ),
+    ]
+
+    decoded = decode_places(encode_places(places))
+
+    assert decoded == [
+        {
+            "name": "Riverside Hall",
+            "address": "1 River Rd, Springfield",
+            "rating": 4.6,
+            "user_ratings_total": 212,
+            "price_level": 3,
+            "types": ["event_venue"],
+            "opening_hours": "Mon-Tue 9:00 AM – 5:00 PM",
+        },
+        {
+            "name": "Corner Loft",
+            "address": "2 Main St, Springfield",
+            "rating": 4.1,
+            "user_ratings_total": 35,
+            "price_level": None,
+            "types": None,
+            "opening_hours": None,
+        },
+    ]
+
+def test_decode_places_drops_columns_empty_for_every_place():
+    places = [Place(name="Riverside Hall", price_level=None, opening_hours=None)]
+
+    assert decode_places(encode_places(places)) == [{"name": "Riverside Hall"}]
+
+def test_decode_places_of_empty_list():
+    assert decode_places(encode_places([])) == []
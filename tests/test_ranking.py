@@ -0,0 +1,27 @@
+from backend.scraper import CandidateRanker, Place
+
+CENTER = {"lat": 40.0, "lng": -75.0}
+
+def test_rank_returns_places_with_distance_without_touching_input():
+    near = Place(name="Near Hall", rating=4.0, types=["event_venue"], location={"lat": 40.001, "lng": -75.0})
+    far = Place(name="Far Hall", rating=5.0, types=["event_venue"], location={"lat": 41.0, "lng": -75.0})
+    unknown = Place(name="Somewhere Hall", rating=3.0)
+
+    ranked = CandidateRanker(top_k=5).rank([near, far, unknown], CENTER, 20000, "venue")
+
+    assert [place.name for place in ranked] == ["Near Hall", "Somewhere Hall"]
+    assert all(isinstance(place, Place) for place in ranked)
+    assert ranked[0].distance_m == 111
+    assert ranked[1].distance_m is None
+    assert near.distance_m is None
+
+def test_recommend_builds_fallback_ranking_from_places():
+    place = Place(name="Near Hall", address="1 Main St", rating=4.0, user_ratings_total=10, distance_m=1500)
+
+    ranking = CandidateRanker().recommend([place], "catering")
+
+    entry = ranking["recommended_catering"][0]
+    assert (entry["name"], entry["address"], entry["rating"]) == ("Near Hall", "1 Main St", 4.0)
+    assert "1.5 km from the event location" in entry["why_recommended"]
+    assert entry["dietary_support"] == []
+    assert ranking["ranked_by"] == {"path": "fallback", "model": None}